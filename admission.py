@@ -0,0 +1,183 @@
+# Admission control for LLM calls: token buckets for the provider's rate limits and a priority queue
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from provider_router import NoProviderAvailable
+
+log = logging.getLogger(__name__)
+
+# Lower runs first
+IN_PROGRESS = 0
+NEW_INTERVIEW = 1
+BACKGROUND = 2
+PRIORITY_NAMES = {IN_PROGRESS: "in_progress", NEW_INTERVIEW: "new_interview", BACKGROUND: "background"}
+
+
+class AdmissionRejected(NoProviderAvailable):
+    """The call could not be admitted within its budget, so it was never sent"""
+
+
+class TokenBucket:
+    """`per_minute` tokens a minute, refilled continuously, holding at most `capacity` (default one minute's worth)"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute if capacity is None else capacity)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)"""
+        self._refill()
+        return max(amount - self.tokens, 0.0) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "cost", "future")
+
+    def __init__(self, priority: int, seq: int, cost: Dict[str, float], future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.cost = cost
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionController:
+    """Lets LLM calls through only as fast as the provider's RPM and TPM limits allow.
+
+    `admit()` returns at once while both buckets have room. Otherwise the
+    call queues behind anything of the same or higher priority (in-progress
+    interviews, then new starts, then background generation). It is rejected
+    straight away with AdmissionRejected when the queue is full or the
+    estimated wait exceeds its budget, so the caller can serve a
+    question-bank question instead of waiting for a likely 429. A waiter
+    whose budget runs out in the queue is rejected too. When the queue is
+    full a higher-priority call displaces the lowest-priority waiter.
+    Without limits every call is admitted immediately.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_queue: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        self.buckets: Dict[str, TokenBucket] = {}
+        if rpm > 0:
+            self.buckets["requests"] = TokenBucket(rpm, clock=clock)
+        if tpm > 0:
+            self.buckets["tokens"] = TokenBucket(tpm, clock=clock)
+        self.max_queue = max_queue
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.buckets)
+
+    def _wait_time(self, cost: Dict[str, float]) -> float:
+        return max(bucket.wait_time(cost[name]) for name, bucket in self.buckets.items())
+
+    def _take(self, cost: Dict[str, float]):
+        for name, bucket in self.buckets.items():
+            bucket.take(cost[name])
+        self.admitted += 1
+
+    def estimate_wait(self, cost: Dict[str, float], priority: int) -> float:
+        """Seconds before a call of this cost and priority would be admitted, if nothing else arrives"""
+        ahead = dict(cost)
+        for waiter in self._queue:
+            if waiter.priority <= priority and not waiter.future.done():
+                for name in ahead:
+                    ahead[name] += waiter.cost[name]
+        return self._wait_time(ahead)
+
+    async def admit(self, tokens: float, priority: int = IN_PROGRESS, budget: Optional[float] = None):
+        """Wait for room to send one request using `tokens` tokens. Raises AdmissionRejected."""
+        if not self.buckets:
+            self.admitted += 1
+            return
+        # A call larger than a whole bucket could never fit, so it only has to wait for a full one
+        cost = {name: min(amount, self.buckets[name].capacity)
+                for name, amount in (("requests", 1.0), ("tokens", float(tokens))) if name in self.buckets}
+        if not self._queue and self._wait_time(cost) == 0:
+            self._take(cost)
+            return
+
+        if budget is not None and self.estimate_wait(cost, priority) > budget:
+            self._reject(priority, "would wait longer than its %.1fs budget", budget)
+        if len(self._queue) >= self.max_queue:
+            worst = max(self._queue)
+            if worst.priority <= priority:
+                self._reject(priority, "queue is full (%d waiting)", len(self._queue))
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            self.rejected[PRIORITY_NAMES[worst.priority]] += 1
+            worst.future.set_exception(AdmissionRejected("Displaced from the LLM admission queue"))
+
+        waiter = _Waiter(priority, next(self._seq), cost, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        self.queued += 1
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), budget)
+        except asyncio.TimeoutError:
+            self.rejected[PRIORITY_NAMES[priority]] += 1
+            raise AdmissionRejected("LLM admission queue wait exceeded the budget") from None
+        finally:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self._dispatch()
+
+    def _reject(self, priority: int, reason: str, *args):
+        self.rejected[PRIORITY_NAMES[priority]] += 1
+        log.debug("LLM call rejected by admission control: " + reason, *args)
+        raise AdmissionRejected("LLM rate limit reached")
+
+    def _dispatch(self):
+        """Admit waiters from the head of the queue while there is room, then sleep until the next fits"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        while self._queue:
+            head = self._queue[0]
+            if head.future.done():
+                heapq.heappop(self._queue)
+                continue
+            wait = self._wait_time(head.cost)
+            if wait > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self._take(head.cost)
+            head.future.set_result(None)
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = {
+            "enabled": self.enabled,
+            "queue_length": len(self._queue),
+            "admitted": self.admitted,
+            "queued": self.queued,
+        }
+        stats.update({f"rejected_{name}": count for name, count in self.rejected.items()})
+        stats.update({f"{name}_available": round(bucket.tokens, 1) for name, bucket in self.buckets.items()})
+        return stats
@@ -0,0 +1,163 @@
+# Compiled keyword matcher behind the heuristic answer scorer
+import bisect
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Words that show Excel knowledge. An answer counts if one of them appears as a whole
+# whitespace-separated word, so "sum" matches "use sum here" but not "sum," or "=SUM(A1)".
+EXCEL_TERMS = (
+    "formula", "function", "vlookup", "pivot", "sum", "average", "count", "index", "match",
+    "if", "sumif", "countif", "chart", "graph", "data", "cell", "range", "worksheet", "workbook",
+)
+
+# Matched anywhere in the lower-cased answer
+UNCERTAINTY_PHRASES = ("not sure", "don't know", "not certain", "unsure", "no idea", "can't remember")
+
+MIN_ANSWER_LENGTH = 20  # Shorter answers are treated as uncertain
+
+# Answer categories, in priority order
+UNCERTAIN = 0
+EXCEL_KNOWLEDGE = 1
+GENERAL = 2
+
+# (technical, efficiency, practices, communication) per category
+CATEGORY_SCORES: Dict[int, Tuple[float, float, float, float]] = {
+    UNCERTAIN: (0.0, 0.0, 0.0, 2.0),  # Very low scores for no knowledge shown
+    EXCEL_KNOWLEDGE: (7.5, 8.0, 7.0, 8.5),
+    GENERAL: (2.0, 3.0, 2.0, 4.0),  # Lower scores for attempts without Excel knowledge
+}
+
+FEEDBACK_OPTIONS: Dict[int, Tuple[str, ...]] = {
+    UNCERTAIN: (
+        "No worries at all! That's a complex scenario. Let's move on to the next question!",
+        "That's totally understandable! These advanced topics can be tricky. Ready for the next one?",
+        "No problem! It's better to be honest than to guess. Let's continue!",
+    ),
+    EXCEL_KNOWLEDGE: (
+        "Great! I can see you know your Excel functions. Nice thinking on that one!",
+        "Awesome! You're definitely familiar with Excel tools. I like your approach!",
+        "Perfect! You've got solid Excel knowledge there. Well done!",
+        "Excellent! That's exactly the kind of Excel expertise I was hoping to hear!",
+    ),
+    GENERAL: (
+        "I appreciate you giving it a try! Let's explore some Excel solutions for this.",
+        "Thanks for your thoughts! There are some specific Excel techniques that could help here.",
+        "Good effort! This is where Excel's advanced features really shine.",
+        "Nice attempt! Let me share how Excel could tackle this challenge.",
+    ),
+}
+
+# Joins answers in a batch; never part of a term or phrase and not whitespace
+_SEPARATOR = "\x00"
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex for a set of literals with shared prefixes factored out.
+
+    The alternation is nested like a trie ("sum(?:if(?:s)?|product)?"), so
+    the regex engine follows one branch per character instead of retrying
+    every word at every position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = None  # end of word
+
+    def emit(node: dict) -> str:
+        terminal = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            atom = re.escape(char)
+            branches.append(atom + emit(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if terminal else group
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Precompiled single-pass classifier for candidate answers.
+
+    All Excel terms are compiled into one trie-shaped regex matched as whole
+    whitespace-separated words, and all uncertainty phrases into another
+    matched anywhere,
+    so each answer is scanned once per pattern in C regardless of the
+    vocabulary size. `classify_batch` lowercases and scans a whole batch as
+    one string, jumping to the next answer as soon as one is decided.
+    """
+
+    def __init__(
+        self,
+        terms: Iterable[str] = EXCEL_TERMS,
+        phrases: Iterable[str] = UNCERTAINTY_PHRASES,
+        min_length: int = MIN_ANSWER_LENGTH,
+    ):
+        terms = {term.lower() for term in terms}
+        phrases = {phrase.lower() for phrase in phrases}
+        if not terms or not phrases:
+            raise ValueError("terms and phrases must not be empty")
+        self.vocabulary_size = len(terms)
+        self.min_length = min_length
+        # Same as `term in answer.lower().split()`; the batch separator also ends a word
+        self._terms = re.compile(r"(?<![^\s\x00])" + _trie_regex(terms) + r"(?![^\s\x00])")
+        self._phrases = re.compile(_trie_regex(phrases))
+
+    def classify(self, answer: str) -> int:
+        """UNCERTAIN, EXCEL_KNOWLEDGE or GENERAL for one answer"""
+        if len(answer.strip()) < self.min_length:
+            return UNCERTAIN
+        text = answer.lower()
+        if self._phrases.search(text):
+            return UNCERTAIN
+        if self._terms.search(text):
+            return EXCEL_KNOWLEDGE
+        return GENERAL
+
+    def _mark(self, pattern, text: str, starts: List[int], categories: List[int], category: int):
+        # One left-to-right scan; after a hit, resume at the next undecided answer
+        search = pattern.search
+        count = len(categories)
+        pos = 0
+        while True:
+            found = search(text, pos)
+            if found is None:
+                return
+            index = bisect.bisect_right(starts, found.start()) - 1
+            if categories[index] == GENERAL:
+                categories[index] = category
+            index += 1
+            while index < count and categories[index] != GENERAL:
+                index += 1
+            if index == count:
+                return
+            pos = starts[index]
+
+    def classify_batch(self, answers: Sequence[str]) -> List[int]:
+        """Categories for many answers, scanned as one joined string"""
+        categories = [UNCERTAIN if len(answer.strip()) < self.min_length else GENERAL for answer in answers]
+        if not categories:
+            return categories
+        # Lowercase per answer: lower() can change the length of some characters
+        lowered = [answer.lower() for answer in answers]
+        starts = []
+        offset = 0
+        for answer in lowered:
+            starts.append(offset)
+            offset += len(answer) + 1
+        text = _SEPARATOR.join(lowered)
+        self._mark(self._phrases, text, starts, categories, UNCERTAIN)
+        self._mark(self._terms, text, starts, categories, EXCEL_KNOWLEDGE)
+        return categories
+
+    def score_batch(self, answers: Sequence[str]) -> List[Tuple[float, float, float, float]]:
+        """Score tuples (technical, efficiency, practices, communication) for many answers"""
+        return [CATEGORY_SCORES[category] for category in self.classify_batch(answers)]
+
+
+MATCHER = KeywordMatcher()
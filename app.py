@@ -1,19 +1,71 @@
 
 # FastAPI backend for Excel Mock Interviewer
-from fastapi import FastAPI
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from pydantic import BaseModel
 
 # Use ExcelInterviewer for interview logic
-from interviewer import ExcelInterviewer
-from models import InterviewSession, InterviewState, DifficultyLevel, Response
+from interviewer import AsyncExcelInterviewer
+from admission import PRIORITY_NAMES
+from models import InterviewSession, InterviewState, DifficultyLevel, Response, Question, QuestionType
+from session_store import SessionRegistry
+from session_backend import SharedSessionStore, SQLiteBackend
+from prefetch import QuestionPrefetcher
+from question_pool import QuestionPool
+from near_duplicates import DEFAULT_THRESHOLD, QuestionIndex
+from session_log import SessionLog
+from static_assets import StaticBundle
+from event_channel import SLOW_CONSUMER, EventChannel
+from deadlines import DeadlineScheduler
+from metrics import METRICS, RequestMetricsMiddleware
+from structured_logging import bind_session, setup_logging
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import json
+import logging
+import tempfile
+import time
 import uuid
 import os
 
-app = FastAPI()
+from dotenv import load_dotenv
+load_dotenv()  # Before anything reads the environment, LOG_LEVEL/LOG_FORMAT included
+
+setup_logging()
+log = logging.getLogger("app")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if session_log is not None:
+        restored = session_log.replay()
+        for restored_session in restored.values():
+            if restored_session.session_id not in sessions:
+                sessions.put(restored_session)
+                if restored_session.question_deadline is not None:
+                    deadlines.schedule(restored_session.session_id,
+                                       restored_session.question_deadline + QUESTION_TIMER_GRACE_SECONDS)
+        log.info("Restored %d sessions from %s", len(restored), SESSION_LOG_DIR)
+    deadlines.start()
+    # Provider SDKs are imported off the event loop so /health answers while
+    # they load; the warm pool starts generating once the clients are ready
+    warm_up = asyncio.create_task(asyncio.to_thread(excel_interviewer.warm_up))
+    if excel_interviewer.question_pool is not None:
+        warm_up.add_done_callback(lambda _: excel_interviewer.question_pool.start())
+    yield
+    await deadlines.stop()
+    await warm_up
+    if excel_interviewer.question_pool is not None:
+        await excel_interviewer.question_pool.stop()
+    await excel_interviewer.aclose()
+    if session_log is not None:
+        session_log.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -23,33 +75,411 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware, metrics=METRICS)
 
 # Get Groq API key from environment
-from dotenv import load_dotenv
-load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 HF_TOKEN = os.getenv("HF_TOKEN", "")  # Hugging Face token (free)
 
 # Check if running on Railway
 RAILWAY_ENVIRONMENT = os.getenv("RAILWAY_ENVIRONMENT_NAME", "local")
-print(f"Running in environment: {RAILWAY_ENVIRONMENT}")
-print(f"Groq API key configured: {bool(GROQ_API_KEY)}")
-print(f"Hugging Face token configured: {bool(HF_TOKEN)}")
+log.info("Running in environment: %s", RAILWAY_ENVIRONMENT,
+         extra={"groq_key_set": bool(GROQ_API_KEY), "hf_token_set": bool(HF_TOKEN)})
 
-excel_interviewer = ExcelInterviewer(api_key=GROQ_API_KEY, hf_token=HF_TOKEN)
+# uvicorn --workers defaults to WEB_CONCURRENCY; per-process limits below are split between workers
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
 
-# Store session in memory (single user for MVP)
-session = InterviewSession(
-    session_id=str(uuid.uuid4()),
-    state=InterviewState.INTRO
+# A live question must start arriving within LLM_DEADLINE_SECONDS or the question bank is used
+excel_interviewer = AsyncExcelInterviewer(
+    api_key=GROQ_API_KEY,
+    hf_token=HF_TOKEN,
+    deadline=float(os.getenv("LLM_DEADLINE_SECONDS", "3")),
+    # The provider's per-minute limits (0 = unlimited); calls beyond them queue or fall back
+    rpm_limit=float(os.getenv("LLM_RPM_LIMIT", "0")) / WORKERS,
+    tpm_limit=float(os.getenv("LLM_TPM_LIMIT", "0")) / WORKERS,
+    admission_queue=int(os.getenv("LLM_ADMISSION_QUEUE", "100")),
+    plan_deadline=float(os.getenv("QUESTION_PLAN_DEADLINE_SECONDS", "6")),
 )
 
+# Live interviews keyed by session_id. "memory" keeps them in this process; "sqlite" shares them
+# between workers through a WAL-mode database, with each worker caching the ones it has seen.
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "sqlite" if WORKERS > 1 else "memory")
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+session_settings = dict(
+    max_sessions=int(os.getenv("MAX_SESSIONS", "10000")),
+    ttl_seconds=SESSION_TTL_SECONDS,
+    # Sessions idle this long are packed into a compact form until the candidate returns
+    compact_after_seconds=float(os.getenv("SESSION_COMPACT_AFTER_SECONDS", "30")),
+)
+if SESSION_BACKEND == "sqlite":
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join(tempfile.gettempdir(), "excel-interviewer-sessions.db"))
+    sessions = SharedSessionStore(SQLiteBackend(SESSION_DB_PATH, ttl_seconds=SESSION_TTL_SECONDS), **session_settings)
+elif SESSION_BACKEND == "memory":
+    if WORKERS > 1:
+        log.warning("SESSION_BACKEND=memory with %d workers: interviews will break when requests change worker",
+                    WORKERS)
+    sessions = SessionRegistry(**session_settings)
+else:
+    raise ValueError(f"Unknown SESSION_BACKEND {SESSION_BACKEND!r} (expected memory or sqlite)")
+
+LLM_CONFIGURED = bool(excel_interviewer.groq_configured or excel_interviewer.hf_client)
+
+# Pre-generated questions per difficulty, refilled in the background
+if os.getenv("QUESTION_POOL_ENABLED", "true").lower() == "true" and LLM_CONFIGURED:
+    excel_interviewer.question_pool = QuestionPool(
+        excel_interviewer.generate_pool_question,
+        capacity=int(os.getenv("QUESTION_POOL_SIZE", "50")),
+        low_water=int(os.getenv("QUESTION_POOL_LOW_WATER", "10")),
+        refill_batch=int(os.getenv("QUESTION_POOL_REFILL_BATCH", "5")),
+        max_serves=int(os.getenv("QUESTION_POOL_MAX_SERVES", "20")),
+    )
+
+# Generated questions that reword one the candidate has already seen are rejected, and topics are
+# counted across sessions; with QUESTION_MAX_EXPOSURE set, topics served that often are regenerated too
+if os.getenv("QUESTION_DEDUP_ENABLED", "true").lower() == "true":
+    excel_interviewer.question_index = QuestionIndex(
+        threshold=float(os.getenv("QUESTION_DUPLICATE_THRESHOLD", str(DEFAULT_THRESHOLD))),
+        capacity=int(os.getenv("QUESTION_INDEX_CAPACITY", "100000")),
+        max_exposure=int(os.getenv("QUESTION_MAX_EXPOSURE", "0")),
+    )
+
+# Durable session log, replayed on startup (set SESSION_LOG_DIR to enable)
+SESSION_LOG_DIR = os.getenv("SESSION_LOG_DIR", "")
+session_log = None
+if SESSION_LOG_DIR:
+    session_log = SessionLog(
+        SESSION_LOG_DIR,
+        fsync=os.getenv("SESSION_LOG_FSYNC", "true").lower() == "true",
+        compact_bytes=int(os.getenv("SESSION_LOG_COMPACT_BYTES", str(16 * 1024 * 1024))),
+    )
+    sessions.add_evict_listener(lambda session_id, _: session_log.forget(session_id))
+    if WORKERS > 1:
+        log.warning("SESSION_LOG_DIR is written by one process; with %d workers use SESSION_BACKEND=sqlite alone",
+                    WORKERS)
+
+# Generate question N+1 while the candidate answers question N (only useful with an LLM configured)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+# Plan mode: /api/start asks for all six questions in one call instead of one call per turn
+QUESTION_PLAN_ENABLED = os.getenv("QUESTION_PLAN_ENABLED", "false").lower() == "true" and LLM_CONFIGURED
+prefetcher = None
+# A prefetch still running when the answer arrives gets a third of the deadline to finish
+LATE_PREFETCH_WAIT = excel_interviewer.router.deadline / 3
+if PREFETCH_ENABLED and LLM_CONFIGURED:
+    prefetcher = QuestionPrefetcher(excel_interviewer)
+    sessions.add_evict_listener(lambda session_id, _: prefetcher.cancel(session_id))
+
+# Question timers are enforced here, not only by the browser: an answer arriving more than the grace
+# period after the timer ran out is recorded as a timeout, and so is a question nobody answers at all
+QUESTION_TIMER_GRACE_SECONDS = float(os.getenv("QUESTION_TIMER_GRACE_SECONDS", "10"))
+
+
+async def expire_question(session_id: str):
+    """Deadline callback: record the timeout for a question the candidate never answered"""
+    session = await lookup_session(session_id)
+    try:
+        if session is None or len(session.responses) >= 6 or not question_overdue(session):
+            return
+        if question_answered(session):  # Answered before a restart cleared the timer
+            session.question_deadline = None
+        else:
+            record_timeout(session, "server")
+            if len(session.responses) >= 6:
+                end_interview(session)
+        await persist(session)
+    finally:
+        release_session(session)
 
-class AnswerRequest(BaseModel):
+
+deadlines = DeadlineScheduler(expire_question)
+sessions.add_evict_listener(lambda session_id, _: deadlines.cancel(session_id))
+
+
+def collect_metrics():
+    """Scrape-time samples taken from the stats the components already keep"""
+    yield "interview_sessions_live", (), len(sessions)
+    for name, provider in excel_interviewer.providers.items():
+        labels = (("provider", name), ("model", provider.model))
+        yield "llm_circuit_open", labels, int(provider.state != "closed")
+    for key in ("hedged", "failovers", "deadlines_exceeded", "rejected"):
+        yield f"llm_router_{key}_total", (), getattr(excel_interviewer.router, key)
+    yield "llm_singleflight_leaders_total", (), excel_interviewer.single_flight.leaders
+    yield "llm_singleflight_coalesced_total", (), excel_interviewer.single_flight.coalesced
+    admission = excel_interviewer.admission.stats()
+    yield "llm_admission_queue_length", (), admission["queue_length"]
+    for priority in PRIORITY_NAMES.values():
+        yield "llm_admission_rejected_total", (("priority", priority),), admission[f"rejected_{priority}"]
+    if prefetcher is not None:
+        for key, value in prefetcher.stats().items():
+            yield f"prefetch_{key}" + ("" if key == "pending" else "_total"), (), value
+    if excel_interviewer.question_pool is not None:
+        for key, value in excel_interviewer.question_pool.stats().items():
+            if key.startswith("size_"):
+                yield "question_pool_size", (("difficulty", key[5:]),), value
+            else:
+                yield f"question_pool_{key}_total", (), value
+    if session_log is not None:
+        stats = session_log.stats()
+        yield "session_log_queued_events", (), stats["queued_events"]
+        yield "session_log_batches_total", (), stats["batches"]
+    yield "question_timers_pending", (), len(deadlines)
+    if excel_interviewer.question_index is not None:
+        yield "question_index_topics", (), len(excel_interviewer.question_index)
+
+
+METRICS.add_collector(collect_metrics)
+METRICS.describe("interview_sessions_live", "gauge", "Interviews currently held in memory")
+METRICS.describe("llm_circuit_open", "gauge", "1 while a provider's circuit breaker is open or half-open")
+METRICS.describe("llm_singleflight_coalesced_total", "counter", "Question requests that joined an identical in-flight LLM call")
+METRICS.describe("llm_admission_queue_length", "gauge", "LLM calls waiting for rate-limit headroom")
+METRICS.describe("llm_admission_rejected_total", "counter", "LLM calls sent to the question bank by admission control")
+METRICS.describe("question_pool_size", "gauge", "Warm pool questions ready per difficulty")
+METRICS.describe("question_timers_pending", "gauge", "Questions whose server-side timer is running")
+METRICS.describe("question_index_topics", "gauge", "Distinct question topics in the near-duplicate index")
+METRICS.describe("questions_rejected_total", "counter",
+                 "Generated questions rejected as a duplicate, near duplicate or overexposed topic")
+METRICS.describe("question_timeouts_total", "counter",
+                 "Questions recorded as timed out, by who noticed: client, server, or a late answer")
+
+
+FALLBACK_INTRO = "Welcome to the Excel Mock Interviewer! I'll ask you 6 questions to assess your Excel skills. Let's begin!"
+
+
+class SessionRequest(BaseModel):
+    session_id: str
+
+
+class AnswerRequest(SessionRequest):
     answer: str
 
 
+async def lookup_session(session_id: str) -> Optional[InterviewSession]:
+    """Live session or None; tags this request's log records with the session id.
+
+    The session is held in use (never packed) until release_session().
+    """
+    bind_session(session_id)
+    sessions.acquire(session_id)
+    session = await sessions.aget(session_id)
+    if session is None:
+        sessions.release(session_id)
+    return session
+
+
+async def new_session() -> InterviewSession:
+    """A new session, held in use like one from lookup_session()"""
+    session_id = str(uuid.uuid4())
+    sessions.acquire(session_id)
+    session = await sessions.aput(InterviewSession(
+        session_id=session_id,
+        state=InterviewState.INTRO
+    ))
+    bind_session(session.session_id)
+    return session
+
+
+def release_session(session: Optional[InterviewSession]):
+    """The request is done with the session; once idle it may be packed again"""
+    if session is not None:
+        sessions.release(session.session_id)
+
+
+def session_not_found(session_id: str):
+    return JSONResponse({"error": f"Unknown or expired session: {session_id}"}, status_code=404)
+
+
+async def take_prefetched(session: InterviewSession):
+    """Prefetched question or None, plus what is left of the LLM deadline afterwards"""
+    if not prefetcher:
+        return None, None
+    started = time.monotonic()
+    question = await prefetcher.take(session, timeout=LATE_PREFETCH_WAIT)
+    return question, excel_interviewer.router.deadline - (time.monotonic() - started)
+
+
+async def serve_next_question(session: InterviewSession):
+    """Serve the next question, using the prefetched one when available, and prefetch the one after"""
+    question, remaining = await take_prefetched(session)
+    if question is not None:
+        next_q = excel_interviewer.serve_question(session, question, source="prefetch")
+    else:
+        next_q = await excel_interviewer.get_next_question(session, deadline=remaining)
+    if next_q and prefetcher:
+        prefetcher.schedule(session)
+    return next_q
+
+
+async def persist(session: Optional[InterviewSession]):
+    """Write the session's changes back to the session store and queue them for the durable log"""
+    if session is None:
+        return
+    await sessions.asave(session)
+    if session_log is not None:
+        session_log.record(session)
+
+
+def end_interview(session: InterviewSession):
+    if prefetcher:
+        prefetcher.cancel(session.session_id)
+
+
+def question_timer(session: InterviewSession) -> int:
+    """Seconds allowed for the current question"""
+    difficulty = session.current_question.difficulty if session.current_question else DifficultyLevel.BEGINNER
+    return 90 if difficulty == DifficultyLevel.BEGINNER else 120 if difficulty == DifficultyLevel.INTERMEDIATE else 150
+
+
+def start_question_timer(session: InterviewSession) -> int:
+    """Start the clock on the question just served; returns its timer in seconds"""
+    seconds = question_timer(session)
+    session.question_deadline = time.time() + seconds
+    deadlines.schedule(session.session_id, session.question_deadline + QUESTION_TIMER_GRACE_SECONDS)
+    return seconds
+
+
+def stop_question_timer(session: InterviewSession):
+    session.question_deadline = None
+    deadlines.cancel(session.session_id)
+
+
+def question_time_left(session: InterviewSession) -> int:
+    """Whole seconds left on the current question's timer"""
+    if session.question_deadline is None:
+        return question_timer(session)
+    return max(0, int(session.question_deadline - time.time()))
+
+
+def question_overdue(session: InterviewSession) -> bool:
+    """Whether the current question's timer ran out more than the grace period ago"""
+    deadline = session.question_deadline
+    return deadline is not None and time.time() >= deadline + QUESTION_TIMER_GRACE_SECONDS
+
+
+def question_answered(session: InterviewSession) -> bool:
+    """Whether the current question already has a response (an answer or a timeout)"""
+    question = session.current_question
+    return question is not None and bool(session.responses) and session.responses[-1].question_id == question.id
+
+
+def question_timed_out(session: InterviewSession) -> bool:
+    return question_answered(session) and session.responses[-1].answer == TIMEOUT_ANSWER
+
+
+def record_timeout(session: InterviewSession, source: str):
+    """Record the current question as timed out, unless that already happened"""
+    stop_question_timer(session)
+    if question_timed_out(session):
+        return
+    session.add_response(timeout_response(session))
+    METRICS.inc("question_timeouts_total", (("source", source),))
+
+
+async def record_answer(session: InterviewSession, answer: str) -> str:
+    """Score the answer (with a neutral fallback score) and return the feedback.
+    
+    An answer to a question that has already timed out, or that arrives
+    after its deadline, is recorded as a timeout instead.
+    """
+    if question_timed_out(session) or question_overdue(session):
+        record_timeout(session, "late_answer")
+        return TIMEOUT_FEEDBACK
+    stop_question_timer(session)
+    try:
+        evaluation = await excel_interviewer.evaluate_response(session, answer)
+        return evaluation.feedback
+    except Exception as eval_error:
+        log.warning("LLM evaluation failed: %s", eval_error)
+        # Fallback evaluation
+        feedback = "Thank you for your answer! Let's continue with the next question."
+        session.add_response(Response(
+            question_id=session.current_question.id if session.current_question else "unknown",
+            answer=answer,
+            technical_score=7.0,
+            efficiency_score=7.0,
+            practices_score=7.0,
+            communication_score=7.0,
+            feedback=feedback
+        ))
+        return feedback
+
+
+async def finish_interview(session: InterviewSession) -> str:
+    end_interview(session)
+    try:
+        return await excel_interviewer.generate_summary(session)
+    except Exception as summary_error:
+        log.warning("LLM summary failed: %s", summary_error)
+        return f"Interview completed! You answered {len(session.responses)} questions. Thank you for participating in the Excel skills assessment."
+
+
+def serve_bank_question(session: InterviewSession) -> str:
+    """Question-bank fallback for the current turn"""
+    from question_bank import QUESTION_BANK
+    METRICS.inc("questions_served_total", (("source", "bank"),))
+    question_index = len(session.responses)
+    
+    if question_index < len(QUESTION_BANK):
+        next_question_obj = QUESTION_BANK[question_index]
+        session.current_question = next_question_obj
+        return next_question_obj.question
+    if question_index == 0:
+        question = "How would you calculate the sum of values in cells A1 through A10?"
+        session.current_question = Question(
+            id="fallback_1",
+            type=QuestionType.FORMULA,
+            difficulty=DifficultyLevel.BEGINNER,
+            question=question,
+            expected_answer="=SUM(A1:A10)",
+            scoring_criteria={"basic": "SUM function usage"}
+        )
+        return question
+    fallback_questions = [
+        (QuestionType.FORMULA, "How would you use VLOOKUP to find data?",
+         "=VLOOKUP(lookup_value, table_array, col_index_num, FALSE)"),
+        (QuestionType.FORMULA, "What's the difference between COUNT and COUNTA?",
+         "COUNT counts numeric cells; COUNTA counts all non-empty cells"),
+        (QuestionType.PIVOT_TABLE, "How would you create a pivot table?",
+         "Select the data, Insert > PivotTable, then drag fields to rows, columns and values"),
+        (QuestionType.BEST_PRACTICES, "What are some Excel keyboard shortcuts you use?",
+         "Ctrl+Arrow to navigate, Ctrl+Shift+L for filters, F4 for absolute references"),
+    ]
+    question_type, question, expected_answer = fallback_questions[question_index % len(fallback_questions)]
+    # The answer endpoints and the question timer rely on current_question matching what was asked
+    session.current_question = Question(
+        id=f"fallback_{question_index + 1}",
+        type=question_type,
+        difficulty=AsyncExcelInterviewer.question_difficulty(question_index),
+        question=question,
+        expected_answer=expected_answer,
+        scoring_criteria={"basic": "Correct approach"}
+    )
+    return question
+
+
+# Events a WebSocket client may leave unread before it is disconnected (tokens are merged first)
+WS_MAX_PENDING_EVENTS = int(os.getenv("WS_MAX_PENDING_EVENTS", "64"))
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_next_question(session: InterviewSession, first: bool = False):
+    """Streaming counterpart of serve_next_question; yields (event, text)"""
+    question, remaining = await take_prefetched(session) if not first else (None, None)
+    if question is not None:
+        yield "token", excel_interviewer.serve_question(session, question, source="prefetch")
+    else:
+        async for event in excel_interviewer.stream_next_question(session, deadline=remaining):
+            yield event
+    if prefetcher and session.state not in (InterviewState.SUMMARY, InterviewState.COMPLETED):
+        prefetcher.schedule(session)
+
+
+def event_stream(events):
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 
 
 @app.get("/api")
@@ -91,158 +521,317 @@ def debug_llm():
 # This is done at the end of the file
 
 @app.post("/api/start")
-def start_interview():
+async def start_interview():
+    session = None
     try:
-        global session, excel_interviewer
-        print(f"Starting interview - Groq key available: {bool(GROQ_API_KEY)}")
-        print(f"HF token available: {bool(HF_TOKEN)}")
-        
-        # Reset session for new interview
-        session = InterviewSession(
-            session_id=str(uuid.uuid4()),
-            state=InterviewState.INTRO
-        )
+        # Every interview gets its own session
+        session = await new_session()
+        log.debug("Starting interview")
         
         # Try LLM-based interview first
         try:
             intro = excel_interviewer.start_interview(session)
-            question = excel_interviewer.get_next_question(session)
+            if QUESTION_PLAN_ENABLED:
+                await excel_interviewer.plan_interview(session)
+            question = await excel_interviewer.get_next_question(session)
             
             if question:
+                if prefetcher:
+                    prefetcher.schedule(session)
                 # LLM worked, use it
-                timer_seconds = 90 if session.current_question.difficulty == DifficultyLevel.BEGINNER else 120 if session.current_question.difficulty == DifficultyLevel.INTERMEDIATE else 150
-                return JSONResponse({"intro": intro, "question": question, "timer": timer_seconds})
+                return JSONResponse({"session_id": session.session_id, "intro": intro, "question": question, "timer": start_question_timer(session)})
         except Exception as llm_error:
-            print(f"LLM interview failed: {llm_error}")
+            log.warning("LLM interview failed, using question bank: %s", llm_error)
         
         # Fallback to question bank
-        print("Using question bank fallback")
-        intro = "Welcome to the Excel Mock Interviewer! I'll ask you 6 questions to assess your Excel skills. Let's begin!"
+        intro = FALLBACK_INTRO
+        question = serve_bank_question(session)
         
-        from question_bank import QUESTION_BANK
-        if QUESTION_BANK:
-            question_obj = QUESTION_BANK[0]
-            session.current_question = question_obj
-            question = question_obj.question
-        else:
-            question = "How would you calculate the sum of values in cells A1 through A10?"
-            from models import Question, QuestionType, DifficultyLevel
-            session.current_question = Question(
-                id="fallback_1",
-                type=QuestionType.FORMULA,
-                difficulty=DifficultyLevel.BEGINNER,
-                question=question,
-                expected_answer="=SUM(A1:A10)",
-                scoring_criteria={"basic": "SUM function usage"}
-            )
-        
-        return JSONResponse({"intro": intro, "question": question, "timer": 90})
+        return JSONResponse({"session_id": session.session_id, "intro": intro, "question": question, "timer": start_question_timer(session)})
         
     except Exception as e:
-        print(f"Critical error in start_interview: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Critical error in start_interview: %s", e)
         return JSONResponse({
+            "session_id": session.session_id if session else None,
             "intro": "Welcome to Excel Mock Interviewer!",
             "question": "How would you calculate the sum of values in cells A1 through A10?",
             "timer": 90
         })
+    finally:
+        await persist(session)
+        release_session(session)
 
 
 @app.post("/api/answer")
-def submit_answer(req: AnswerRequest):
+async def submit_answer(req: AnswerRequest):
+    session = await lookup_session(req.session_id)
+    if session is None:
+        return session_not_found(req.session_id)
     try:
-        # Try LLM evaluation first
-        try:
-            evaluation = excel_interviewer.evaluate_response(session, req.answer)
-            feedback = evaluation.feedback
-        except Exception as eval_error:
-            print(f"LLM evaluation failed: {eval_error}")
-            # Fallback evaluation
-            feedback = "Thank you for your answer! Let's continue with the next question."
-            from models import Response
-            evaluation = Response(
-                question_id=session.current_question.id if session.current_question else "unknown",
-                answer=req.answer,
-                technical_score=7.0,
-                efficiency_score=7.0,
-                practices_score=7.0,
-                communication_score=7.0,
-                feedback=feedback
-            )
-            session.responses.append(evaluation)
+        feedback = await record_answer(session, req.answer)
         
         # Check if we should end the interview (after 6 questions)
         if len(session.responses) >= 6:
-            try:
-                summary = excel_interviewer.generate_summary(session)
-            except Exception as summary_error:
-                print(f"LLM summary failed: {summary_error}")
-                summary = f"Interview completed! You answered {len(session.responses)} questions. Thank you for participating in the Excel skills assessment."
+            summary = await finish_interview(session)
             return JSONResponse({"feedback": feedback, "summary": summary, "completed": True})
         
         # Try to get next question from LLM
         try:
-            next_q = excel_interviewer.get_next_question(session)
+            next_q = await serve_next_question(session)
             if next_q:
-                timer_seconds = 90 if session.current_question.difficulty == DifficultyLevel.BEGINNER else 120 if session.current_question.difficulty == DifficultyLevel.INTERMEDIATE else 150
-                return JSONResponse({"feedback": feedback, "question": next_q, "timer": timer_seconds, "completed": False})
+                return JSONResponse({"feedback": feedback, "question": next_q, "timer": start_question_timer(session), "completed": False})
         except Exception as question_error:
-            print(f"LLM question generation failed: {question_error}")
+            log.warning("LLM question generation failed: %s", question_error)
         
         # Fallback to question bank
-        from question_bank import QUESTION_BANK
-        question_index = len(session.responses)
-        
-        if question_index < len(QUESTION_BANK):
-            next_question_obj = QUESTION_BANK[question_index]
-            session.current_question = next_question_obj
-            next_q = next_question_obj.question
-        else:
-            fallback_questions = [
-                "How would you use VLOOKUP to find data?",
-                "What's the difference between COUNT and COUNTA?",
-                "How would you create a pivot table?",
-                "What are some Excel keyboard shortcuts you use?"
-            ]
-            next_q = fallback_questions[question_index % len(fallback_questions)]
-        
-        return JSONResponse({"feedback": feedback, "question": next_q, "timer": 90, "completed": False})
+        next_q = serve_bank_question(session)
+        return JSONResponse({"feedback": feedback, "question": next_q, "timer": start_question_timer(session), "completed": False})
         
     except Exception as e:
-        print(f"Error in submit_answer: {e}")
+        log.exception("Error in submit_answer: %s", e)
         return JSONResponse({
             "feedback": "Thank you for your answer!",
             "question": "What Excel functions do you use most often?",
             "timer": 90,
             "completed": False
         })
+    finally:
+        await persist(session)
+        release_session(session)
+
+
+@app.post("/api/start/stream")
+async def start_interview_stream():
+    """Server-Sent Events version of /api/start.
+    
+    Events: `intro`, then `token` chunks of the first question (`reset` means
+    discard the chunks so far), then `done` with the final question and timer.
+    """
+    session = await new_session()
+    
+    async def events():
+        try:
+            async for event, data in start_turn(session):
+                if event == "question":
+                    yield sse_event("done", {"session_id": session.session_id, **data, "completed": False})
+                else:
+                    yield sse_event(event, data)
+        finally:
+            await persist(session)
+            release_session(session)
+    
+    return event_stream(events())
+
+
+@app.post("/api/answer/stream")
+async def submit_answer_stream(req: AnswerRequest):
+    """Server-Sent Events version of /api/answer.
+    
+    Events: `feedback`, then `token`/`reset` chunks of the next question, then
+    `done` with the final question and timer, or with the summary once the
+    interview is complete.
+    """
+    session = await lookup_session(req.session_id)
+    if session is None:
+        return session_not_found(req.session_id)
+    
+    async def events():
+        feedback = None
+        try:
+            async for event, data in answer_turn(session, req.answer):
+                if event == "feedback":
+                    feedback = data["text"]
+                if event == "question":
+                    yield sse_event("done", {"feedback": feedback, **data, "completed": False})
+                elif event == "summary":
+                    yield sse_event("done", {"feedback": feedback, "summary": data["summary"], "completed": True})
+                else:
+                    yield sse_event(event, data)
+        finally:
+            await persist(session)
+            release_session(session)
+    
+    return event_stream(events())
+
+
+async def start_turn(session: InterviewSession):
+    """Events that open an interview: `intro`, then the first question as in `next_turn`"""
+    try:
+        intro = excel_interviewer.start_interview(session)
+    except Exception as e:
+        log.warning("LLM interview failed: %s", e)
+        intro = FALLBACK_INTRO
+    yield "intro", {"session_id": session.session_id, "text": intro}
+    if QUESTION_PLAN_ENABLED:
+        await excel_interviewer.plan_interview(session)
+    async for event in next_turn(session, first=True):
+        yield event
+
+
+async def answer_turn(session: InterviewSession, answer: Optional[str]):
+    """Events for one answer (None when time ran out): `feedback`, then what `next_turn` yields"""
+    if answer is None:
+        record_timeout(session, "client")
+        feedback = TIMEOUT_FEEDBACK
+    else:
+        feedback = await record_answer(session, answer)
+    yield "feedback", {"text": feedback}
+    async for event in next_turn(session):
+        yield event
+
+
+async def next_turn(session: InterviewSession, first: bool = False):
+    """`token`/`reset` chunks then `question` with its timer, or `summary` once all six are answered"""
+    if len(session.responses) >= 6:
+        summary = await finish_interview(session)
+        yield "summary", {"summary": summary, "score": session.calculate_overall_score()}
+        return
+    
+    messages_before = len(session.messages)
+    async for event, text in stream_next_question(session, first=first):
+        yield event, {"text": text}
+    if len(session.messages) == messages_before:  # Nothing was served
+        question = serve_bank_question(session)
+        yield "token", {"text": question}
+    else:
+        question = session.current_question.question
+    yield "question", {"question": question, "timer": start_question_timer(session)}
+
+
+TIMEOUT_FEEDBACK = "Time's up! Let's move on."
+TIMEOUT_ANSWER = "[No answer - time expired]"
+
+
+def timeout_response(session: InterviewSession) -> Response:
+    return Response(
+        question_id=session.current_question.id if session.current_question else "timeout",
+        answer=TIMEOUT_ANSWER,
+        technical_score=0.0,
+        efficiency_score=0.0,
+        practices_score=0.0,
+        communication_score=0.0,
+        feedback=TIMEOUT_FEEDBACK
+    )
+
+
+@app.websocket("/ws/interview")
+async def interview_socket(websocket: WebSocket):
+    """A whole interview over one connection.
+    
+    Client messages (JSON): `{"type": "start"}`, `{"type": "resume",
+    "session_id": ...}`, `{"type": "answer", "text": ...}`, `{"type":
+    "partial", "text": ...}` with the answer typed so far, and `{"type":
+    "timeout"}` when the countdown ends; a partial answer is then scored as
+    the answer. The server pushes `session`, `intro`, `feedback`,
+    `token`/`reset` chunks, `question` (with its timer) and `summary`
+    events as soon as each is ready, and `error` for bad messages.
+    """
+    await websocket.accept()
+    channel = EventChannel(websocket.send_json, max_pending=WS_MAX_PENDING_EVENTS)
+    sender = asyncio.create_task(channel.run())
+    session = None
+    draft = ""
+    disconnected = False
+    
+    async def push_turn(events):
+        async for event, data in events:
+            channel.push({"type": event, **data})
+    
+    async def receive() -> Optional[str]:
+        """The next client message, or None as soon as the channel closes (a client that stopped reading)"""
+        receiving = asyncio.ensure_future(websocket.receive_text())
+        closing = asyncio.ensure_future(channel.wait_closed())
+        done, _ = await asyncio.wait((receiving, closing), return_when=asyncio.FIRST_COMPLETED)
+        closing.cancel()
+        if receiving in done:
+            return receiving.result()
+        receiving.cancel()
+        await asyncio.gather(receiving, return_exceptions=True)
+        return None
+    
+    try:
+        while not channel.closed:
+            text = await receive()
+            if text is None:
+                break
+            try:
+                message = json.loads(text)
+                kind = message["type"]
+            except (ValueError, TypeError, KeyError):
+                channel.push({"type": "error", "message": "Expected a JSON object with a type"})
+                continue
+            
+            if kind == "start":
+                release_session(session)  # The one this connection had before, if any
+                session, draft = await new_session(), ""
+                channel.push({"type": "session", "session_id": session.session_id})
+                await push_turn(start_turn(session))
+            elif kind == "resume":
+                release_session(session)
+                session, draft = await lookup_session(str(message.get("session_id"))), ""
+                if session is None:
+                    channel.push({"type": "error", "message": "Unknown or expired session"})
+                    continue
+                channel.push({"type": "session", "session_id": session.session_id})
+                if len(session.responses) >= 6:
+                    await push_turn(next_turn(session))
+                elif question_timed_out(session):  # The server timed it out while the client was away
+                    channel.push({"type": "feedback", "text": TIMEOUT_FEEDBACK})
+                    await push_turn(next_turn(session))
+                elif session.current_question is not None:
+                    channel.push({"type": "question", "question": session.current_question.question,
+                                  "timer": question_time_left(session)})
+            elif session is None:
+                channel.push({"type": "error", "message": "Send start or resume first"})
+                continue
+            elif kind == "partial":
+                draft = str(message.get("text", ""))
+                continue
+            elif kind in ("answer", "timeout"):
+                if len(session.responses) >= 6:
+                    channel.push({"type": "error", "message": "The interview is already complete"})
+                    continue
+                answer = str(message.get("text", "")) if kind == "answer" else (draft.strip() or None)
+                draft = ""
+                await push_turn(answer_turn(session, answer))
+            else:
+                channel.push({"type": "error", "message": f"Unknown message type {kind!r}"})
+                continue
+            await persist(session)
+    except WebSocketDisconnect:
+        disconnected = True
+    finally:
+        await persist(session)
+        release_session(session)
+        channel.close()
+        await channel.drain(timeout=1.0)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        if not disconnected:  # The channel closed first: the client stopped reading or a send failed
+            try:
+                await websocket.close(code=SLOW_CONSUMER if channel.overflowed else 1000)
+            except Exception as e:
+                log.debug("WebSocket close failed: %r", e)
 
 
 @app.post("/api/timeout")
-def handle_timeout():
+async def handle_timeout(req: SessionRequest):
     """Handle when timer runs out"""
+    session = await lookup_session(req.session_id)
+    if session is None:
+        return session_not_found(req.session_id)
     try:
-        # Add timeout response
-        timeout_response = Response(
-            question_id=session.current_question.id if session.current_question else "timeout",
-            answer="[No answer - time expired]",
-            technical_score=0.0,
-            efficiency_score=0.0,
-            practices_score=0.0,
-            communication_score=0.0,
-            feedback="Time's up! Let's move on."
-        )
-        session.responses.append(timeout_response)
+        record_timeout(session, "client")
         
         # Check if this was the last question (6th question)
         if len(session.responses) >= 6:
             # End interview - generate summary
+            end_interview(session)
             try:
-                summary = excel_interviewer.generate_summary(session)
+                summary = await excel_interviewer.generate_summary(session)
                 return JSONResponse({"summary": summary, "completed": True})
             except Exception as summary_error:
-                print(f"Summary generation error: {summary_error}")
+                log.warning("Summary generation error: %s", summary_error)
                 basic_summary = f"""EXCEL SKILLS ASSESSMENT REPORT
 {'=' * 50}
 
@@ -253,73 +842,135 @@ Assessment Complete"""
                 return JSONResponse({"summary": basic_summary, "completed": True})
         else:
             # Move to next question
-            next_question = excel_interviewer.get_next_question(session)
+            next_question = await serve_next_question(session)
             if next_question:
-                timer_seconds = 60 if session.current_question.difficulty == DifficultyLevel.BEGINNER else 90 if session.current_question.difficulty == DifficultyLevel.INTERMEDIATE else 120
                 return JSONResponse({
-                    "feedback": "Time's up! Let's move on.",
+                    "feedback": TIMEOUT_FEEDBACK,
                     "question": next_question,
-                    "timer": timer_seconds,
+                    "timer": start_question_timer(session),
                     "completed": False
                 })
             else:
                 # Question generation failed - end interview only if we have enough questions
                 if len(session.responses) >= 6:
-                    summary = excel_interviewer.generate_summary(session)
+                    summary = await excel_interviewer.generate_summary(session)
                     return JSONResponse({"summary": summary, "completed": True})
                 else:
-                    print(f"Timeout: Question generation failed at question {len(session.responses) + 1}")
+                    log.error("Timeout: question generation failed at question %d", len(session.responses) + 1)
                     fallback_summary = f"Interview ended early due to technical issues. {len(session.responses)} questions completed."
                     return JSONResponse({"summary": fallback_summary, "completed": True})
             
     except Exception as e:
-        print(f"Timeout error: {e}")
+        log.exception("Timeout error: %s", e)
         # Fallback - end interview
         fallback_summary = "Interview ended due to timeout. Please try again when you have more time available."
         return JSONResponse({"summary": fallback_summary, "completed": True})
+    finally:
+        await persist(session)
+        release_session(session)
 
 @app.get("/api/summary")
-def get_summary():
+async def get_summary(session_id: str):
+    session = await lookup_session(session_id)
+    if session is None:
+        return session_not_found(session_id)
     try:
-        summary = excel_interviewer.generate_summary(session)
+        summary = await excel_interviewer.generate_summary(session)
         overall_score = session.calculate_overall_score()
         return JSONResponse({"summary": summary, "score": overall_score})
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
+    finally:
+        await persist(session)
+        release_session(session)
 
+# Endpoints that can evict sessions are async: evict listeners cancel timers and prefetches, which
+# must happen on the event loop, not on the threadpool FastAPI runs plain functions on
 @app.get("/debug/session")
-def debug_session():
-    """Debug current session state"""
+async def debug_session(session_id: str):
+    """Debug a live session's state"""
+    session = await lookup_session(session_id)
+    if session is None:
+        return session_not_found(session_id)
+    release_session(session)
     return {
         "session_id": session.session_id,
         "state": session.state,
         "responses_count": len(session.responses),
         "messages_count": len(session.messages) if hasattr(session, 'messages') else 0,
         "current_question_id": session.current_question.id if session.current_question else None,
+        "question_time_left": question_time_left(session) if session.question_deadline is not None else None,
         "groq_key_set": bool(GROQ_API_KEY),
         "groq_key_prefix": GROQ_API_KEY[:10] if GROQ_API_KEY else "None"
     }
 
-# Mount static files AFTER all API routes
-if os.path.exists("frontend/build/index.html"):
-    # Serve React build
-    app.mount("/static", StaticFiles(directory="frontend/build/static"), name="static")
-    app.mount("/", StaticFiles(directory="frontend/build", html=True), name="frontend")
-else:
-    # Serve static HTML
-    app.mount("/static", StaticFiles(directory="static"), name="static")
-    
-    @app.get("/", response_class=HTMLResponse)
-    def root():
-        try:
-            with open("static/index.html", "r") as f:
-                return HTMLResponse(f.read())
-        except:
-            return HTMLResponse("""
+@app.get("/debug/sessions")
+async def debug_sessions():
+    """Registry-wide counters"""
+    await sessions.apurge_expired()
+    stats = await asyncio.to_thread(sessions.stats)  # Counting shared sessions is a database query
+    return {**stats, "question_timers": deadlines.stats()}
+
+@app.get("/debug/prefetch")
+def debug_prefetch():
+    """Prefetch hit/miss/wasted counters"""
+    if not prefetcher:
+        return {"enabled": False}
+    return {"enabled": True, **prefetcher.stats()}
+
+@app.get("/debug/log")
+def debug_log():
+    """Durable session log counters"""
+    if session_log is None:
+        return {"enabled": False}
+    return {"enabled": True, **session_log.stats()}
+
+@app.get("/debug/pool")
+def debug_pool():
+    """Warm question pool sizes and counters"""
+    pool = excel_interviewer.question_pool
+    if pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **pool.stats()}
+
+@app.get("/debug/questions")
+def debug_questions():
+    """Near-duplicate index size and lookup counters"""
+    index = excel_interviewer.question_index
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.stats()}
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: route and LLM latency histograms, question sources, cache hit counters"""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/providers")
+def debug_providers():
+    """Per-provider latency, error rate and circuit state from the LLM router"""
+    stats = excel_interviewer.router.stats()
+    stats["single_flight"] = excel_interviewer.single_flight.stats()
+    stats["admission"] = excel_interviewer.admission.stats()
+    return stats
+
+# Mount static files AFTER all API routes. Assets are read and compressed once, here.
+FALLBACK_PAGE = """
 <!DOCTYPE html>
 <html><head><title>Excel Mock Interviewer</title></head>
 <body>
 <h1>🎯 Excel Mock Interviewer</h1>
 <p>API is running. Use /api/start to begin.</p>
 </body></html>
-            """)
+"""
+if os.path.exists("frontend/build/index.html"):
+    # Serve React build; client-side routes fall back to index.html
+    frontend = StaticBundle("frontend/build", spa_fallback=True)
+    app.mount("/", frontend, name="frontend")
+else:
+    # Serve static HTML
+    frontend = StaticBundle("static" if os.path.isdir("static") else None)
+    if "index.html" not in frontend.assets:
+        frontend.add("index.html", FALLBACK_PAGE.encode())
+    app.mount("/static", frontend, name="static")
+    app.mount("/", frontend, name="frontend")
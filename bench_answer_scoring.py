@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark heuristic answer scoring throughput on one core.
+
+Usage: python bench_answer_scoring.py [--answers N]
+"""
+
+import argparse
+import random
+import time
+
+from answer_scoring import MATCHER
+from interviewer import ExcelInterviewer
+
+FILLER = ("i would first look at the sheet and then probably check each row carefully before "
+          "changing anything so that the totals stay correct for the team").split()
+EXCEL = ["vlookup", "pivot table", "SUMIFS", "conditional formatting", "INDEX/MATCH", "power query"]
+UNSURE = ["not sure", "no idea", "I don't know"]
+
+
+def make_answers(count: int):
+    answers = []
+    for _ in range(count):
+        words = random.choices(FILLER, k=random.randint(5, 60))
+        roll = random.random()
+        if roll < 0.4:
+            words.insert(random.randrange(len(words) + 1), random.choice(EXCEL))
+        elif roll < 0.5:
+            words.insert(0, random.choice(UNSURE))
+        answers.append(" ".join(words))
+    return answers
+
+
+def per_minute(count: int, seconds: float) -> str:
+    return f"{count / seconds * 60 / 1e6:6.2f}M answers/min"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=200_000)
+    args = parser.parse_args()
+    answers = make_answers(args.answers)
+    print(f"{MATCHER.vocabulary_size} terms, {len(answers)} answers, "
+          f"{sum(map(len, answers)) / len(answers):.0f} chars on average")
+
+    start = time.perf_counter()
+    for answer in answers:
+        MATCHER.classify(answer)
+    print(f"classify        {per_minute(len(answers), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    MATCHER.classify_batch(answers)
+    print(f"classify_batch  {per_minute(len(answers), time.perf_counter() - start)}")
+
+    interviewer = ExcelInterviewer(api_key="")
+    start = time.perf_counter()
+    interviewer.evaluate_batch(answers)
+    print(f"evaluate_batch  {per_minute(len(answers), time.perf_counter() - start)} (with Response objects)")
+
+
+if __name__ == "__main__":
+    main()
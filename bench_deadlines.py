@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark question timers: start, cancel and expiry cost in the timing wheel against a heap.
+
+Usage: python bench_deadlines.py [--timers N]
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from deadlines import TimingWheel
+
+TIMERS = [1_000, 10_000, 100_000]
+
+
+def bench_wheel(deadlines):
+    wheel = TimingWheel(tick=1.0, slots=512, now=0.0)
+    started = time.perf_counter()
+    for key, when in deadlines:
+        wheel.schedule(key, when)
+    scheduled = time.perf_counter()
+    for key, _ in deadlines[::2]:
+        wheel.cancel(key)
+    cancelled = time.perf_counter()
+    expired = sum(len(wheel.advance(float(now))) for now in range(1, 240))
+    done = time.perf_counter()
+    assert expired == len(deadlines) - len(deadlines[::2])
+    return scheduled - started, cancelled - scheduled, done - cancelled
+
+
+def bench_heap(deadlines):
+    # Cancelling in a heap means marking the entry and skipping it when it reaches the top
+    heap, live = [], {}
+    started = time.perf_counter()
+    for key, when in deadlines:
+        live[key] = when
+        heapq.heappush(heap, (when, key))
+    scheduled = time.perf_counter()
+    for key, _ in deadlines[::2]:
+        del live[key]
+    cancelled = time.perf_counter()
+    expired = 0
+    for now in range(1, 240):
+        while heap and heap[0][0] <= now:
+            when, key = heapq.heappop(heap)
+            if live.get(key) == when:
+                del live[key]
+                expired += 1
+    done = time.perf_counter()
+    assert expired == len(deadlines) - len(deadlines[::2])
+    return scheduled - started, cancelled - scheduled, done - cancelled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, nargs="*", default=TIMERS)
+    args = parser.parse_args()
+
+    print(f"{'timers':>8} {'structure':>9} {'start us':>9} {'cancel us':>10} {'expire us':>10}")
+    for count in args.timers:
+        # Timers of 90 to 160 seconds (the longest question plus the grace period), started over a minute
+        deadlines = [(f"session-{n}", random.uniform(0, 60) + random.choice((90, 120, 150)) + 10)
+                     for n in range(count)]
+        for name, bench in (("wheel", bench_wheel), ("heap", bench_heap)):
+            start, cancel, expire = bench(deadlines)
+            half = count - count // 2
+            print(f"{count:>8} {name:>9} {start / count * 1e6:>9.2f} {cancel / (count // 2) * 1e6:>10.2f} "
+                  f"{expire / half * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
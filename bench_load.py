@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""End-to-end load benchmark: the real app against a local stand-in LLM server.
+
+Usage: python bench_load.py [--interviews N] [--concurrency N] [--workers N] [--llm-latency-ms MS] ...
+
+Boots a fake Groq/Hugging Face server and `uvicorn app:app` pointed at it
+(GROQ_BASE_URL / HF_API_URL), then drives complete interviews: /api/start,
+six /api/answer or /api/timeout calls and /api/summary. Reports p50/p95/p99
+per route and interviews per second. With --workers N uvicorn runs N
+worker processes sharing sessions through a throwaway SQLite database.
+Runs fully offline; --max-p95-ms and
+--min-rate turn it into a release gate (exit code 1 on regression).
+Other app settings (LLM_DEADLINE_SECONDS, QUESTION_POOL_ENABLED, ...) are
+passed through from the environment.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+ANSWERS = [
+    "I would use SUMIFS with the region and date columns as criteria.",
+    "A pivot table with Region in rows and Sales in values, then a slicer for the month.",
+    "INDEX/MATCH is more flexible than VLOOKUP because it can look to the left.",
+    "I'm not sure, I haven't done that before.",
+    "I would check each row by hand and then tell my manager what I found.",
+    "Power Query to merge the two tables, then load it to the data model.",
+]
+TOPICS = ["SUMIFS", "pivot tables", "XLOOKUP", "conditional formatting", "data validation",
+          "INDEX/MATCH", "Power Query", "dynamic arrays", "named ranges", "macros"]
+
+
+# ---- stand-in LLM server ----------------------------------------------------
+
+def make_fake_llm_app(latency_ms: float, jitter: float, token_ms: float, error_rate: float, hang_rate: float):
+    """FastAPI app speaking just enough of the Groq and Hugging Face APIs"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    fake = FastAPI()
+    counters = defaultdict(int)
+
+    def question_text() -> str:
+        counters["questions"] += 1
+        return (f"Here's a situation: how would you use {random.choice(TOPICS)} to tidy up "
+                f"report #{counters['questions']} for the {random.choice(['sales', 'finance', 'ops'])} team?")
+
+    async def upstream_delay():
+        """Sleep like a real provider; returns an error response or None"""
+        roll = random.random()
+        if roll < hang_rate:
+            counters["hangs"] += 1
+            await asyncio.sleep(60)
+        elif roll < hang_rate + error_rate:
+            counters["errors"] += 1
+            return JSONResponse({"error": {"message": "fake upstream error"}}, status_code=503)
+        # Log-normal around the median, like real inference latency
+        await asyncio.sleep(latency_ms / 1000 * math.exp(random.gauss(0, jitter)))
+        return None
+
+    @fake.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @fake.get("/stats")
+    async def stats():
+        return dict(counters)
+
+    @fake.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["groq_requests"] += 1
+        error = await upstream_delay()
+        if error is not None:
+            return error
+        text = question_text()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        if not body.get("stream"):
+            return {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": body["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 30, "total_tokens": 130},
+            }
+
+        async def events():
+            for word in text.split(" "):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                         "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(token_ms / 1000)
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @fake.post("/hf")
+    async def huggingface():
+        counters["hf_requests"] += 1
+        error = await upstream_delay()
+        if error is not None:
+            return error
+        return [{"generated_text": question_text()}]
+
+    return fake
+
+
+# ---- process management -----------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"{url} exited with code {process.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f"{url} did not become ready within {timeout:.0f}s")
+
+
+def start_processes(args):
+    here = os.path.dirname(os.path.abspath(__file__))
+    fake_port, app_port = free_port(), free_port()
+    fake = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-fake", str(fake_port),
+         "--llm-latency-ms", str(args.llm_latency_ms), "--llm-jitter", str(args.llm_jitter),
+         "--llm-token-ms", str(args.llm_token_ms), "--llm-error-rate", str(args.llm_error_rate),
+         "--llm-hang-rate", str(args.llm_hang_rate)],
+        cwd=here,
+    )
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    env = dict(os.environ)
+    env.update(GROQ_API_KEY="fake-groq-key", GROQ_BASE_URL=fake_url,
+               HF_TOKEN="fake-hf-token", HF_API_URL=f"{fake_url}/hf")
+    if args.workers > 1:
+        env.update(WEB_CONCURRENCY=str(args.workers),
+                   SESSION_DB_PATH=os.path.join(args.state_dir, "sessions.db"))
+    app_log = open(args.app_log, "w")
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(app_port),
+         "--log-level", "warning", "--workers", str(args.workers)],
+        cwd=here, env=env, stdout=app_log, stderr=subprocess.STDOUT,
+    )
+    processes = [fake, app]
+    try:
+        wait_ready(f"{fake_url}/health", fake)
+        wait_ready(f"http://127.0.0.1:{app_port}/health", app)
+    except BaseException:
+        stop_processes(processes)
+        raise
+    return f"http://127.0.0.1:{app_port}", fake_url, processes
+
+
+def stop_processes(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ---- load driver ------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, route: str, request):
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            raise
+        self.latencies[route].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            self.errors[route] += 1
+            response.raise_for_status()
+        return response.json()
+
+
+async def run_interview(client: httpx.AsyncClient, recorder: Recorder, timeout_rate: float):
+    started = time.perf_counter()
+    data = await recorder.call("start", client.post("/api/start"))
+    session_id = data["session_id"]
+    for _ in range(6):
+        if random.random() < timeout_rate:
+            data = await recorder.call("timeout", client.post("/api/timeout", json={"session_id": session_id}))
+        else:
+            data = await recorder.call("answer", client.post(
+                "/api/answer", json={"session_id": session_id, "answer": random.choice(ANSWERS)}))
+        if data.get("completed"):
+            break
+    await recorder.call("summary", client.get("/api/summary", params={"session_id": session_id}))
+    recorder.latencies["interview"].append(time.perf_counter() - started)
+
+
+async def drive(base_url: str, interviews: int, concurrency: int, timeout_rate: float):
+    recorder = Recorder()
+    failed = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        async def one():
+            nonlocal failed
+            async with semaphore:
+                try:
+                    await run_interview(client, recorder, timeout_rate)
+                except (httpx.HTTPError, KeyError, ValueError):
+                    failed += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(interviews)))
+        elapsed = time.perf_counter() - started
+    return recorder, failed, elapsed
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def build_report(recorder: Recorder, failed: int, elapsed: float, interviews: int) -> dict:
+    routes = {}
+    for route, values in recorder.latencies.items():
+        routes[route] = {
+            "count": len(values),
+            "errors": recorder.errors.get(route, 0),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1),
+        }
+    completed = interviews - failed
+    return {
+        "interviews": interviews,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "interviews_per_second": round(completed / elapsed, 2) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+def print_report(report: dict, llm_stats: dict):
+    print(f"\n{'route':<10} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for route in ("start", "answer", "timeout", "summary", "interview"):
+        row = report["routes"].get(route)
+        if row:
+            print(f"{route:<10} {row['count']:>7} {row['errors']:>7} {row['p50_ms']:>9} "
+                  f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}")
+    print(f"\n{report['interviews'] - report['failed']}/{report['interviews']} interviews in "
+          f"{report['seconds']}s = {report['interviews_per_second']} interviews/s")
+    print(f"Fake LLM: {llm_stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--timeout-rate", type=float, default=0.1, help="share of turns that time out")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="median fake LLM latency")
+    parser.add_argument("--llm-jitter", type=float, default=0.5, help="log-normal sigma of the latency")
+    parser.add_argument("--llm-token-ms", type=float, default=5, help="delay between streamed tokens")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="share of LLM calls that return 503")
+    parser.add_argument("--llm-hang-rate", type=float, default=0.0, help="share of LLM calls that never answer")
+    parser.add_argument("--app-log", default=os.devnull, help="where the app's stdout goes")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any route's p95 is above this")
+    parser.add_argument("--min-rate", type=float, help="fail below this many interviews/s")
+    parser.add_argument("--serve-fake", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_fake:
+        import uvicorn
+        fake = make_fake_llm_app(args.llm_latency_ms, args.llm_jitter, args.llm_token_ms,
+                                 args.llm_error_rate, args.llm_hang_rate)
+        uvicorn.run(fake, host="127.0.0.1", port=args.serve_fake, log_level="warning")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as args.state_dir:
+        base_url, fake_url, processes = start_processes(args)
+        try:
+            recorder, failed, elapsed = asyncio.run(drive(base_url, args.interviews, args.concurrency,
+                                                          args.timeout_rate))
+            llm_stats = httpx.get(f"{fake_url}/stats").json()
+        finally:
+            stop_processes(processes)
+
+    report = build_report(recorder, failed, elapsed, args.interviews)
+    report["llm"] = llm_stats
+    print_report(report, llm_stats)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    problems = []
+    if failed:
+        problems.append(f"{failed} interviews failed")
+    if args.max_p95_ms is not None:
+        problems += [f"{route} p95 {row['p95_ms']}ms > {args.max_p95_ms}ms"
+                     for route, row in report["routes"].items()
+                     if route != "interview" and row["p95_ms"] > args.max_p95_ms]
+    if args.min_rate is not None and report["interviews_per_second"] < args.min_rate:
+        problems.append(f"{report['interviews_per_second']} interviews/s < {args.min_rate}")
+    if problems:
+        sys.exit("FAIL: " + "; ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark the request-path cost of logging: print() vs disabled debug vs queued JSON records.
+
+Usage: python bench_logging.py [--calls 100000]
+"""
+
+import argparse
+import io
+import logging
+import time
+
+from structured_logging import setup_logging, shutdown_logging
+
+QUESTION = "Here's a common scenario: how would you use SUMIFS to total sales per region and month?"
+
+
+def timed(label, calls, fn):
+    started = time.perf_counter()
+    for n in range(calls):
+        fn(n)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed / calls * 1e6:8.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # The old per-question output, written to a buffer so the terminal is not the bottleneck
+    sink = io.StringIO()
+
+    def old_print(n):
+        print(f"Generated question: {QUESTION}", file=sink)
+        print(f"Question length: {len(QUESTION)} chars", file=sink)
+    timed("print() (to a buffer)", args.calls, old_print)
+
+    listener = setup_logging(level="INFO", fmt="json", queue_size=args.calls + 1)
+    log = logging.getLogger("bench")
+    # Keep the writer from competing with the benchmark for the terminal
+    listener.handlers[0].setStream(io.StringIO())
+
+    timed("log.debug() below LOG_LEVEL", args.calls,
+          lambda n: log.debug("Generated question: %s", QUESTION, extra={"question_chars": len(QUESTION)}))
+    timed("log.info() queued for writer", args.calls,
+          lambda n: log.info("Generated question: %s", QUESTION, extra={"question_chars": len(QUESTION)}))
+    started = time.perf_counter()
+    shutdown_logging()
+    print(f"{'writer drain after burst':<34} {time.perf_counter() - started:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark the near-duplicate question index: query time and memory as the number of topics grows.
+
+Usage: python bench_near_duplicates.py [--topics N ...] [--queries N]
+"""
+
+import argparse
+import random
+import resource
+import time
+
+from near_duplicates import QuestionIndex, minhash
+
+TOPICS = [10_000, 100_000, 1_000_000]  # The last size takes about two minutes and 2 GB
+QUERIES = 2_000
+VOCABULARY = [f"term{n}" for n in range(50_000)]
+
+
+def make_question(words):
+    return f"How would you use {words[0]} and {words[1]} to work out the {' '.join(words[2:])}?"
+
+
+def paraphrase(words):
+    # Same topic: two of seven content words swapped (similarity 5/9) and the wording changed
+    changed = list(words)
+    for position in random.sample(range(len(changed)), 2):
+        changed[position] = random.choice(VOCABULARY)
+    random.shuffle(changed)
+    return f"Imagine you need the {' '.join(changed[2:])}. How would you get it with {changed[0]} and {changed[1]}?"
+
+
+def run(count: int, queries: int):
+    index = QuestionIndex(capacity=count)
+    topics = [random.sample(VOCABULARY, 7) for _ in range(count)]
+    started = time.perf_counter()
+    for words in topics:
+        # Signatures are computed uncached, as for a question never seen before (its words are
+        # cached per word, as they would be for a real question vocabulary)
+        index.record(make_question(words))
+        minhash.cache_clear()
+    build = time.perf_counter() - started
+
+    sample = random.sample(topics, min(queries, count))
+    texts = [paraphrase(words) for words in sample] + [make_question(random.sample(VOCABULARY, 7))
+                                                       for _ in range(len(sample))]
+    timings = []
+    found = 0
+    for text in texts:
+        minhash.cache_clear()
+        started = time.perf_counter()
+        found += index.exposure(text) > 0
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    paraphrases_found = found / len(sample)  # Fresh questions are practically never matched
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{count:>9} {build / count * 1e6:>10.1f} {timings[len(timings) // 2] * 1e6:>9.1f} "
+          f"{timings[int(len(timings) * 0.99)] * 1e6:>9.1f} {paraphrases_found:>10.0%} {rss_mb:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, nargs="*", default=TOPICS)
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    args = parser.parse_args()
+
+    print(f"{'topics':>9} {'record us':>10} {'query p50':>9} {'query p99':>9} {'paraphrase':>10} {'max RSS MB':>9}")
+    for count in args.topics:
+        run(count, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark the durable session log: request-path cost of record() and recovery time vs log size.
+
+Usage: python bench_session_log.py [--no-fsync]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from models import InterviewSession, InterviewState, Question, QuestionType, DifficultyLevel, Response
+from session_log import SessionLog
+
+SIZES = [1_000, 10_000, 50_000]
+TURNS = 6
+
+
+def play_turn(session, n):
+    session.current_question = Question(id=f"gen_{n}", type=QuestionType.FORMULA, difficulty=DifficultyLevel.BEGINNER,
+                                        question=f"Here's a common scenario... question {n} about SUMIFS?",
+                                        expected_answer="Dynamic evaluation", scoring_criteria={})
+    session.add_message("assistant", session.current_question.question)
+    session.responses.append(Response(question_id=f"gen_{n}", answer="I would use SUMIFS with a named range " * 3,
+                                      technical_score=7.5, efficiency_score=8.0, practices_score=7.0,
+                                      communication_score=8.5, feedback="Great! Nice thinking on that one!"))
+    session.add_message("user", session.responses[-1].answer)
+
+
+def run(size: int, fsync: bool):
+    directory = tempfile.mkdtemp(prefix="session-log-")
+    try:
+        log = SessionLog(directory, fsync=fsync, compact_bytes=1 << 40)  # measure raw segments, no compaction
+        log.replay()
+        sessions = [InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO) for _ in range(size)]
+        record_time = 0.0
+        for n in range(1, TURNS + 1):
+            for session in sessions:
+                play_turn(session, n)
+                start = time.perf_counter()
+                log.record(session)
+                record_time += time.perf_counter() - start
+        start = time.perf_counter()
+        log.close()
+        drain = time.perf_counter() - start
+        log_bytes = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+
+        start = time.perf_counter()
+        restored = SessionLog(directory).replay()
+        recovery = time.perf_counter() - start
+        assert len(restored) == size
+
+        turns = size * TURNS
+        print(f"{size:>7} sessions | {log_bytes / 1e6:7.1f} MB | record {record_time / turns * 1e6:5.1f} us/turn | "
+              f"{log.batches:>6} batches ({log.events_written / max(log.batches, 1):6.1f} events/batch) | "
+              f"final drain {drain * 1000:6.1f} ms | recovery {recovery:6.2f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+    print(f"=== SESSION LOG BENCHMARK ({TURNS} turns per session, fsync={'off' if args.no_fsync else 'on'}) ===")
+    for size in SIZES:
+        run(size, fsync=not args.no_fsync)
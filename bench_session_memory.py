@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark memory held per idle session, live (pydantic) vs packed (CompactSession).
+
+Usage: python bench_session_memory.py [--sessions 100000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+
+from interviewer import ExcelInterviewer
+from models import DifficultyLevel, InterviewSession, InterviewState
+from question_bank import QUESTION_BANK
+from session_store import SessionRegistry
+
+interviewer = ExcelInterviewer(api_key="")
+
+
+def play(turns: int) -> InterviewSession:
+    """A session after `turns` answered questions; odd turns are served from the bank"""
+    session = InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO)
+    interviewer.start_interview(session)
+    for n in range(turns + (turns < 6)):
+        if n % 2:
+            question = QUESTION_BANK[n % len(QUESTION_BANK)]
+        else:
+            question = interviewer.make_generated_question(
+                session, DifficultyLevel.INTERMEDIATE,
+                f"Here's a common scenario: a 40,000-row export of sales by region arrives every month "
+                f"(case {random.getrandbits(32)}). How would you total it by region and flag missing months?")
+        interviewer.serve_question(session, question)
+        if n < turns:
+            interviewer.evaluate_answer(session, question,
+                                        f"I would use SUMIFS over the region and month columns with a named range "
+                                        f"for the criteria, then COUNTIFS to flag gaps ({random.getrandbits(32)})")
+    if turns == 6:
+        interviewer.generate_summary(session)
+    return session
+
+
+def fill(count: int, compact: bool):
+    registry = SessionRegistry(max_sessions=count * 2, compact_after_seconds=0 if compact else None)
+    ids = []
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(count):
+        session = registry.put(play(i % 7))  # Spread evenly from just-started to finished
+        ids.append(session.session_id)
+    del session
+    registry.purge_expired()  # Packs everything that is idle
+    elapsed = time.perf_counter() - started
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return registry, ids, held, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"=== SESSION MEMORY BENCHMARK ({args.sessions} idle sessions, 0-6 answers each) ===")
+    results = {}
+    for compact in (False, True):
+        registry, ids, held, elapsed = fill(args.sessions, compact)
+        label = "packed" if compact else "live"
+        results[label] = held
+        print(f"{label:>6} | {held / 2**20:8.1f} MiB total | {held / args.sessions:7.0f} B/session | "
+              f"built in {elapsed:5.1f} s")
+        if compact:
+            sample = random.sample(ids, min(10_000, len(ids)))
+            started = time.perf_counter()
+            for session_id in sample:
+                registry.get(session_id)
+            print(f"unpack on get: {(time.perf_counter() - started) / len(sample) * 1e6:.1f} us/session")
+        del registry, ids
+    print(f"packed sessions use {results['packed'] / results['live']:.0%} of the live footprint")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark SessionRegistry lookup/insert cost as the number of live sessions grows.
+
+Usage: python bench_session_store.py [--threads N]
+"""
+
+import argparse
+import random
+import threading
+import time
+import uuid
+
+from models import InterviewSession, InterviewState
+from session_store import SessionRegistry
+
+SIZES = [100, 1_000, 10_000, 100_000]
+OPS = 50_000
+
+
+def run(size: int, threads: int):
+    registry = SessionRegistry(max_sessions=size * 2, ttl_seconds=3600)
+    ids = []
+    for _ in range(size):
+        session = registry.put(InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO))
+        ids.append(session.session_id)
+
+    # Inserts are measured on fresh sessions built up front so model construction is not timed
+    fresh = [InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO) for _ in range(OPS)]
+    lookups = [random.choice(ids) for _ in range(OPS)]
+    per_thread = OPS // threads
+
+    def do_gets(chunk):
+        for session_id in chunk:
+            registry.get(session_id)
+
+    def do_puts(chunk):
+        for session in chunk:
+            registry.put(session)
+
+    def timed(fn, items):
+        workers = [threading.Thread(target=fn, args=(items[i * per_thread:(i + 1) * per_thread],))
+                   for i in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        return (time.perf_counter() - start) / (per_thread * threads) * 1e9
+
+    get_ns = timed(do_gets, lookups)
+    put_ns = timed(do_puts, fresh)
+    print(f"{size:>8} live | get {get_ns:7.0f} ns/op | put {put_ns:7.0f} ns/op")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    print(f"=== SESSION REGISTRY BENCHMARK ({args.threads} threads, {OPS} ops) ===")
+    for size in SIZES:
+        run(size, args.threads)
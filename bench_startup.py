@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark cold start: per-module import cost of `app` and time to the first /health response.
+
+Usage: python bench_startup.py [--runs 5] [--top 15] [--max-health-ms MS]
+
+Import cost comes from `python -X importtime -c "import app"`, grouped by
+top-level package. Time to first /health is measured from spawning
+`uvicorn app:app` until /health returns 200, which is what a scale-from-zero
+platform waits for. A dummy GROQ_API_KEY is set so provider setup is
+exercised; nothing is sent to the network. --max-health-ms exits 1 when the
+median is slower.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def app_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "bench-startup-key")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def import_costs():
+    """(total seconds, {top-level package: self seconds}) for importing app"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=HERE, env=app_env(),
+                            capture_output=True, text=True, check=True)
+    by_package = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        by_package[name.split(".")[0]] += int(self_us)
+        if name == "app":
+            total = int(cumulative_us)
+    return total / 1e6, {name: us / 1e6 for name, us in by_package.items()}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_health(timeout: float = 30.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "app:app", "--port", str(port),
+                                "--log-level", "warning"], cwd=HERE, env=app_env(),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                sys.exit(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1.0) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        sys.exit(f"/health did not answer within {timeout:.0f}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-health-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    totals, packages = [], defaultdict(list)
+    for _ in range(args.runs):
+        total, by_package = import_costs()
+        totals.append(total)
+        for name, seconds in by_package.items():
+            packages[name].append(seconds)
+    print(f"=== IMPORT COST (median of {args.runs}) ===")
+    print(f"import app: {statistics.median(totals) * 1000:.0f} ms")
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"  {name:<28} {statistics.median(samples) * 1000:7.1f} ms")
+    for absent in ("groq", "requests", "httpx"):
+        if absent not in packages:
+            print(f"  {absent:<28}     (not imported)")
+
+    health = [time_to_health() for _ in range(args.runs)]
+    median_ms = statistics.median(health) * 1000
+    print(f"=== FIRST /health (median of {args.runs}) ===")
+    print(f"spawn to 200: {median_ms:.0f} ms (min {min(health) * 1000:.0f}, max {max(health) * 1000:.0f})")
+    if args.max_health_ms is not None and median_ms > args.max_health_ms:
+        print(f"FAIL: first /health took {median_ms:.0f} ms (limit {args.max_health_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# Server-side question deadlines, kept in a timing wheel
+import asyncio
+import logging
+import math
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+log = logging.getLogger(__name__)
+
+
+class TimingWheel:
+    """Hashed timing wheel: `slots` buckets of `tick` seconds each.
+
+    A timer goes in the bucket of the tick it expires at (modulo the wheel
+    size) and an index maps its key to that tick, so `schedule` and
+    `cancel` are O(1) whatever the number of timers. `advance` visits one
+    bucket per elapsed tick. A timer more than one revolution away shares
+    its bucket with nearer ones and is skipped until its own tick comes
+    round, so size the wheel to cover the longest timer. Timers fire at
+    tick granularity but never before their deadline.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, now: float = 0.0):
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick must be positive and slots at least 1")
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]  # key -> expiry tick
+        self._ticks: Dict[Hashable, int] = {}
+        self._current = int(now // tick)  # Last tick processed
+
+    def schedule(self, key: Hashable, when: float):
+        """Fire `key` once `when` has passed, replacing any timer it already has"""
+        self.cancel(key)
+        at = max(math.ceil(when / self.tick), self._current + 1)
+        self._slots[at % len(self._slots)][key] = at
+        self._ticks[key] = at
+
+    def cancel(self, key: Hashable) -> bool:
+        at = self._ticks.pop(key, None)
+        if at is None:
+            return False
+        del self._slots[at % len(self._slots)][key]
+        return True
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Remove and return the keys whose deadline is at or before `now`"""
+        target = int(now // self.tick)
+        if target <= self._current:
+            return []
+        # After falling a whole revolution behind, every bucket is visited once
+        first = max(self._current + 1, target - len(self._slots) + 1)
+        expired = []
+        for tick in range(first, target + 1):
+            bucket = self._slots[tick % len(self._slots)]
+            if not bucket:
+                continue
+            due = [key for key, at in bucket.items() if at <= target]
+            for key in due:
+                del bucket[key]
+                del self._ticks[key]
+            expired.extend(due)
+        self._current = target
+        return expired
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ticks
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+
+class DeadlineScheduler:
+    """Calls `on_expired(key)` for each key whose deadline passes.
+
+    Deadlines are wall-clock times, so one stored with a session means the
+    same thing in every worker and after a restart. A task on the event
+    loop advances the wheel every `tick` seconds; `schedule` and `cancel`
+    must be called from that loop too. `on_expired` may be a coroutine
+    function, in which case each call runs as its own task.
+    """
+
+    def __init__(
+        self,
+        on_expired: Callable[[str], Optional[Awaitable[None]]],
+        tick: float = 1.0,
+        slots: int = 512,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.on_expired = on_expired
+        self._clock = clock
+        self.wheel = TimingWheel(tick, slots, now=clock())
+        self._task: Optional[asyncio.Task] = None
+        self._callbacks: Set[asyncio.Task] = set()
+        self.scheduled = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    def schedule(self, key: str, when: float):
+        self.wheel.schedule(key, when)
+        self.scheduled += 1
+
+    def cancel(self, key: str):
+        if self.wheel.cancel(key):
+            self.cancelled += 1
+
+    def expire_due(self) -> int:
+        """Run the callback for every deadline that has passed. Returns how many fired."""
+        expired = self.wheel.advance(self._clock())
+        for key in expired:
+            self.expired += 1
+            try:
+                result = self.on_expired(key)
+            except Exception as e:
+                log.exception("Deadline callback failed: %s", e)
+                continue
+            if asyncio.iscoroutine(result):
+                task = asyncio.get_running_loop().create_task(result)
+                self._callbacks.add(task)
+                task.add_done_callback(self._callback_done)
+        return len(expired)
+
+    def _callback_done(self, task: asyncio.Task):
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Deadline callback failed: %s", task.exception(), exc_info=task.exception())
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.wheel.tick)
+            self.expire_due()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in list(self._callbacks):
+            task.cancel()
+        await asyncio.gather(*self._callbacks, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self.wheel)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.wheel),
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+        }
@@ -0,0 +1,94 @@
+# Outbound event queue for a WebSocket, with backpressure that never stalls an interview turn
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+# RFC 6455 close code for "try again later", used when a client stops reading
+SLOW_CONSUMER = 1013
+
+
+class EventChannel:
+    """Events for one client, sent in order by a single sender task.
+
+    `push()` never waits, so generating a question is not held up by a
+    slow network. Events wait in a queue while the socket drains; a
+    `token` event queued behind another token is merged into it, so a
+    client that falls behind gets the same text in fewer, larger messages.
+    If the queue still reaches `max_pending` events the client is not
+    reading at all: the channel stops and `closed` becomes true, and the
+    caller should close the socket with SLOW_CONSUMER.
+    """
+
+    def __init__(self, send: Callable[[dict], Awaitable[None]], max_pending: int = 64):
+        self._send = send
+        self.max_pending = max_pending
+        self._pending: deque = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = asyncio.Event()
+        self.closed = False
+        self.overflowed = False
+        self.sent = 0
+        self.merged = 0
+
+    def push(self, event: dict):
+        if self.closed:
+            return
+        pending = self._pending
+        if event.get("type") == "token" and pending and pending[-1].get("type") == "token":
+            pending[-1] = {**pending[-1], "text": pending[-1]["text"] + event["text"]}
+            self.merged += 1
+            return
+        if len(pending) >= self.max_pending:
+            log.warning("WebSocket client is not reading; dropping the connection with %d events queued",
+                        len(pending))
+            self.overflowed = True
+            self.close()
+            return
+        pending.append(event)
+        self._idle.clear()
+        self._ready.set()
+
+    async def run(self):
+        """Send queued events until closed; ends quietly if the client goes away"""
+        pending = self._pending
+        try:
+            while True:
+                if not pending:
+                    self._idle.set()
+                    if self.closed:
+                        return
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                await self._send(pending.popleft())
+                self.sent += 1
+        except Exception as e:
+            log.debug("WebSocket send failed: %r", e)
+            self.closed = True
+            self._closed.set()
+        finally:
+            self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until everything pushed so far has been sent (or the channel is closed)"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def wait_closed(self):
+        """Return once the channel is closed: by close(), an overflow or a failed send"""
+        await self._closed.wait()
+
+    def close(self):
+        """Stop accepting events; the sender finishes once the queue is empty (or at once after overflow)"""
+        self.closed = True
+        self._closed.set()
+        if self.overflowed:
+            self._pending.clear()
+        self._ready.set()
@@ -15,6 +15,9 @@ function App() {
   const [history, setHistory] = useState([]);
   const [timer, setTimer] = useState(0);
   const [timeLeft, setTimeLeft] = useState(0);
+  // Counts down only while a complete question is on screen, not while one is streaming
+  const [timerActive, setTimerActive] = useState(false);
+  const [sessionId, setSessionId] = useState(null);
   
   // Audio states
   const [isListening, setIsListening] = useState(false);
@@ -116,15 +119,18 @@ function App() {
 
   // Timer effect
   React.useEffect(() => {
-    if (timeLeft > 0 && stage === 'interview' && !completed) {
+    if (!timerActive || stage !== 'interview' || completed) {
+      return;
+    }
+    if (timeLeft > 0) {
       const timerId = setTimeout(() => setTimeLeft(timeLeft - 1), 1000);
       return () => clearTimeout(timerId);
-    } else if (timeLeft === 0 && stage === 'interview' && !completed) {
-      handleTimeout();
     }
-  }, [timeLeft, stage, completed]);
+    handleTimeout();
+  }, [timeLeft, timerActive, stage, completed]);
 
   const handleTimeout = async () => {
+    setTimerActive(false);
     try {
       // Stop voice recognition
       if (recognitionRef.current) {
@@ -132,7 +138,11 @@ function App() {
       }
       setAutoListen(false);
       
-      const res = await fetch(`${API_BASE}/timeout`, { method: 'POST' });
+      const res = await fetch(`${API_BASE}/timeout`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ session_id: sessionId })
+      });
       if (!res.ok) throw new Error(`HTTP ${res.status}`);
       const data = await res.json();
       
@@ -180,11 +190,16 @@ function App() {
   const startTimer = (seconds) => {
     setTimer(seconds);
     setTimeLeft(seconds);
+    setTimerActive(true);
   };
 
-  const speakText = (text) => {
+  // queue: play after current speech instead of interrupting it
+  // restartListening: resume voice recognition once this utterance ends
+  const speakText = (text, { queue = false, restartListening = true } = {}) => {
     if (synthRef.current) {
-      synthRef.current.cancel(); // Stop any ongoing speech
+      if (!queue) {
+        synthRef.current.cancel(); // Stop any ongoing speech
+      }
       
       // Temporarily stop voice recognition while speaking
       if (recognitionRef.current && isListening) {
@@ -231,7 +246,7 @@ function App() {
         
         utterance.onend = () => {
           // Restart voice recognition after speaking
-          if (autoListen && stage === 'interview' && !completed) {
+          if (restartListening && autoListen && stage === 'interview' && !completed) {
             setTimeout(() => {
               if (recognitionRef.current && autoListen) {
                 try {
@@ -272,20 +287,97 @@ function App() {
     }
   };
 
+  // POST to a Server-Sent Events endpoint and call onEvent(event, data) per event
+  const streamEvents = async (url, body, onEvent) => {
+    const res = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body || {})
+    });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach(line => {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        onEvent(event, JSON.parse(data));
+      }
+    }
+  };
+
+  // Speaks streamed text one complete sentence at a time, so speech starts
+  // before the whole question has been generated
+  const createSentenceSpeaker = () => {
+    let pending = '';
+    let spoken = '';
+    return {
+      push(chunk) {
+        pending += chunk;
+        const match = pending.match(/^[\s\S]*[.?!]\s/);
+        if (match && match[0].trim()) {
+          speakText(match[0].trim(), { queue: true, restartListening: false });
+          spoken += match[0];
+          pending = pending.slice(match[0].length);
+        }
+      },
+      reset() {
+        synthRef.current && synthRef.current.cancel();
+        pending = '';
+        spoken = '';
+      },
+      finish(finalText) {
+        const rest = finalText.startsWith(spoken) ? finalText.slice(spoken.length) : finalText;
+        if (rest.trim()) {
+          speakText(rest.trim(), { queue: true });
+        } else if (autoListen && recognitionRef.current) {
+          setTimeout(() => {
+            try {
+              recognitionRef.current.start();
+            } catch (e) {}
+          }, 1000);
+        }
+      }
+    };
+  };
+
   const startInterview = async () => {
     try {
-      const res = await fetch(`${API_BASE}/start`, { method: 'POST' });
-      if (!res.ok) throw new Error(`HTTP ${res.status}`);
-      const data = await res.json();
-      if (data.error) throw new Error(data.error);
-      setStage('interview');
-      setQuestion(data.question);
-      startTimer(data.timer);
-      setHistory([{ role: 'interviewer', content: data.intro }, { role: 'interviewer', content: data.question }]);
-      
-      // Speak the intro and first question with natural timing
-      setTimeout(() => speakText(data.intro), 800);
-      setTimeout(() => speakText(data.question), 4000);
+      const speaker = createSentenceSpeaker();
+      let intro = '';
+      let streamed = '';
+      await streamEvents(`${API_BASE}/start/stream`, null, (event, data) => {
+        if (event === 'intro') {
+          intro = data.text;
+          setSessionId(data.session_id);
+          setStage('interview');
+          setHistory([{ role: 'interviewer', content: intro }]);
+          speakText(intro, { restartListening: false });
+        } else if (event === 'token') {
+          streamed += data.text;
+          setQuestion(streamed);
+          speaker.push(data.text);
+        } else if (event === 'reset') {
+          streamed = '';
+          speaker.reset();
+        } else if (event === 'done') {
+          setQuestion(data.question);
+          startTimer(data.timer);
+          setHistory([{ role: 'interviewer', content: intro }, { role: 'interviewer', content: data.question }]);
+          speaker.finish(data.question);
+        }
+      });
     } catch (error) {
       alert(`Error starting interview: ${error.message}`);
     }
@@ -298,45 +390,38 @@ function App() {
         recognitionRef.current.stop();
       }
       
-      const res = await fetch(`${API_BASE}/answer`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ answer })
-      });
-      if (!res.ok) throw new Error(`HTTP ${res.status}`);
-      const data = await res.json();
-      if (data.error) throw new Error(data.error);
-      setFeedback(data.feedback);
-      setHistory([...history, { role: 'candidate', content: answer }, { role: 'interviewer', content: data.feedback }]);
+      const submitted = answer;
+      const speaker = createSentenceSpeaker();
+      let streamed = '';
       setAnswer('');
-      
-      // Speak feedback with more natural timing
-      setTimeout(() => speakText(data.feedback), 800);
-      
-      if (data.completed) {
-        setSummary(data.summary);
-        setCompleted(true);
-        setStage('summary');
-        setTimeLeft(0);
-        setAutoListen(false);
-      } else {
-        setQuestion(data.question);
-        startTimer(data.timer);
-        setHistory(h => [...h, { role: 'interviewer', content: data.question }]);
-        
-        // Speak next question and restart voice recognition with better timing
-        setTimeout(() => {
-          speakText(data.question);
-          if (autoListen && recognitionRef.current) {
-            // Wait for speech to finish before restarting recognition
-            setTimeout(() => {
-              try {
-                recognitionRef.current.start();
-              } catch (e) {}
-            }, 3000);
+      setTimerActive(false);
+      await streamEvents(`${API_BASE}/answer/stream`, { session_id: sessionId, answer: submitted }, (event, data) => {
+        if (event === 'feedback') {
+          setFeedback(data.text);
+          setHistory(h => [...h, { role: 'candidate', content: submitted }, { role: 'interviewer', content: data.text }]);
+          speakText(data.text, { restartListening: false });
+        } else if (event === 'token') {
+          streamed += data.text;
+          setQuestion(streamed);
+          speaker.push(data.text);
+        } else if (event === 'reset') {
+          streamed = '';
+          speaker.reset();
+        } else if (event === 'done') {
+          if (data.completed) {
+            setSummary(data.summary);
+            setCompleted(true);
+            setStage('summary');
+            setTimeLeft(0);
+            setAutoListen(false);
+          } else {
+            setQuestion(data.question);
+            startTimer(data.timer);
+            setHistory(h => [...h, { role: 'interviewer', content: data.question }]);
+            speaker.finish(data.question);
           }
-        }, 2500);
-      }
+        }
+      });
     } catch (error) {
       alert(`Error submitting answer: ${error.message}`);
     }
@@ -1,43 +1,148 @@
-from groq import Groq
-from typing import Dict, List
-from models import InterviewSession, InterviewState, Response, DifficultyLevel, Question, QuestionType
-from question_bank import get_questions_by_difficulty, get_question_by_id
+from typing import Dict, List, Optional, Sequence
+from models import InterviewSession, InterviewState, Response, DifficultyLevel, Question, QuestionType, question_key
+from question_bank import get_questions_by_difficulty
+from answer_scoring import MATCHER, CATEGORY_SCORES, FEEDBACK_OPTIONS
+from provider_router import DeadlineExceeded, NoProviderAvailable, Provider, ProviderRouter
+from metrics import METRICS
+from single_flight import SingleFlight
+from admission import BACKGROUND, IN_PROGRESS, NEW_INTERVIEW, AdmissionController
+from near_duplicates import QuestionIndex, similarity
+import asyncio
 import json
+import logging
+import os
 import random
 import html
+import threading
+
+log = logging.getLogger(__name__)
+
+HF_URL = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium")
+GROQ_MODEL = "llama-3.1-8b-instant"
+MAX_QUESTION_TOKENS = 400
+
+# Question-generation prompt. {difficulty}, {examples} and {focus} are filled
+# once per difficulty (see ExcelInterviewer._prompt_template), the rest per turn.
+QUESTION_PROMPT = """You are a friendly Excel interviewer having a conversational chat. Generate a {difficulty} level Excel question.
+
+{performance}Question #{number} of 6.
+
+Start with: "{starter}"
+
+Example {difficulty} questions:
+{examples}
+{previous}
+
+IMPORTANT: Generate a NEW question that is DIFFERENT from any previous questions. Avoid repeating topics or scenarios.
+
+Generate a conversational, scenario-based Excel question that tests {difficulty} skills. 
+Make it sound like you're asking a colleague about a real work situation.
+Focus on: {focus}.
+
+Return only the question text in a friendly, conversational tone."""
+
+CONVERSATION_STARTERS = {
+    DifficultyLevel.BEGINNER: ["Let's start with something practical...", "Here's a common scenario...", "Imagine you're helping a colleague with..."],
+    DifficultyLevel.INTERMEDIATE: ["Now let's get a bit more interesting...", "Here's a situation that comes up often...", "Let's say you need to..."],
+    DifficultyLevel.ADVANCED: ["Time for a challenge...", "Here's something that might test your expertise...", "Let's dive into something more complex..."]
+}
+
+# Whole-interview plan requested in one call when plan mode is on; {examples} is filled once
+PLAN_QUESTIONS = 6
+PLAN_MAX_TOKENS = 1200
+PLAN_PROMPT = """You are a friendly Excel interviewer preparing a conversational chat of 6 questions.
+
+Write 2 beginner, 2 intermediate and 2 advanced Excel questions. Beginner questions cover formulas and basic functions, intermediate ones data analysis and intermediate functions, advanced ones advanced functions and best practices.
+
+Example questions:
+{examples}
+
+Every question must be about a DIFFERENT topic or scenario. Make each one a conversational, scenario-based question, the way you would ask a colleague about a real work situation.
+
+Return only JSON in this form:
+{"questions": [{"difficulty": "beginner", "question": "..."}, {"difficulty": "beginner", "question": "..."}, {"difficulty": "intermediate", "question": "..."}, {"difficulty": "intermediate", "question": "..."}, {"difficulty": "advanced", "question": "..."}, {"difficulty": "advanced", "question": "..."}]}"""
+MIN_PLANNED_QUESTION_CHARS = 20
+MAX_PLANNED_QUESTION_CHARS = 600
+
+QUESTION_FOCUS = {
+    DifficultyLevel.BEGINNER: "formulas and basic functions",
+    DifficultyLevel.INTERMEDIATE: "data analysis and intermediate functions",
+    DifficultyLevel.ADVANCED: "advanced functions and best practices",
+}
+
+def parse_question_plan(text: str) -> Dict[DifficultyLevel, List[str]]:
+    """Question texts per difficulty from a plan response.
+    
+    Anything malformed is skipped rather than rejecting the whole plan:
+    non-JSON text around the object, entries missing a field or with an
+    unknown difficulty, implausibly short or long questions and duplicates.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        try:
+            data = json.loads(text[text.find("{"):text.rfind("}") + 1])
+        except ValueError:
+            data = None
+    items = data.get("questions") if isinstance(data, dict) else data
+    planned = {difficulty: [] for difficulty in CONVERSATION_STARTERS}
+    seen = set()
+    for item in items if isinstance(items, list) else ():
+        if not isinstance(item, dict) or not isinstance(item.get("question"), str):
+            continue
+        try:
+            difficulty = DifficultyLevel(str(item.get("difficulty", "")).strip().lower())
+        except ValueError:
+            continue
+        question = item["question"].strip()
+        key = question_key(question)
+        if (difficulty in planned and key not in seen
+                and MIN_PLANNED_QUESTION_CHARS <= len(question) <= MAX_PLANNED_QUESTION_CHARS):
+            seen.add(key)
+            planned[difficulty].append(question)
+    return planned
+
+
+class RepeatedQuestion(Exception):
+    """A generated question repeats one the candidate has seen, or a topic served too often"""
+
 
 class ExcelInterviewer:
     def __init__(self, api_key: str, hf_token: str = None):
-        self.groq_client = None
-        self.openai_client = None
-        
-        # Try Groq first
-        if api_key:
-            try:
-                self.groq_client = Groq(
-                    api_key=api_key,
-                    timeout=30.0,
-                    max_retries=3
-                )
-                print(f"Groq client initialized successfully")
-            except Exception as e:
-                print(f"Failed to initialize Groq client: {e}")
-        
-        # Try Hugging Face as free fallback
-        if hf_token:
-            try:
-                import requests
-                self.hf_token = hf_token
-                self.hf_client = True
-                print(f"Hugging Face client initialized as fallback")
-            except Exception as e:
-                print(f"Failed to initialize Hugging Face client: {e}")
-                self.hf_client = False
-        else:
-            self.hf_client = False
+        self._prompt_templates: Dict[DifficultyLevel, str] = {}
+        self._plan_prompt = None
+        # Optional QuestionIndex: rejects near-duplicate questions and tracks topic exposure
+        self.question_index: Optional[QuestionIndex] = None
         
-        # Set primary client
-        self.client = self.groq_client
+        # Groq first, Hugging Face as free fallback. Provider SDKs are imported
+        # and clients built on first use (or by warm_up()), not at import time.
+        self.groq_configured = bool(api_key)
+        self._groq_api_key = api_key
+        self._groq_client = None
+        self._client_lock = threading.RLock()  # groq_client builds http_client while holding it
+        self.hf_token = hf_token
+        self.hf_client = bool(hf_token)
+    
+    @property
+    def groq_client(self):
+        """Groq SDK client, built on first access; None without an API key or if it cannot be built"""
+        if self._groq_client is None and self.groq_configured:
+            with self._client_lock:
+                if self._groq_client is None:
+                    try:
+                        self._groq_client = self._make_groq_client(self._groq_api_key)
+                        log.info("Groq client initialized")
+                    except Exception as e:
+                        log.warning("Failed to initialize Groq client: %s", e)
+        return self._groq_client
+    
+    def _make_groq_client(self, api_key: str):
+        from groq import Groq
+        return Groq(api_key=api_key, timeout=30.0, max_retries=3)
+    
+    def warm_up(self):
+        """Import provider SDKs and build clients ahead of the first request"""
+        self.groq_client
         
     def start_interview(self, session: InterviewSession) -> str:
         session.state = InterviewState.INTRO
@@ -51,63 +156,42 @@ Don't worry about being perfect - I'm more interested in your thought process an
         return intro_message
     
     def evaluate_answer(self, session: InterviewSession, question, user_answer: str) -> Response:
-        # Analyze the answer content for better feedback
-        answer_lower = user_answer.lower()
-        answer_words = answer_lower.split()
-        
-        # Check for uncertainty indicators
-        uncertainty_phrases = ["not sure", "don't know", "not certain", "unsure", "no idea", "can't remember"]
-        is_uncertain = any(phrase in answer_lower for phrase in uncertainty_phrases) or len(user_answer.strip()) < 20
-        
-        # Check for Excel-related terms
-        excel_terms = ["formula", "function", "vlookup", "pivot", "sum", "average", "count", "index", "match", 
-                      "if", "sumif", "countif", "chart", "graph", "data", "cell", "range", "worksheet", "workbook"]
-        has_excel_knowledge = any(term in answer_words for term in excel_terms)
-        
-        if is_uncertain:
-            feedback_options = [
-                "No worries at all! That's a complex scenario. Let's move on to the next question!",
-                "That's totally understandable! These advanced topics can be tricky. Ready for the next one?",
-                "No problem! It's better to be honest than to guess. Let's continue!"
-            ]
-            feedback = random.choice(feedback_options)
-            scores = [0.0, 0.0, 0.0, 2.0]  # Very low scores for no knowledge shown
-        elif has_excel_knowledge:
-            # They mentioned relevant Excel concepts
-            feedback_options = [
-                "Great! I can see you know your Excel functions. Nice thinking on that one!",
-                "Awesome! You're definitely familiar with Excel tools. I like your approach!",
-                "Perfect! You've got solid Excel knowledge there. Well done!",
-                "Excellent! That's exactly the kind of Excel expertise I was hoping to hear!"
-            ]
-            feedback = random.choice(feedback_options)
-            scores = [7.5, 8.0, 7.0, 8.5]
-        else:
-            # General attempt but no clear Excel knowledge shown
-            feedback_options = [
-                "I appreciate you giving it a try! Let's explore some Excel solutions for this.",
-                "Thanks for your thoughts! There are some specific Excel techniques that could help here.",
-                "Good effort! This is where Excel's advanced features really shine.",
-                "Nice attempt! Let me share how Excel could tackle this challenge."
-            ]
-            feedback = random.choice(feedback_options)
-            scores = [2.0, 3.0, 2.0, 4.0]  # Lower scores for attempts without Excel knowledge
-        
-        evaluation = Response(
-            question_id=question.id,
+        category = MATCHER.classify(user_answer)
+        evaluation = self._scored_response(question.id, user_answer, category)
+        session.add_response(evaluation)
+        session.add_message("user", user_answer)
+        return evaluation
+
+    @staticmethod
+    def _scored_response(question_id: str, user_answer: str, category: int) -> Response:
+        scores = CATEGORY_SCORES[category]
+        return Response(
+            question_id=question_id,
             answer=user_answer,
             technical_score=scores[0],
             efficiency_score=scores[1],
             practices_score=scores[2],
             communication_score=scores[3],
-            feedback=feedback
+            feedback=random.choice(FEEDBACK_OPTIONS[category])
         )
-        
-        session.responses.append(evaluation)
-        session.add_message("user", user_answer)
-        return evaluation
+
+    def evaluate_batch(self, answers: List[str], question_ids: List[str] = None) -> List[Response]:
+        """Score many answers in one pass without touching any session (used for regrading)"""
+        if question_ids is None:
+            question_ids = [""] * len(answers)
+        elif len(question_ids) != len(answers):
+            raise ValueError("question_ids must match answers")
+        categories = MATCHER.classify_batch(answers)
+        return [
+            self._scored_response(question_id, answer, category)
+            for question_id, answer, category in zip(question_ids, answers, categories)
+        ]
     
     def generate_summary(self, session: InterviewSession) -> str:
+        # Polling the summary page is a cache hit until the responses change
+        cached = session.cached_summary()
+        if cached is not None:
+            return cached
         try:
             session.state = InterviewState.SUMMARY
             
@@ -123,7 +207,7 @@ Recommendation: Retake the assessment when ready."""
             
             overall_score = session.calculate_overall_score()
         except Exception as e:
-            print(f"Error in generate_summary: {e}")
+            log.exception("Error in generate_summary: %s", e)
             # Create a basic summary even if there's an error
             basic_summary = f"""EXCEL SKILLS ASSESSMENT REPORT
 ==================================================
@@ -139,11 +223,12 @@ Assessment Complete"""
             session.state = InterviewState.COMPLETED
             return basic_summary
         
-        # Calculate averages using list comprehension
-        technical_avg = sum(r.technical_score for r in session.responses) / len(session.responses)
-        efficiency_avg = sum(r.efficiency_score for r in session.responses) / len(session.responses)
-        practices_avg = sum(r.practices_score for r in session.responses) / len(session.responses)
-        communication_avg = sum(r.communication_score for r in session.responses) / len(session.responses)
+        # Averages come from the session's running totals
+        averages = session.score_totals().averages()
+        technical_avg = averages["technical"]
+        efficiency_avg = averages["efficiency"]
+        practices_avg = averages["practices"]
+        communication_avg = averages["communication"]
         
         # Determine skill level
         if overall_score >= 8.5:
@@ -217,11 +302,14 @@ Assessment Complete"""
         
         try:
             summary = "\n".join(summary_parts)
-            session.add_message("assistant", summary)
+            # A session restored from the log already ends with this report
+            if not session.transcript or session.transcript[-1]["content"] != summary:
+                session.add_message("assistant", summary)
             session.state = InterviewState.COMPLETED
+            session.cache_summary(summary)
             return summary
         except Exception as e:
-            print(f"Error finalizing summary: {e}")
+            log.exception("Error finalizing summary: %s", e)
             # Return basic summary if formatting fails
             basic_summary = f"""EXCEL SKILLS ASSESSMENT REPORT
 ==================================================
@@ -237,26 +325,32 @@ Assessment Complete"""
         """Simple rule-based termination"""
         return len(session.responses) < 6  # Always ask exactly 6 questions
     
-    def get_next_question(self, session: InterviewSession):
-        """Generate next question using LLM with question bank as examples"""
-        print(f"Getting next question. Current responses: {len(session.responses)}")
-        
-        # Check if interview should continue
-        if not self.should_continue_interview(session):
-            print(f"Interview should not continue. Responses: {len(session.responses)}")
-            session.state = InterviewState.SUMMARY
-            return None
-        
-        # Determine difficulty based on progress
-        if len(session.responses) >= 4:
-            difficulty = DifficultyLevel.ADVANCED
-        elif len(session.responses) >= 2:
-            difficulty = DifficultyLevel.INTERMEDIATE
-        else:
-            difficulty = DifficultyLevel.BEGINNER
-        
-        # Get example questions for the LLM
-        example_questions = get_questions_by_difficulty(difficulty)
+    @staticmethod
+    def question_difficulty(responses_count: int) -> DifficultyLevel:
+        """Difficulty ladder: beginner for 0-1 responses, intermediate 2-3, advanced 4+"""
+        if responses_count >= 4:
+            return DifficultyLevel.ADVANCED
+        elif responses_count >= 2:
+            return DifficultyLevel.INTERMEDIATE
+        return DifficultyLevel.BEGINNER
+    
+    def _prompt_template(self, difficulty: DifficultyLevel) -> str:
+        """QUESTION_PROMPT with the per-difficulty parts filled in, built once per difficulty"""
+        template = self._prompt_templates.get(difficulty)
+        if template is None:
+            examples = "\n".join(f"- {q.question}" for q in get_questions_by_difficulty(difficulty)[:2])
+            template = self._prompt_templates[difficulty] = QUESTION_PROMPT.format(
+                difficulty=difficulty.value,
+                examples=examples.replace("{", "{{").replace("}", "}}"),
+                focus=QUESTION_FOCUS.get(difficulty, QUESTION_FOCUS[DifficultyLevel.ADVANCED]),
+                performance="{performance}", number="{number}", starter="{starter}", previous="{previous}",
+            )
+        return template
+    
+    def build_question_prompt(self, session: InterviewSession, difficulty: DifficultyLevel, question_number: int = None):
+        """Build the question-generation prompt. Returns (prompt, starter, asked_count)"""
+        if question_number is None:
+            question_number = len(session.responses) + 1
         
         # Build context from previous responses and questions
         performance_context = ""
@@ -268,138 +362,216 @@ Assessment Complete"""
             avg_recent = sum(recent_scores) / len(recent_scores)
             performance_context = f"Recent performance: {avg_recent:.1f}/10. "
             
-        # Get previous questions to avoid repetition
-        if hasattr(session, 'messages') and session.messages:
-            asked_questions = [msg['content'] for msg in session.messages if msg['role'] == 'assistant' and '?' in msg['content']]
-            if asked_questions:
-                previous_questions = f"\nPrevious questions asked:\n{chr(10).join([f'- {q[:80]}...' for q in asked_questions[-3:]])}"
+        # Previous questions come from the session's index, so this does not grow with the transcript
+        asked_questions = session.asked_questions().questions
+        if asked_questions:
+            previous_questions = f"\nPrevious questions asked:\n{chr(10).join([f'- {q[:80]}...' for q in asked_questions[-3:]])}"
         
-        # Create conversational prompt for LLM to generate question
-        conversation_starters = {
-            DifficultyLevel.BEGINNER: ["Let's start with something practical...", "Here's a common scenario...", "Imagine you're helping a colleague with..."],
-            DifficultyLevel.INTERMEDIATE: ["Now let's get a bit more interesting...", "Here's a situation that comes up often...", "Let's say you need to..."],
-            DifficultyLevel.ADVANCED: ["Time for a challenge...", "Here's something that might test your expertise...", "Let's dive into something more complex..."]
-        }
+        starter = random.choice(CONVERSATION_STARTERS[difficulty])
+        prompt = self._prompt_template(difficulty).format(
+            performance=performance_context, number=question_number, starter=starter, previous=previous_questions)
+        return prompt, starter, len(asked_questions)
+    
+    def build_plan_prompt(self) -> str:
+        """PLAN_PROMPT with bank examples for each difficulty, built once"""
+        if self._plan_prompt is None:
+            examples = "\n".join(f"- ({difficulty.value}) {q.question}"
+                                  for difficulty in CONVERSATION_STARTERS
+                                  for q in get_questions_by_difficulty(difficulty)[:1])
+            self._plan_prompt = PLAN_PROMPT.replace("{examples}", examples)
+        return self._plan_prompt
+    
+    def build_question_plan(self, session: InterviewSession, planned: Dict[DifficultyLevel, List[str]]) -> List[Question]:
+        """One Question per turn: generated ones first, then bank questions for any tier left short"""
+        plan = []
+        used = list(session.asked_questions().questions)
+        for turn in range(PLAN_QUESTIONS):
+            difficulty = self.question_difficulty(turn)
+            generated = [text for text in planned.get(difficulty, ()) if self.repeat_reason(used, text) is None]
+            if generated:
+                question = self.make_generated_question(session, difficulty, generated[0], number=turn + 1)
+            else:
+                question = next((q for q in get_questions_by_difficulty(difficulty)
+                                 if self.repeat_reason(used, q.question, check_exposure=False) is None), None)
+                if question is None:
+                    break  # Later turns are generated live as usual
+            used.append(question.question)
+            plan.append(question)
+        return plan
+    
+    def asked_question_keys(self, session: InterviewSession):
+        return session.asked_questions().keys
+    
+    def repeat_reason(self, asked: Sequence[str], text: str, check_exposure: bool = True) -> Optional[str]:
+        """Why `text` should not follow the questions in `asked`, or None.
         
-        starter = random.choice(conversation_starters[difficulty])
+        "duplicate" is the same question reworded at most in case, spacing
+        or punctuation. With a question index, "near_duplicate" is the same
+        topic (similar content words) and "overexposed" a topic already
+        served to `max_exposure` candidates.
+        """
+        key = question_key(text)
+        if any(question_key(question) == key for question in asked):
+            return "duplicate"
+        index = self.question_index
+        if index is None:
+            return None
+        if any(similarity(text, question) >= index.threshold for question in asked):
+            return "near_duplicate"
+        if check_exposure and index.overexposed(text):
+            return "overexposed"
+        return None
+    
+    def check_generated(self, asked: Sequence[str], text: str):
+        """Raise RepeatedQuestion if generated `text` should not follow the questions in `asked`"""
+        reason = self.repeat_reason(asked, text)
+        if reason is not None:
+            METRICS.inc("questions_rejected_total", (("reason", reason),))
+            log.debug("Generated question rejected as %s", reason)
+            raise RepeatedQuestion(f"Generated question rejected ({reason})")
+    
+    def take_planned_question(self, session: InterviewSession):
+        """The plan's question for this turn, or None when there is no plan or it was already asked"""
+        turn = len(session.responses)
+        if turn >= len(session.question_plan):
+            return None
+        question = session.question_plan[turn]
+        if question.question in session.asked_questions().contents:
+            return None
+        return question
+    
+    def _request_groq(self, prompt: str):
+        log.debug("Trying Groq API")
+        response = self.groq_client.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=MAX_QUESTION_TOKENS,
+            timeout=30
+        )
+        log.debug("Groq API successful")
+        return response.choices[0].message.content
+    
+    def _request_hf(self, prompt: str):
+        log.debug("Trying Hugging Face API")
+        import requests
         
-        prompt = f"""You are a friendly Excel interviewer having a conversational chat. Generate a {difficulty.value} level Excel question.
-
-{performance_context}Question #{len(session.responses) + 1} of 6.
-
-Start with: "{starter}"
-
-Example {difficulty.value} questions:
-{chr(10).join([f"- {q.question}" for q in example_questions[:2]])}
-{previous_questions}
-
-IMPORTANT: Generate a NEW question that is DIFFERENT from any previous questions. Avoid repeating topics or scenarios.
-
-Generate a conversational, scenario-based Excel question that tests {difficulty.value} skills. 
-Make it sound like you're asking a colleague about a real work situation.
-Focus on: {'formulas and basic functions' if difficulty == DifficultyLevel.BEGINNER else 'data analysis and intermediate functions' if difficulty == DifficultyLevel.INTERMEDIATE else 'advanced functions and best practices'}.
-
-Return only the question text in a friendly, conversational tone."""
+        hf_response = requests.post(
+            HF_URL,
+            headers=self._hf_headers(),
+            json={"inputs": prompt[:500], "parameters": {"max_length": 200}},
+            timeout=30
+        )
         
-        try:
-            print(f"\n=== LLM QUESTION GENERATION ===")
-            print(f"Difficulty: {difficulty.value}")
-            print(f"Starter: {starter}")
-            print(f"Previous questions count: {len(asked_questions) if 'asked_questions' in locals() else 0}")
-            print(f"Prompt length: {len(prompt)} chars")
-            
-            # Try Groq first, then OpenAI as fallback
-            response = None
-            
-            if self.groq_client:
-                try:
-                    print("Trying Groq API...")
-                    response = self.groq_client.chat.completions.create(
-                        model="llama-3.1-8b-instant",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.7,
-                        max_tokens=400,
-                        timeout=30
-                    )
-                    print("Groq API successful")
-                except Exception as groq_error:
-                    print(f"Groq API failed: {groq_error}")
-            
-            if not response and self.hf_client:
-                try:
-                    print("Trying Hugging Face API as fallback...")
-                    import requests
-                    
-                    hf_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
-                    headers = {"Authorization": f"Bearer {self.hf_token}"} if hasattr(self, 'hf_token') else {}
-                    
-                    hf_response = requests.post(
-                        hf_url,
-                        headers=headers,
-                        json={"inputs": prompt[:500], "parameters": {"max_length": 200}},
-                        timeout=30
-                    )
-                    
-                    if hf_response.status_code == 200:
-                        hf_data = hf_response.json()
-                        generated_text = hf_data[0].get('generated_text', '') if hf_data else ''
-                        
-                        # Create mock response object
-                        class MockResponse:
-                            def __init__(self, text):
-                                self.choices = [type('obj', (object,), {'message': type('obj', (object,), {'content': text})})()]
-                        
-                        response = MockResponse(generated_text or "How would you use Excel to analyze sales data?")
-                        print("Hugging Face API successful")
-                    else:
-                        print(f"Hugging Face API failed: {hf_response.status_code}")
-                except Exception as hf_error:
-                    print(f"Hugging Face API failed: {hf_error}")
-            
-            if not response:
-                raise Exception("Both Groq and Hugging Face APIs failed")
-            
-            generated_question = response.choices[0].message.content.strip()
-            print(f"Generated question: {generated_question}")
-            print(f"Question length: {len(generated_question)} chars")
-            
-            # Create a dynamic question object
-            question_id = f"gen_{len(session.responses) + 1}"
-            session.current_question = Question(
-                id=question_id,
-                type=QuestionType.FORMULA,  # Default type
-                difficulty=difficulty,
-                question=generated_question,
-                expected_answer="Dynamic evaluation",
-                scoring_criteria={"dynamic": "LLM-based evaluation"}
-            )
-            
-            # Add question to conversation history
-            session.add_message("assistant", generated_question)
-            print(f"Question added to session. Total messages: {len(session.messages)}")
-            print(f"=== END LLM GENERATION ===\n")
-            
-            return generated_question
-            
-        except Exception as e:
-            print(f"\n=== LLM GENERATION FAILED ===")
-            print(f"Error: {e}")
-            print(f"Falling back to question bank...")
-            
-            # Fallback to example questions
-            if example_questions:
-                question = example_questions[0]
-                print(f"Using fallback question: {question.question}")
-                session.current_question = question
-                # Add question to conversation history
-                session.add_message("assistant", question.question)
-                print(f"=== FALLBACK COMPLETE ===\n")
-                return question.question
-            
-            print(f"No fallback questions available, ending interview early")
-            print(f"=== INTERVIEW ENDED EARLY ===\n")
+        if hf_response.status_code != 200:
+            log.warning("Hugging Face API failed: HTTP %s", hf_response.status_code)
+            return None
+        log.debug("Hugging Face API successful")
+        return self._parse_hf_response(hf_response.json())
+    
+    def _hf_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.hf_token}"} if hasattr(self, 'hf_token') else {}
+    
+    @staticmethod
+    def _parse_hf_response(hf_data) -> str:
+        generated_text = hf_data[0].get('generated_text', '') if hf_data else ''
+        return generated_text or "How would you use Excel to analyze sales data?"
+    
+    def generate_question_text(self, prompt: str) -> str:
+        """Ask Groq, then Hugging Face, for a question. Raises if both fail."""
+        if self.groq_configured:
+            try:
+                return self._request_groq(prompt)
+            except Exception as groq_error:
+                log.warning("Groq API failed: %s", groq_error)
+        
+        if self.hf_client:
+            try:
+                text = self._request_hf(prompt)
+                if text:
+                    return text
+            except Exception as hf_error:
+                log.warning("Hugging Face API failed: %s", hf_error)
+        
+        raise Exception("Both Groq and Hugging Face APIs failed")
+    
+    def _log_prompt(self, difficulty: DifficultyLevel, starter: str, asked_count: int, prompt: str):
+        log.debug("Generating %s question", difficulty.value, extra={
+            "starter": starter, "asked_count": asked_count, "prompt_chars": len(prompt)})
+    
+    def make_generated_question(self, session: InterviewSession, difficulty: DifficultyLevel, generated_text: str,
+                                number: int = None) -> Question:
+        """Wrap LLM output in a Question for the session's next turn (or turn `number`)"""
+        generated_question = generated_text.strip()
+        log.debug("Generated question: %s", generated_question, extra={"question_chars": len(generated_question)})
+        return Question(
+            id=f"gen_{len(session.responses) + 1 if number is None else number}",
+            type=QuestionType.FORMULA,  # Default type
+            difficulty=difficulty,
+            question=generated_question,
+            expected_answer="Dynamic evaluation",
+            scoring_criteria={"dynamic": "LLM-based evaluation"}
+        )
+    
+    def serve_question(self, session: InterviewSession, question: Question, source: str = "llm") -> str:
+        """Make `question` the session's current question and record it in the transcript.
+        
+        `source` (llm, pool, prefetch or bank) only labels the served-questions metric.
+        """
+        METRICS.inc("questions_served_total", (("source", source),))
+        session.current_question = question
+        session.add_message("assistant", question.question)
+        if self.question_index is not None:
+            self.question_index.record(question.question)
+        log.debug("Question served from %s", source, extra={"messages": len(session.messages)})
+        return question.question
+    
+    def _serve_fallback(self, session: InterviewSession, difficulty: DifficultyLevel, error: Exception):
+        log.warning("LLM generation failed or was rejected, falling back to the question bank: %s", error)
+        
+        # Fallback to example questions, preferring ones on a topic the candidate has not seen.
+        # The view builds questions as they are read, so this stops at the first good one.
+        example_questions = get_questions_by_difficulty(difficulty)
+        if example_questions:
+            asked = session.asked_questions()
+            first_unseen = None
+            for question in example_questions:
+                if question.question in asked.contents:
+                    continue
+                if self.repeat_reason(asked.questions, question.question, check_exposure=False) is None:
+                    break
+                first_unseen = first_unseen or question
+            else:
+                question = first_unseen or example_questions[0]
+            self.serve_question(session, question, source="bank")
+            return question.question
+        
+        log.error("No fallback questions available for %s, ending interview early", difficulty.value)
+        session.state = InterviewState.SUMMARY
+        return None
+    
+    def get_next_question(self, session: InterviewSession):
+        """Generate next question using LLM with question bank as examples"""
+        log.debug("Getting next question after %d responses", len(session.responses))
+        
+        # Check if interview should continue
+        if not self.should_continue_interview(session):
+            log.debug("Interview complete after %d responses", len(session.responses))
             session.state = InterviewState.SUMMARY
             return None
+        
+        difficulty = self.question_difficulty(len(session.responses))
+        prompt, starter, asked_count = self.build_question_prompt(session, difficulty)
+        
+        try:
+            self._log_prompt(difficulty, starter, asked_count, prompt)
+            generated = self.generate_question_text(prompt)
+            self.check_generated(session.asked_questions().questions, generated)
+            question = self.make_generated_question(session, difficulty, generated)
+            self.serve_question(session, question)
+            return question.question
+        except Exception as e:
+            return self._serve_fallback(session, difficulty, e)
     
     def evaluate_response(self, session: InterviewSession, user_answer: str):
         """Evaluate user response and return feedback"""
@@ -413,8 +585,382 @@ Return only the question text in a friendly, conversational tone."""
                 communication_score=7.0,
                 feedback="Thanks for that! Let's keep the conversation going."
             )
-            session.responses.append(fallback_response)
+            session.add_response(fallback_response)
             session.add_message("user", user_answer)
             return fallback_response
         
-        return self.evaluate_answer(session, session.current_question, user_answer)
\ No newline at end of file
+        return self.evaluate_answer(session, session.current_question, user_answer)
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough upper bound on the tokens a question request counts against the provider's TPM limit"""
+    return len(prompt) // 4 + MAX_QUESTION_TOKENS
+
+
+def request_priority(session: InterviewSession) -> int:
+    """Interviews already under way are admitted before new ones start"""
+    return IN_PROGRESS if session.responses else NEW_INTERVIEW
+
+
+class AsyncExcelInterviewer(ExcelInterviewer):
+    """ExcelInterviewer whose LLM calls run on the event loop.
+
+    Groq and Hugging Face requests share one pooled httpx.AsyncClient, so a
+    single worker can hold many in-flight generations without tying up a
+    thread per request. Live requests go through a ProviderRouter that
+    hedges and fails over between providers within `deadline` seconds;
+    background generation (prefetch, warm pool) gets `background_deadline`
+    and is never hedged. Every upstream call first passes an
+    AdmissionController sized to `rpm_limit` and `tpm_limit` (0 = unlimited).
+    `plan_interview()` can instead fetch all six questions in one call
+    within `plan_deadline`. Call `aclose()` on shutdown.
+    """
+    
+    def __init__(self, api_key: str, hf_token: str = None, max_connections: int = 200,
+                 deadline: float = 3.0, background_deadline: float = 30.0,
+                 rpm_limit: float = 0, tpm_limit: float = 0, admission_queue: int = 100,
+                 plan_deadline: float = 6.0):
+        self.max_connections = max_connections
+        self._http_client = None
+        super().__init__(api_key=api_key, hf_token=hf_token)
+        # Optional QuestionPool consulted before any live generation
+        self.question_pool = None
+        self.background_deadline = background_deadline
+        self.plan_deadline = plan_deadline
+        self.providers = {}
+        if self.groq_configured:
+            self.providers["groq"] = Provider("groq", self._request_groq, model=GROQ_MODEL)
+        if self.hf_client:
+            self.providers["huggingface"] = Provider("huggingface", self._request_hf, model=HF_URL.rsplit("/", 1)[-1])
+        self.router = ProviderRouter(list(self.providers.values()), deadline=deadline)
+        self.single_flight = SingleFlight()
+        self.admission = AdmissionController(rpm=rpm_limit, tpm=tpm_limit, max_queue=admission_queue)
+    
+    @property
+    def http_client(self):
+        """Pooled httpx.AsyncClient, built on first access"""
+        if self._http_client is None:
+            with self._client_lock:
+                if self._http_client is None:
+                    import httpx
+                    self._http_client = httpx.AsyncClient(
+                        timeout=httpx.Timeout(30.0, connect=5.0),
+                        limits=httpx.Limits(max_connections=self.max_connections,
+                                            max_keepalive_connections=self.max_connections // 2),
+                    )
+        return self._http_client
+    
+    def _make_groq_client(self, api_key: str):
+        from groq import AsyncGroq
+        return AsyncGroq(
+            api_key=api_key,
+            timeout=30.0,
+            max_retries=0,  # The provider router fails over instead of retrying
+            http_client=self.http_client
+        )
+    
+    def warm_up(self):
+        self.http_client
+        super().warm_up()
+    
+    async def _request_groq(self, prompt: str, timeout: float = 30.0, max_tokens: int = MAX_QUESTION_TOKENS,
+                            json_mode: bool = False):
+        log.debug("Trying Groq API")
+        response = await self.groq_client.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            **({"response_format": {"type": "json_object"}} if json_mode else {})
+        )
+        log.debug("Groq API successful")
+        return response.choices[0].message.content
+    
+    async def _request_hf(self, prompt: str, timeout: float = 30.0):
+        log.debug("Trying Hugging Face API")
+        hf_response = await self.http_client.post(
+            HF_URL,
+            headers=self._hf_headers(),
+            json={"inputs": prompt[:500], "parameters": {"max_length": 200}},
+            timeout=timeout,
+        )
+        
+        if hf_response.status_code != 200:
+            log.warning("Hugging Face API failed: HTTP %s", hf_response.status_code)
+            return None
+        log.debug("Hugging Face API successful")
+        return self._parse_hf_response(hf_response.json())
+    
+    async def generate_question_text(self, prompt: str, background: bool = False, deadline: float = None,
+                                     priority: int = IN_PROGRESS, charged: Optional[str] = None) -> str:
+        """Route a question request across providers. Raises once the deadline is spent or all fail.
+        
+        Concurrent requests for the same prompt (ignoring whitespace) share
+        one routed call; each caller still gives up at its own deadline.
+        Time spent waiting for admission comes out of the same deadline.
+        `charged` names a provider this question was already admitted for:
+        the request then skips admission and is routed to the other providers
+        only, so every request that reaches a rate-limited provider is charged.
+        """
+        if background:
+            budget, priority = self.background_deadline, BACKGROUND
+        else:
+            budget = self.router.deadline if deadline is None else deadline
+        
+        async def call():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            if charged is None:
+                await self.admission.admit(estimate_tokens(prompt), priority, budget)
+            return await self.router.generate(prompt, deadline=budget - (loop.time() - started), hedge=not background,
+                                              exclude=() if charged is None else (charged,))
+        try:
+            return await self.single_flight.do((background, " ".join(prompt.split())), call, timeout=budget)
+        except DeadlineExceeded:
+            raise
+        except asyncio.TimeoutError:
+            # Joined a call that started earlier and outlives this caller's budget
+            raise DeadlineExceeded("No LLM response within the deadline") from None
+    
+    async def get_next_question(self, session: InterviewSession, deadline: float = None):
+        """Generate next question using LLM with question bank as examples.
+        
+        `deadline` overrides the router's budget, e.g. when part of it was
+        already spent waiting for a prefetch.
+        """
+        log.debug("Getting next question after %d responses", len(session.responses))
+        
+        if not self.should_continue_interview(session):
+            log.debug("Interview complete after %d responses", len(session.responses))
+            session.state = InterviewState.SUMMARY
+            return None
+        
+        planned = self.take_planned_question(session)
+        if planned is not None:
+            return self.serve_question(session, planned, source="plan")
+        
+        difficulty = self.question_difficulty(len(session.responses))
+        pooled = self.take_pooled_question(session, difficulty)
+        if pooled is not None:
+            log.debug("Serving %s question from warm pool", difficulty.value)
+            return self.serve_question(session, pooled, source="pool")
+        
+        prompt, starter, asked_count = self.build_question_prompt(session, difficulty)
+        
+        try:
+            self._log_prompt(difficulty, starter, asked_count, prompt)
+            generated = await self.generate_question_text(prompt, deadline=deadline, priority=request_priority(session))
+            self.check_generated(session.asked_questions().questions, generated)
+            question = self.make_generated_question(session, difficulty, generated)
+            self.serve_question(session, question)
+            return question.question
+        except Exception as e:
+            return self._serve_fallback(session, difficulty, e)
+    
+    async def stream_question_text(self, prompt: str, deadline: float = None, priority: int = IN_PROGRESS):
+        """Yield question text as Groq produces it, within the router's deadline.
+        
+        Groq streams while its circuit is closed and must produce the first
+        token within half the deadline (all of it if no other provider is
+        available). Otherwise, or if the stream fails, the rest of the budget
+        goes to a routed request whose answer arrives in one piece. A None
+        item tells the caller to discard anything already streamed.
+        """
+        loop = asyncio.get_running_loop()
+        budget = self.router.deadline if deadline is None else deadline
+        end = loop.time() + budget
+        groq = self.providers.get("groq")
+        charged = None
+        if groq is not None and groq.available():
+            await self.admission.admit(estimate_tokens(prompt), priority, budget)
+            groq.begin()
+            started = loop.time()
+            charged = groq.name
+            others = any(provider.available() for provider in self.providers.values() if provider is not groq)
+            first_token_by = started + (end - started) / 2 if others else end
+            stream = None
+            outcome_recorded = False
+            try:
+                log.debug("Streaming from Groq API")
+                stream = await asyncio.wait_for(self.groq_client.chat.completions.create(
+                    model=GROQ_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7,
+                    max_tokens=MAX_QUESTION_TOKENS,
+                    timeout=self.background_deadline,
+                    stream=True
+                ), max(first_token_by - loop.time(), 0.0))
+                chunks = stream.__aiter__()
+                waiting_for_first = True
+                while True:
+                    try:
+                        if waiting_for_first:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), max(first_token_by - loop.time(), 0.0))
+                        else:
+                            chunk = await chunks.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        waiting_for_first = False
+                        yield delta
+                groq.record_success(loop.time() - started)
+                outcome_recorded = True
+                return
+            except Exception as groq_error:
+                groq.record_failure(loop.time() - started, timeout=isinstance(groq_error, asyncio.TimeoutError))
+                outcome_recorded = True
+                log.warning("Groq streaming failed: %r", groq_error)
+                yield None  # Tells the caller to discard anything already streamed
+            finally:
+                if not outcome_recorded:
+                    groq.release()
+                if stream is not None:
+                    await stream.close()
+        
+        remaining = end - loop.time()
+        if remaining <= 0:
+            raise DeadlineExceeded("No LLM response within the deadline")
+        if charged is not None and not any(provider.available() for provider in self.providers.values()
+                                           if provider.name != charged):
+            charged = None  # Only Groq is left, so the fallback is a second Groq request and is charged again
+        yield await self.generate_question_text(prompt, deadline=remaining, priority=priority, charged=charged)
+    
+    async def stream_next_question(self, session: InterviewSession, deadline: float = None):
+        """Streaming counterpart of get_next_question.
+        
+        Yields ("token", text) as the question is generated and ("reset", "")
+        if the partial text must be discarded because generation fell back.
+        The question is committed to the session only once it is complete.
+        """
+        if not self.should_continue_interview(session):
+            session.state = InterviewState.SUMMARY
+            return
+        
+        planned = self.take_planned_question(session)
+        if planned is not None:
+            yield "token", self.serve_question(session, planned, source="plan")
+            return
+        
+        difficulty = self.question_difficulty(len(session.responses))
+        pooled = self.take_pooled_question(session, difficulty)
+        if pooled is not None:
+            self.serve_question(session, pooled, source="pool")
+            yield "token", pooled.question
+            return
+        
+        prompt, starter, asked_count = self.build_question_prompt(session, difficulty)
+        self._log_prompt(difficulty, starter, asked_count, prompt)
+        parts = []
+        try:
+            async for delta in self.stream_question_text(prompt, deadline=deadline, priority=request_priority(session)):
+                if delta is None:
+                    if parts:
+                        parts.clear()
+                        yield "reset", ""
+                    continue
+                parts.append(delta)
+                yield "token", delta
+            if not "".join(parts).strip():
+                raise Exception("LLM returned an empty question")
+            self.check_generated(session.asked_questions().questions, "".join(parts))
+            question = self.make_generated_question(session, difficulty, "".join(parts))
+            self.serve_question(session, question)
+        except Exception as e:
+            if parts:
+                yield "reset", ""
+            fallback = self._serve_fallback(session, difficulty, e)
+            if fallback:
+                yield "token", fallback
+    
+    async def generate_plan_text(self, deadline: float) -> str:
+        """One JSON-mode Groq request for a whole interview plan, bounded by `deadline`"""
+        groq = self.providers.get("groq")
+        if groq is None or not groq.available():
+            raise NoProviderAvailable("Plans need Groq and it is unavailable")
+        prompt = self.build_plan_prompt()
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline
+        await self.admission.admit(len(prompt) // 4 + PLAN_MAX_TOKENS, NEW_INTERVIEW, deadline)
+        groq.begin()
+        started = loop.time()
+        try:
+            text = await asyncio.wait_for(
+                self._request_groq(prompt, timeout=max(end - started, 0.001), max_tokens=PLAN_MAX_TOKENS,
+                                   json_mode=True),
+                max(end - started, 0.0))
+        except asyncio.CancelledError:
+            groq.release()
+            raise
+        except Exception as e:
+            groq.record_failure(loop.time() - started, timeout=isinstance(e, asyncio.TimeoutError))
+            raise
+        groq.record_success(loop.time() - started)
+        return text
+    
+    async def plan_interview(self, session: InterviewSession, deadline: float = None) -> List[Question]:
+        """Generate every question of the interview in one LLM call and store them on the session.
+        
+        Whatever the response lacks (malformed JSON, a tier with too few
+        valid or distinct questions, or no response at all) is filled from
+        the question bank instead of asking again, so later turns never
+        need a question-generation call.
+        """
+        try:
+            text = await self.generate_plan_text(self.plan_deadline if deadline is None else deadline)
+            planned = parse_question_plan(text)
+        except Exception as e:
+            log.warning("Question plan request failed, planning from the question bank: %s", e)
+            planned = {}
+        session.question_plan = self.build_question_plan(session, planned)
+        generated = sum(question.id.startswith("gen_") for question in session.question_plan)
+        METRICS.inc("question_plan_questions_total", (("source", "llm"),), generated)
+        METRICS.inc("question_plan_questions_total", (("source", "bank"),), len(session.question_plan) - generated)
+        log.debug("Planned %d questions, %d generated", len(session.question_plan), generated)
+        return session.question_plan
+    
+    def has_planned_question(self, session: InterviewSession, turn: int) -> bool:
+        return turn < len(session.question_plan)
+    
+    def take_pooled_question(self, session: InterviewSession, difficulty: DifficultyLevel):
+        """Return a warm-pool Question the session has not seen yet, or None"""
+        if self.question_pool is None:
+            return None
+        text = self.question_pool.take(difficulty, exclude=self.asked_question_keys(session),
+                                       accept=self._topic_filter(session))
+        if text is None:
+            return None
+        return self.make_generated_question(session, difficulty, text)
+    
+    def has_pooled_question(self, session: InterviewSession, difficulty: DifficultyLevel) -> bool:
+        return self.question_pool is not None and self.question_pool.has_candidate(
+            difficulty, exclude=self.asked_question_keys(session), accept=self._topic_filter(session))
+    
+    def _topic_filter(self, session: InterviewSession):
+        """Pool filter dropping questions on a topic the session has seen (pooled questions are shared by design)"""
+        if self.question_index is None:
+            return None
+        asked = session.asked_questions().questions
+        return lambda text: self.repeat_reason(asked, text, check_exposure=False) is None
+    
+    async def generate_pool_question(self, difficulty: DifficultyLevel) -> str:
+        """Generate a session-independent question for the warm pool"""
+        first_turn = {DifficultyLevel.BEGINNER: 0, DifficultyLevel.INTERMEDIATE: 2}.get(difficulty, 4)
+        blank = InterviewSession(session_id="question-pool", state=InterviewState.INTRO)
+        prompt, _, _ = self.build_question_prompt(blank, difficulty, question_number=first_turn + 1)
+        text = await self.generate_question_text(prompt, background=True)
+        self.check_generated((), text)  # An overexposed topic is dropped; the refill generates another
+        return text
+    
+    # Scoring and the report are CPU-only; they are async so handlers can
+    # await every interviewer call uniformly.
+    async def evaluate_response(self, session: InterviewSession, user_answer: str):
+        return super().evaluate_response(session, user_answer)
+    
+    async def generate_summary(self, session: InterviewSession) -> str:
+        return super().generate_summary(session)
+    
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
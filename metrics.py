@@ -0,0 +1,189 @@
+# In-process metrics with Prometheus text output
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+log = logging.getLogger(__name__)
+
+# Seconds; covers in-process handlers through slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Shard:
+    """Counters and histograms written by a single thread"""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[tuple, float] = {}
+        # (name, labels) -> [per-bucket counts (+Inf last), sum, count]
+        self.histograms: Dict[tuple, list] = {}
+
+
+class Metrics:
+    """Counters and latency histograms that are cheap to record.
+
+    Every thread writes to its own shard, so recording is a couple of dict
+    operations with no lock; the event loop thread and the threadpool that
+    runs sync endpoints never contend. Shards are only merged when
+    `render()` is called for a scrape. Values derived from existing stats
+    (pool sizes, prefetch hits, live sessions) are pulled at scrape time
+    through collectors instead of being recorded on the hot path.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # Only taken when a thread records for the first time
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def describe(self, name: str, kind: str, help_text: str):
+        """Register TYPE and HELP lines for a metric family"""
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = ()):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        histogram[0][bisect.bisect_left(self.buckets, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """`collector()` yields (name, labels, value) samples at scrape time"""
+        self._collectors.append(collector)
+
+    def _merged(self):
+        counters: Dict[tuple, float] = {}
+        histograms: Dict[tuple, list] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # Copies are taken in C, so a writer thread cannot change them mid-iteration
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0.0) + value
+            for key, (bucket_counts, total, count) in list(shard.histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    merged = histograms[key] = [[0] * len(bucket_counts), 0.0, 0]
+                for index, bucket_count in enumerate(list(bucket_counts)):
+                    merged[0][index] += bucket_count
+                merged[1] += total
+                merged[2] += count
+        return counters, histograms
+
+    def snapshot(self) -> Dict[tuple, float]:
+        """Merged counter values keyed by (name, labels); mainly for tests"""
+        return self._merged()[0]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, histograms = self._merged()
+        samples: Dict[str, List[str]] = {}
+
+        for (name, labels), value in counters.items():
+            samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), (bucket_counts, total, count) in histograms.items():
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            except Exception as e:
+                log.exception("Metrics collector failed: %s", e)
+
+        output = []
+        for name in sorted(samples):
+            if name in self._help:
+                kind, help_text = self._help[name]
+                output.append(f"# HELP {name} {help_text}")
+                output.append(f"# TYPE {name} {kind}")
+            output.extend(samples[name])
+        return "\n".join(output) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template.
+
+    Requests that match no API route (static files, 404s) share the label
+    "other" so the number of series stays bounded. Streaming responses are
+    timed until the last chunk is sent.
+    """
+
+    def __init__(self, app, metrics: "Metrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "other"
+            labels = (("method", scope["method"]), ("route", path))
+            self.metrics.observe("http_request_duration_seconds", time.perf_counter() - started, labels)
+            self.metrics.inc("http_requests_total", labels + (("status", str(status[0])),))
+
+
+METRICS = Metrics()
+METRICS.describe("http_request_duration_seconds", "histogram", "HTTP request latency by route")
+METRICS.describe("http_requests_total", "counter", "HTTP requests by route and status")
+METRICS.describe("llm_request_duration_seconds", "histogram", "LLM call latency by provider, model and outcome")
+METRICS.describe("llm_requests_total", "counter", "LLM calls by provider, model and outcome (ok, error, timeout)")
+METRICS.describe("questions_served_total", "counter", "Questions served by source (llm, plan, pool, prefetch, bank)")
+METRICS.describe("question_plan_questions_total", "counter", "Questions in interview plans by source (llm, bank)")
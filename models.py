@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from pydantic import BaseModel, PrivateAttr
+from typing import List, Dict, Optional, Set
 from enum import Enum
+import hashlib
+import re
 
 class InterviewState(str, Enum):
     INTRO = "intro"
@@ -40,6 +42,89 @@ class Response(BaseModel):
     communication_score: float
     feedback: str
 
+# Weights of each competency in the overall score
+SCORE_WEIGHTS = {"technical": 0.4, "efficiency": 0.3, "practices": 0.2, "communication": 0.1}
+
+
+class ScoreTotals:
+    """Running sums over one list of responses, plus the report rendered from them.
+
+    `count` is how many leading entries of `responses` have been added; the
+    cached `summary` is dropped whenever another response is added.
+    """
+
+    __slots__ = ("responses", "count", "technical", "efficiency", "practices", "communication", "weighted",
+                 "summary")
+
+    def __init__(self, responses: list):
+        self.responses = responses
+        self.count = 0
+        self.technical = self.efficiency = self.practices = self.communication = self.weighted = 0.0
+        self.summary: Optional[str] = None
+
+    def add(self, response: Response):
+        self.count += 1
+        self.technical += response.technical_score
+        self.efficiency += response.efficiency_score
+        self.practices += response.practices_score
+        self.communication += response.communication_score
+        self.weighted += (
+            response.technical_score * SCORE_WEIGHTS["technical"] +
+            response.efficiency_score * SCORE_WEIGHTS["efficiency"] +
+            response.practices_score * SCORE_WEIGHTS["practices"] +
+            response.communication_score * SCORE_WEIGHTS["communication"]
+        )
+        self.summary = None
+
+    def averages(self) -> Dict[str, float]:
+        """Per-competency averages (all 0.0 without responses)"""
+        count = self.count or 1
+        return {
+            "technical": self.technical / count,
+            "efficiency": self.efficiency / count,
+            "practices": self.practices / count,
+            "communication": self.communication / count,
+        }
+
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def question_key(text: str) -> str:
+    """Content hash used for deduplication; ignores case, spacing and punctuation"""
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+class AskedQuestions:
+    """What the interviewer has said so far in one transcript, indexed as messages are appended.
+
+    `questions` are the interviewer's messages containing a question mark,
+    in order; `contents` and `keys` (see `question_key`) cover every
+    interviewer message and are used to avoid serving one twice.
+    """
+
+    __slots__ = ("transcript", "count", "questions", "contents", "keys")
+
+    def __init__(self, transcript: list):
+        self.transcript = transcript
+        self.count = 0
+        self.questions: List[str] = []
+        self.contents: Set[str] = set()
+        self.keys: Set[str] = set()
+
+    def add(self, message: Dict[str, str]):
+        self.count += 1
+        if message["role"] != "assistant":
+            return
+        content = message["content"]
+        if content not in self.contents:
+            self.contents.add(content)
+            self.keys.add(question_key(content))
+        if "?" in content:
+            self.questions.append(content)
+
+
 class InterviewSession(BaseModel):
     session_id: str
     state: InterviewState
@@ -47,9 +132,60 @@ class InterviewSession(BaseModel):
     responses: List[Response] = []
     overall_score: float = 0.0
     transcript: List[Dict[str, str]] = []
+    # Questions generated up front for the whole interview; entry n is served at turn n
+    question_plan: List[Question] = []
+    # Wall-clock time (time.time()) the current question's timer runs out; None once it is answered
+    question_deadline: Optional[float] = None
+
+    _scores: Optional[ScoreTotals] = PrivateAttr(default=None)
+    _asked: Optional[AskedQuestions] = PrivateAttr(default=None)
 
     def add_message(self, role: str, content: str):
         self.transcript.append({"role": role, "content": content})
+        if role == "assistant":
+            self.asked_questions()
+    
+    def asked_questions(self) -> AskedQuestions:
+        """Index brought up to date with `transcript` (same rules as `score_totals`)"""
+        asked = self._asked
+        transcript = self.transcript
+        if asked is None or asked.transcript is not transcript or asked.count > len(transcript):
+            asked = self._asked = AskedQuestions(transcript)
+        if asked.count < len(transcript):
+            for message in transcript[asked.count:]:
+                asked.add(message)
+        return asked
+    
+    def add_response(self, response: Response):
+        self.responses.append(response)
+        self.score_totals()
+    
+    def score_totals(self) -> ScoreTotals:
+        """Totals brought up to date with `responses`.
+        
+        Appending only costs folding in the new responses; replacing the list
+        (as regrading does) starts the totals over. Replacing an entry in place
+        is not detected: call `invalidate_scores` afterwards.
+        """
+        scores = self._scores
+        responses = self.responses
+        if scores is None or scores.responses is not responses or scores.count > len(responses):
+            scores = self._scores = ScoreTotals(responses)
+        if scores.count < len(responses):
+            for response in responses[scores.count:]:
+                scores.add(response)
+        return scores
+    
+    def invalidate_scores(self):
+        """Drop the totals and cached summary, e.g. after `responses[i] = rescored`"""
+        self._scores = None
+    
+    def cached_summary(self) -> Optional[str]:
+        """Summary report rendered for the current responses, if any"""
+        return self.score_totals().summary
+    
+    def cache_summary(self, summary: str):
+        self.score_totals().summary = summary
     
     @property
     def conversation_history(self):
@@ -61,19 +197,13 @@ class InterviewSession(BaseModel):
         return self.transcript
 
     def calculate_overall_score(self) -> float:
-        if not self.responses:
+        totals = self.score_totals()
+        if not totals.count:
             return 0.0
-        total_score = 0.0
-        for response in self.responses:
-            weighted_score = (
-                response.technical_score * 0.4 +
-                response.efficiency_score * 0.3 +
-                response.practices_score * 0.2 +
-                response.communication_score * 0.1
-            )
-            total_score += weighted_score
-        self.overall_score = total_score / len(self.responses)
-        return self.overall_score
+        overall_score = totals.weighted / totals.count
+        if overall_score != self.overall_score:
+            self.overall_score = overall_score
+        return overall_score
 
 
 # InterviewerAgent manages the interview flow, state, and LLM interaction
@@ -121,7 +251,7 @@ class InterviewerAgent:
             communication_score=feedback_data["communication_score"],
             feedback=feedback_data["feedback"]
         )
-        self.session.responses.append(response)
+        self.session.add_response(response)
         self.session.add_message("interviewer", response.feedback)
         # Advance state or finish
         if self.round >= self.max_rounds:
@@ -0,0 +1,196 @@
+# Near-duplicate questions: shingle similarity within a session, MinHash + LSH across sessions
+import random
+import re
+import threading
+import zlib
+from array import array
+from functools import lru_cache
+from operator import eq
+from typing import Dict, FrozenSet, List, Optional
+
+NUM_PERM = 48  # MinHash values per signature
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows each
+DEFAULT_THRESHOLD = 0.4  # Jaccard similarity of content words at which two questions count as one topic
+
+_NON_WORD = re.compile(r"[^a-z0-9$]+")
+# Function words, plus the framing every generated question shares (the conversation
+# starters, "imagine you're helping a colleague..."), which says nothing about the topic
+STOPWORDS = frozenset("""
+a about all an and any are as ask asks at be been bit but by can could did do does each either excel for from get
+go had has have help helping here how i if imagine in interesting into is it its just let like ll make manager me
+might more my need needs new now of often on one or our out per practical re s say scenario should situation
+so some something spreadsheet start t team test than that the their them then there these they this those through
+time to up use used using ve walk want was way we were what when where which while who why will with work would you
+your colleague comes common complex challenge dive expertise
+""".split())
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+
+
+@lru_cache(maxsize=8192)
+def shingles(text: str) -> FrozenSet[str]:
+    """Content words of a question, lower-cased and with a trailing plural s dropped"""
+    words = set()
+    for word in _NON_WORD.sub(" ", text.lower()).split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.add(word)
+    return frozenset(words)
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two questions' shingles"""
+    first, second = shingles(a), shingles(b)
+    if not first or not second:
+        return 1.0 if first == second else 0.0
+    return len(first & second) / len(first | second)
+
+
+@lru_cache(maxsize=65536)
+def _word_hashes(word: str) -> array:
+    # One value per permutation; the vocabulary of questions is small, so nearly every word is cached
+    h = zlib.crc32(word.encode())
+    return array("I", [((a * h + b) % _PRIME) & 0xFFFFFFFF for a, b in _PERMUTATIONS])
+
+
+@lru_cache(maxsize=8192)
+def minhash(text: str) -> array:
+    """MinHash signature of a question's shingles; equal positions estimate their Jaccard similarity"""
+    vectors = [_word_hashes(word) for word in shingles(text) or ("",)]
+    if len(vectors) == 1:
+        return array("I", vectors[0])
+    return array("I", map(min, *vectors))
+
+
+class _Topic:
+    __slots__ = ("signature", "exposure")
+
+    def __init__(self, signature: array):
+        self.signature = signature
+        self.exposure = 0
+
+
+class QuestionIndex:
+    """Questions served across all sessions, grouped into topics of near duplicates.
+
+    Each topic keeps the MinHash signature of the first question seen for
+    it and how many times a question of that topic has been served. A
+    lookup hashes the signature in `BANDS` bands; only topics sharing a
+    band bucket are compared, so a query costs the same at a million
+    topics as at a thousand. The best candidate whose estimated similarity
+    reaches `threshold` is the question's topic. At most `capacity` topics
+    are kept; the oldest are dropped first.
+
+    With `max_exposure` set, `overexposed()` is true for questions whose
+    topic has already been served that many times.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, capacity: int = 100_000, max_exposure: int = 0):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.max_exposure = max_exposure
+        self._rows = NUM_PERM // BANDS
+        self._lock = threading.Lock()
+        self._topics: Dict[int, _Topic] = {}  # Insertion order is age
+        # Per band: bucket hash -> topic id, or a list of ids once several share the bucket
+        self._buckets: List[Dict[int, object]] = [{} for _ in range(BANDS)]
+        self._next_id = 0
+        self.queries = 0
+        self.matches = 0
+        self.evicted = 0
+
+    def _band_keys(self, signature: array) -> List[int]:
+        raw = signature.tobytes()
+        step = self._rows * signature.itemsize
+        return [hash(raw[start:start + step]) for start in range(0, len(raw), step)]
+
+    def _find(self, signature: array, keys: List[int]) -> Optional[int]:
+        # Caller holds the lock
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys):
+            found = bucket.get(key)
+            if found is None:
+                continue
+            if isinstance(found, list):
+                candidates.update(found)
+            else:
+                candidates.add(found)
+        best, best_score = None, self.threshold * NUM_PERM
+        for topic_id in candidates:
+            score = sum(map(eq, signature, self._topics[topic_id].signature))
+            if score >= best_score:
+                best, best_score = topic_id, score
+        return best
+
+    def _insert(self, signature: array, keys: List[int]) -> int:
+        # Caller holds the lock
+        topic_id = self._next_id
+        self._next_id += 1
+        self._topics[topic_id] = _Topic(signature)
+        for bucket, key in zip(self._buckets, keys):
+            found = bucket.get(key)
+            if found is None:
+                bucket[key] = topic_id
+            elif isinstance(found, list):
+                found.append(topic_id)
+            else:
+                bucket[key] = [found, topic_id]
+        while len(self._topics) > self.capacity:
+            self._evict_oldest()
+        return topic_id
+
+    def _evict_oldest(self):
+        topic_id = next(iter(self._topics))
+        topic = self._topics.pop(topic_id)
+        for bucket, key in zip(self._buckets, self._band_keys(topic.signature)):
+            found = bucket[key]
+            if isinstance(found, list):
+                found.remove(topic_id)
+                if len(found) == 1:
+                    bucket[key] = found[0]
+            else:
+                del bucket[key]
+        self.evicted += 1
+
+    def exposure(self, text: str) -> int:
+        """How many times a question of this topic has been served"""
+        signature = minhash(text)
+        keys = self._band_keys(signature)
+        with self._lock:
+            self.queries += 1
+            topic_id = self._find(signature, keys)
+            if topic_id is None:
+                return 0
+            self.matches += 1
+            return self._topics[topic_id].exposure
+
+    def overexposed(self, text: str) -> bool:
+        return bool(self.max_exposure) and self.exposure(text) >= self.max_exposure
+
+    def record(self, text: str) -> int:
+        """Count one serve of `text` against its topic, creating the topic if it is new. Returns the topic id."""
+        signature = minhash(text)
+        keys = self._band_keys(signature)
+        with self._lock:
+            topic_id = self._find(signature, keys)
+            if topic_id is None:
+                topic_id = self._insert(signature, keys)
+            self._topics[topic_id].exposure += 1
+            return topic_id
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "topics": len(self._topics),
+            "capacity": self.capacity,
+            "max_exposure": self.max_exposure,
+            "queries": self.queries,
+            "matches": self.matches,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,140 @@
+# Speculative generation of the next interview question
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from interviewer import RepeatedQuestion
+from models import InterviewSession, Question
+
+log = logging.getLogger(__name__)
+
+
+class QuestionPrefetcher:
+    """Generates question N+1 in the background while the candidate answers question N.
+
+    `schedule()` is called right after a question is served. When the
+    candidate answers (or times out) `take()` returns the prefetched question
+    if it is ready, waits for it if it is still in flight, and returns None
+    when there is nothing usable so the caller can fall back to a live call.
+
+    Counters:
+      hits       prefetched question was ready when the turn needed it
+      late_hits  prefetch was still in flight; the turn waited for it
+      misses     no usable prefetch (none scheduled, stale, or it failed)
+      wasted     an LLM call was started but its result was never served
+      skipped    no prefetch was needed because the interview plan or warm pool can serve the turn
+      rejected   the prefetched question repeated an earlier one and the turn generated live instead
+
+    A prefetched question that repeats one the session has seen is
+    regenerated once in the background, before the turn needs it.
+    """
+
+    def __init__(self, interviewer, max_questions: int = 6):
+        self.interviewer = interviewer
+        self.max_questions = max_questions
+        # session_id -> (responses count the question is for, task)
+        self._tasks: Dict[str, Tuple[int, asyncio.Task]] = {}
+        self.hits = 0
+        self.late_hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.skipped = 0
+        self.rejected = 0
+        self._not_needed = set()
+
+    def schedule(self, session: InterviewSession):
+        """Start generating the question that follows the one just served"""
+        answered_after_turn = len(session.responses) + 1
+        if answered_after_turn >= self.max_questions:
+            return  # The current question is the last one
+        self.cancel(session.session_id)
+
+        interviewer = self.interviewer
+        difficulty = interviewer.question_difficulty(answered_after_turn)
+        if (interviewer.has_planned_question(session, answered_after_turn)
+                or interviewer.has_pooled_question(session, difficulty)):
+            self._not_needed.add(session.session_id)
+            self.skipped += 1
+            return
+        prompt, _, _ = interviewer.build_question_prompt(session, difficulty, question_number=answered_after_turn + 1)
+        asked = tuple(session.asked_questions().questions)  # Not the session, so the task does not keep it alive
+
+        async def generate():
+            text = await interviewer.generate_question_text(prompt, background=True)
+            try:
+                interviewer.check_generated(asked, text)
+            except RepeatedQuestion:
+                text = await interviewer.generate_question_text(prompt, background=True)
+            return difficulty, text
+
+        task = asyncio.create_task(generate())
+        self._tasks[session.session_id] = (answered_after_turn, task)
+
+    async def take(self, session: InterviewSession, timeout: Optional[float] = None) -> Optional[Question]:
+        """Return the prefetched next question for `session`, or None.
+
+        A prefetch still in flight is awaited for at most `timeout` seconds;
+        after that it is cancelled and counted as a miss.
+        """
+        entry = self._tasks.pop(session.session_id, None)
+        if entry is None:
+            if session.session_id in self._not_needed:
+                self._not_needed.discard(session.session_id)
+                return None  # Left to the plan or warm pool; not a miss
+            self.misses += 1
+            return None
+
+        answered, task = entry
+        if answered != len(session.responses):
+            # Prefetched for a different turn (e.g. a double submit raced it)
+            self._discard(task)
+            self.misses += 1
+            return None
+
+        ready = task.done()
+        try:
+            difficulty, text = await asyncio.wait_for(task, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self.misses += 1
+            return None
+        except Exception as e:
+            log.warning("Prefetch failed: %s", e)
+            self.misses += 1
+            return None
+
+        try:
+            self.interviewer.check_generated(session.asked_questions().questions, text)
+        except RepeatedQuestion:
+            self.rejected += 1
+            return None
+        if ready:
+            self.hits += 1
+        else:
+            self.late_hits += 1
+        return self.interviewer.make_generated_question(session, difficulty, text)
+
+    def cancel(self, session_id: str):
+        """Drop any pending prefetch for a session. Safe to call from any thread."""
+        self._not_needed.discard(session_id)
+        entry = self._tasks.pop(session_id, None)
+        if entry is not None:
+            self._discard(entry[1])
+
+    def _discard(self, task: asyncio.Task):
+        self.wasted += 1
+        if not task.done():
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        else:
+            # Retrieve the exception, if any, so asyncio does not warn about it
+            task.cancelled() or task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._tasks),
+            "hits": self.hits,
+            "late_hits": self.late_hits,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "rejected": self.rejected,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,265 @@
+# Latency-aware routing across LLM providers with circuit breakers and hedging
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Collection, Dict, List, Optional
+
+from metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class NoProviderAvailable(Exception):
+    """Every provider's circuit is open, so no request was sent"""
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """No provider answered within the request's deadline"""
+
+
+class Provider:
+    """One upstream plus its rolling health: latency window, error rate and breaker.
+
+    `call(prompt, timeout)` returns the generated text; `model` only labels
+    metrics. The breaker opens
+    after `failure_threshold` consecutive failures, or when at least half of
+    a full-enough window failed. While open the provider is skipped; after
+    `open_seconds` a single probe request is let through (half-open). A
+    successful probe closes the breaker, a failed one reopens it for twice
+    as long, up to `max_open_seconds`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        call: Callable[[str, float], Awaitable[str]],
+        model: str = "",
+        window: int = 50,
+        failure_threshold: int = 3,
+        min_samples: int = 10,
+        open_seconds: float = 10.0,
+        max_open_seconds: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.call = call
+        self.model = model
+        self._labels = {
+            outcome: (("provider", name), ("model", model), ("outcome", outcome))
+            for outcome in ("ok", "error", "timeout", "cancelled")
+        }
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._clock = clock
+        self._samples: deque = deque(maxlen=window)  # (latency, ok)
+        self._consecutive_failures = 0
+        self._open_seconds = open_seconds
+        self._open_until = 0.0
+        self._probing = False
+        self.state = CLOSED
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    def available(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._clock() >= self._open_until:
+            self.state = HALF_OPEN
+        return self.state == HALF_OPEN and not self._probing
+
+    def begin(self):
+        self.requests += 1
+        if self.state == HALF_OPEN:
+            self._probing = True
+
+    def record_success(self, latency: float):
+        METRICS.observe("llm_request_duration_seconds", latency, self._labels["ok"])
+        METRICS.inc("llm_requests_total", self._labels["ok"])
+        self._samples.append((latency, True))
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            log.info("LLM provider %s: circuit closed", self.name)
+        self.state = CLOSED
+        self._probing = False
+        self._open_seconds = self.base_open_seconds
+
+    def record_failure(self, latency: float, timeout: bool = False):
+        labels = self._labels["timeout" if timeout else "error"]
+        METRICS.observe("llm_request_duration_seconds", latency, labels)
+        METRICS.inc("llm_requests_total", labels)
+        self._samples.append((latency, False))
+        self._consecutive_failures += 1
+        self.failures += 1
+        if timeout:
+            self.timeouts += 1
+        if self.state == HALF_OPEN:
+            self._open_seconds = min(self._open_seconds * 2, self.max_open_seconds)
+            self._trip()
+        elif self.state == CLOSED and (
+            self._consecutive_failures >= self.failure_threshold
+            or (len(self._samples) >= self.min_samples and self.error_rate() >= 0.5)
+        ):
+            self._trip()
+
+    def release(self):
+        """The request was abandoned (another provider won); it does not count towards health"""
+        METRICS.inc("llm_requests_total", self._labels["cancelled"])
+        self._probing = False
+
+    def _trip(self):
+        self.state = OPEN
+        self._probing = False
+        self._open_until = self._clock() + self._open_seconds
+        log.warning("LLM provider %s: circuit open for %.0fs", self.name, self._open_seconds)
+
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        """Percentile of successful latencies in the window, or None without data"""
+        latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def stats(self) -> Dict[str, object]:
+        p50, p95 = self.latency_percentile(0.5), self.latency_percentile(0.95)
+        return {
+            "state": self.state,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "error_rate": round(self.error_rate(), 3),
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+        }
+
+
+class ProviderRouter:
+    """Send each request to the healthiest provider and hedge slow ones.
+
+    Available providers are tried fastest-p95 first. If the first has not
+    answered after its own p95 latency (`default_hedge_delay` until there is
+    data, at most half of what is left of the deadline), the next provider
+    is started as well and whichever answers first wins; a provider that
+    fails outright is replaced immediately. The whole request is bounded by
+    `deadline` seconds, after which `DeadlineExceeded` is raised so the
+    caller can fall back to the question bank.
+    """
+
+    def __init__(
+        self,
+        providers: List[Provider],
+        deadline: float = 3.0,
+        default_hedge_delay: float = 1.0,
+        min_hedge_delay: float = 0.05,
+    ):
+        self.providers = providers
+        self.deadline = deadline
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.hedged = 0
+        self.failovers = 0
+        self.deadlines_exceeded = 0
+        self.rejected = 0
+
+    def _candidates(self, exclude: Collection[str] = ()) -> List[Provider]:
+        available = [provider for provider in self.providers
+                     if provider.name not in exclude and provider.available()]
+
+        def expected_latency(provider: Provider) -> float:
+            p95 = provider.latency_percentile(0.95)
+            return p95 if p95 is not None else self.default_hedge_delay
+        return sorted(available, key=expected_latency)
+
+    def _hedge_delay(self, provider: Provider, remaining: float) -> float:
+        p95 = provider.latency_percentile(0.95)
+        delay = self.default_hedge_delay if p95 is None else p95
+        return max(self.min_hedge_delay, min(delay, remaining / 2))
+
+    async def generate(self, prompt: str, deadline: Optional[float] = None, hedge: bool = True,
+                       exclude: Collection[str] = ()) -> str:
+        """Return the first successful response, never from a provider named in `exclude`.
+        Raises NoProviderAvailable or DeadlineExceeded."""
+        candidates = self._candidates(exclude)
+        if not candidates:
+            self.rejected += 1
+            raise NoProviderAvailable("All LLM providers are unavailable")
+
+        loop = asyncio.get_running_loop()
+        end = loop.time() + (self.deadline if deadline is None else deadline)
+        running: Dict[asyncio.Task, tuple] = {}
+        errors = []
+
+        def launch(provider: Provider) -> float:
+            """Start `provider`; returns when the next hedge is due"""
+            provider.begin()
+            started = loop.time()
+            task = loop.create_task(provider.call(prompt, max(end - started, 0.001)))
+            task.add_done_callback(_consume_result)
+            running[task] = (provider, started)
+            return started + self._hedge_delay(provider, end - started)
+
+        hedge_at = launch(candidates.pop(0))
+        try:
+            while running:
+                now = loop.time()
+                if now >= end:
+                    break
+                wait_until = min(end, hedge_at) if hedge and candidates else end
+                done, _ = await asyncio.wait(running, timeout=max(0.0, wait_until - now),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                now = loop.time()
+                for task in done:
+                    provider, started = running.pop(task)
+                    error = task.exception()
+                    text = None if error else task.result()
+                    if text and text.strip():
+                        provider.record_success(now - started)
+                        return text
+                    provider.record_failure(now - started)
+                    errors.append(f"{provider.name}: {error or 'empty response'}")
+                    if candidates:
+                        self.failovers += 1
+                        hedge_at = launch(candidates.pop(0))
+                if not done and hedge and candidates and now >= hedge_at and now < end:
+                    self.hedged += 1
+                    hedge_at = launch(candidates.pop(0))
+
+            if running:
+                # Deadline reached with requests still in flight
+                self.deadlines_exceeded += 1
+                now = loop.time()
+                running_names = ", ".join(provider.name for provider, _ in running.values())
+                for task, (provider, started) in running.items():
+                    task.cancel()
+                    provider.record_failure(now - started, timeout=True)
+                running.clear()  # Already counted as timeouts, not as cancelled
+                raise DeadlineExceeded(f"No LLM response within the deadline (waiting on {running_names})")
+            raise Exception("All LLM providers failed: " + "; ".join(errors))
+        finally:
+            for task, (provider, _) in running.items():
+                task.cancel()
+                provider.release()
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = {provider.name: provider.stats() for provider in self.providers}
+        stats.update(deadline_seconds=self.deadline, hedged=self.hedged, failovers=self.failovers,
+                     deadlines_exceeded=self.deadlines_exceeded, rejected=self.rejected)
+        return stats
+
+
+def _consume_result(task: asyncio.Task):
+    # Losing and cancelled requests must not log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
@@ -1,8 +1,20 @@
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+
 from models import Question, QuestionType, DifficultyLevel
 
-QUESTION_BANK = [
+# Built-in questions, used when QUESTION_BANK_PATH is not set. Kept as plain
+# records so Question models are only built for the items actually served.
+_BUILTIN_QUESTIONS = [
     # Warmup Questions
-    Question(
+    dict(
         id="w1",
         type=QuestionType.FORMULA,
         difficulty=DifficultyLevel.BEGINNER,
@@ -16,7 +28,7 @@ QUESTION_BANK = [
         }
     ),
     
-    Question(
+    dict(
         id="w2",
         type=QuestionType.FORMULA,
         difficulty=DifficultyLevel.BEGINNER,
@@ -30,7 +42,7 @@ QUESTION_BANK = [
         }
     ),
     
-    Question(
+    dict(
         id="w3",
         type=QuestionType.FORMULA,
         difficulty=DifficultyLevel.BEGINNER,
@@ -45,7 +57,7 @@ QUESTION_BANK = [
     ),
     
     # Core Assessment
-    Question(
+    dict(
         id="c1",
         type=QuestionType.DATA_ANALYSIS,
         difficulty=DifficultyLevel.INTERMEDIATE,
@@ -59,7 +71,7 @@ QUESTION_BANK = [
         }
     ),
     
-    Question(
+    dict(
         id="c2",
         type=QuestionType.PIVOT_TABLE,
         difficulty=DifficultyLevel.INTERMEDIATE,
@@ -73,7 +85,7 @@ QUESTION_BANK = [
         }
     ),
     
-    Question(
+    dict(
         id="c3",
         type=QuestionType.FORMULA,
         difficulty=DifficultyLevel.INTERMEDIATE,
@@ -88,7 +100,7 @@ QUESTION_BANK = [
     ),
     
     # Advanced Challenge
-    Question(
+    dict(
         id="a1",
         type=QuestionType.FORMULA,
         difficulty=DifficultyLevel.ADVANCED,
@@ -102,7 +114,7 @@ QUESTION_BANK = [
         }
     ),
     
-    Question(
+    dict(
         id="a2",
         type=QuestionType.BEST_PRACTICES,
         difficulty=DifficultyLevel.ADVANCED,
@@ -117,8 +129,282 @@ QUESTION_BANK = [
     )
 ]
 
+_DIFFICULTY_CODES = {level: code for code, level in enumerate(DifficultyLevel)}
+_TYPE_CODES = {qtype: code for code, qtype in enumerate(QuestionType)}
+_DIFFICULTIES = list(DifficultyLevel)
+_TYPES = list(QuestionType)
+
+
+class QuestionView(Sequence):
+    """Read-only slice of a bank (e.g. all beginner questions) that builds models on access"""
+
+    __slots__ = ("_bank", "_positions")
+
+    def __init__(self, bank: "QuestionBank", positions):
+        self._bank = bank
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._bank[pos] for pos in self._positions[index]]
+        return self._bank[self._positions[index]]
+
+
+class QuestionBank(Sequence, ABC):
+    """Question store with precomputed id, difficulty and type indexes.
+
+    Subclasses only need to provide `_build_index()`, which fills the index
+    from cheap metadata, and `_load_record(pos)`, which fetches one raw
+    record. The index is built on first use rather than at import, and each
+    Question is materialized once, when first requested.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids: List[str] = []
+        self._by_id: Dict[str, int] = {}
+        self._by_difficulty: Dict[DifficultyLevel, List[int]] = {}
+        self._by_type: Dict[QuestionType, List[int]] = {}
+        self._cache: Dict[int, Question] = {}
+
+    @abstractmethod
+    def _build_index(self):
+        """Call `_index()` once per record, in position order"""
+
+    @abstractmethod
+    def _load_record(self, pos: int) -> dict:
+        """The raw record at `pos`, as a dict of Question fields"""
+
+    def _index(self, pos: int, question_id: str, difficulty: DifficultyLevel, qtype: QuestionType):
+        self._ids.append(question_id)
+        self._by_id[question_id] = pos
+        self._by_difficulty.setdefault(difficulty, []).append(pos)
+        self._by_type.setdefault(qtype, []).append(pos)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._build_index()
+                    self._loaded = True
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        self._ensure_loaded()
+        if isinstance(index, slice):
+            return [self[pos] for pos in range(*index.indices(len(self._ids)))]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("question index out of range")
+        question = self._cache.get(index)
+        if question is None:
+            question = Question(**self._load_record(index))
+            self._cache[index] = question
+        return question
+
+    def get(self, question_id: str) -> Optional[Question]:
+        self._ensure_loaded()
+        pos = self._by_id.get(question_id)
+        return None if pos is None else self[pos]
+
+    def by_difficulty(self, difficulty: DifficultyLevel) -> QuestionView:
+        self._ensure_loaded()
+        return QuestionView(self, self._by_difficulty.get(difficulty, ()))
+
+    def by_type(self, qtype: QuestionType) -> QuestionView:
+        self._ensure_loaded()
+        return QuestionView(self, self._by_type.get(qtype, ()))
+
+
+class InMemoryQuestionBank(QuestionBank):
+    def __init__(self, records: List[dict]):
+        super().__init__()
+        self._records = records
+
+    def _build_index(self):
+        for pos, record in enumerate(self._records):
+            self._index(pos, record["id"], DifficultyLevel(record["difficulty"]), QuestionType(record["type"]))
+
+    def _load_record(self, pos: int) -> dict:
+        return self._records[pos]
+
+
+# Compact index sidecar for JSON-lines banks ("<bank>.jsonl.idx"):
+#   header  b"QBX1", record count (u32)
+#   records count * (byte offset u64, byte length u32, difficulty code u8, type code u8)
+#   ids     count * (utf-8 length u16, utf-8 bytes)
+_IDX_MAGIC = b"QBX1"
+_IDX_HEADER = struct.Struct("<4sI")
+_IDX_RECORD = struct.Struct("<QIBB")
+
+
+class JsonlQuestionBank(QuestionBank):
+    """Bank backed by a JSON-lines file, read through mmap.
+
+    Only the lines that are actually served are parsed. If a compact index
+    sidecar (see `write_index`) is present and up to date it is used to
+    build the indexes without touching the JSON at all; otherwise the file
+    is scanned once on first use.
+    """
+
+    def __init__(self, path: str, index_path: str = None):
+        super().__init__()
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._spans: List[tuple] = []
+        self._file = None
+        self._map = None
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(self.path) else b""
+
+    def _build_index(self):
+        self._open()
+        if os.path.exists(self.index_path) and os.path.getmtime(self.index_path) >= os.path.getmtime(self.path):
+            self._read_sidecar()
+            return
+        data, offset = self._map, 0
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end == -1:
+                end = len(data)
+            line = data[offset:end]
+            if line.strip():
+                record = json.loads(line)
+                self._spans.append((offset, end - offset))
+                self._index(len(self._spans) - 1, record["id"], DifficultyLevel(record["difficulty"]),
+                            QuestionType(record["type"]))
+            offset = end + 1
+
+    def _read_sidecar(self):
+        with open(self.index_path, "rb") as f:
+            raw = f.read()
+        magic, count = _IDX_HEADER.unpack_from(raw, 0)
+        if magic != _IDX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a question bank index")
+        pos_ids = _IDX_HEADER.size + count * _IDX_RECORD.size
+        records = _IDX_RECORD.iter_unpack(raw[_IDX_HEADER.size:pos_ids])
+        for pos, (offset, length, difficulty_code, type_code) in enumerate(records):
+            id_len = int.from_bytes(raw[pos_ids:pos_ids + 2], "little")
+            question_id = raw[pos_ids + 2:pos_ids + 2 + id_len].decode()
+            pos_ids += 2 + id_len
+            self._spans.append((offset, length))
+            self._index(pos, question_id, _DIFFICULTIES[difficulty_code], _TYPES[type_code])
+
+    def _load_record(self, pos: int) -> dict:
+        offset, length = self._spans[pos]
+        return json.loads(self._map[offset:offset + length])
+
+    def write_index(self):
+        """Write the compact index sidecar so later loads skip JSON parsing"""
+        self._ensure_loaded()
+        parts = [_IDX_HEADER.pack(_IDX_MAGIC, len(self._ids))]
+        positions_difficulty = {pos: level for level, ps in self._by_difficulty.items() for pos in ps}
+        positions_type = {pos: qtype for qtype, ps in self._by_type.items() for pos in ps}
+        for pos, (offset, length) in enumerate(self._spans):
+            parts.append(_IDX_RECORD.pack(offset, length, _DIFFICULTY_CODES[positions_difficulty[pos]],
+                                          _TYPE_CODES[positions_type[pos]]))
+        for question_id in self._ids:
+            encoded = question_id.encode()
+            parts.append(len(encoded).to_bytes(2, "little") + encoded)
+        with open(self.index_path, "wb") as f:
+            f.write(b"".join(parts))
+
+
+class SqliteQuestionBank(QuestionBank):
+    """Bank backed by a SQLite table; only id/difficulty/type are read up front"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._rowids: List[int] = []
+        self._conn = None
+
+    def _build_index(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        for pos, (rowid, question_id, difficulty, qtype) in enumerate(
+                self._conn.execute("SELECT rowid, id, difficulty, type FROM questions ORDER BY rowid")):
+            self._rowids.append(rowid)
+            self._index(pos, question_id, DifficultyLevel(difficulty), QuestionType(qtype))
+
+    def _load_record(self, pos: int) -> dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, type, difficulty, question, expected_answer, scoring_criteria FROM questions WHERE rowid = ?",
+                (self._rowids[pos],)).fetchone()
+        return {
+            "id": row[0], "type": row[1], "difficulty": row[2], "question": row[3],
+            "expected_answer": row[4], "scoring_criteria": json.loads(row[5]),
+        }
+
+
+def _record(question) -> dict:
+    return question.model_dump(mode="json") if isinstance(question, Question) else {
+        **question, "type": QuestionType(question["type"]).value,
+        "difficulty": DifficultyLevel(question["difficulty"]).value,
+    }
+
+
+def export_jsonl(questions, path: str):
+    """Write questions (models or records) as a JSON-lines bank"""
+    with open(path, "w", encoding="utf-8") as f:
+        for question in questions:
+            f.write(json.dumps(_record(question)) + "\n")
+
+
+def export_sqlite(questions, path: str):
+    """Write questions (models or records) to a SQLite bank with difficulty/type indexes"""
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("""CREATE TABLE IF NOT EXISTS questions (
+            id TEXT PRIMARY KEY, type TEXT NOT NULL, difficulty TEXT NOT NULL, question TEXT NOT NULL,
+            expected_answer TEXT NOT NULL, scoring_criteria TEXT NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_type ON questions (type)")
+        conn.executemany(
+            "INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?, ?, ?)",
+            ((r["id"], r["type"], r["difficulty"], r["question"], r["expected_answer"],
+              json.dumps(r["scoring_criteria"])) for r in map(_record, questions)))
+    conn.close()
+
+
+def load_question_bank(path: str = None) -> QuestionBank:
+    """Open the bank at `path` (.jsonl or .db/.sqlite); the built-in bank when no path is given"""
+    if not path:
+        return InMemoryQuestionBank(_BUILTIN_QUESTIONS)
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteQuestionBank(path)
+    return JsonlQuestionBank(path)
+
+
+QUESTION_BANK = load_question_bank(os.getenv("QUESTION_BANK_PATH"))
+
+
 def get_questions_by_difficulty(difficulty: DifficultyLevel):
-    return [q for q in QUESTION_BANK if q.difficulty == difficulty]
+    return QUESTION_BANK.by_difficulty(difficulty)
 
 def get_question_by_id(question_id: str):
-    return next((q for q in QUESTION_BANK if q.id == question_id), None)
\ No newline at end of file
+    return QUESTION_BANK.get(question_id)
+
+
+if __name__ == "__main__":
+    # python question_bank.py export bank.jsonl|bank.db   -- write the built-in questions
+    # python question_bank.py index bank.jsonl            -- build the compact index sidecar
+    import sys
+    command, target = sys.argv[1], sys.argv[2]
+    if command == "export":
+        (export_sqlite if target.endswith((".db", ".sqlite", ".sqlite3")) else export_jsonl)(_BUILTIN_QUESTIONS, target)
+    elif command == "index":
+        JsonlQuestionBank(target).write_index()
+    else:
+        sys.exit(f"Unknown command: {command}")
+    print(f"{command}: {target}")
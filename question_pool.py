@@ -0,0 +1,158 @@
+# Warm pool of pre-generated LLM questions, one bucket per difficulty
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from models import DifficultyLevel, question_key
+
+log = logging.getLogger(__name__)
+
+POOL_LEVELS = (DifficultyLevel.BEGINNER, DifficultyLevel.INTERMEDIATE, DifficultyLevel.ADVANCED)
+
+class _PoolEntry:
+    __slots__ = ("text", "serves")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.serves = 0
+
+
+class QuestionPool:
+    """Background-filled cache of generated questions.
+
+    Each bucket is an OrderedDict in least-recently-served order. `take()`
+    hands out the least recently served question the session has not seen,
+    so entries rotate across sessions; an entry is retired after
+    `max_serves` uses to keep the pool fresh. When a bucket drops below
+    `low_water` entries a refill of `refill_batch` generations is started,
+    and buckets never grow beyond `capacity` (LRU entries are evicted).
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[DifficultyLevel], Awaitable[str]],
+        capacity: int = 50,
+        low_water: int = 10,
+        refill_batch: int = 5,
+        max_serves: int = 20,
+        levels: Iterable[DifficultyLevel] = POOL_LEVELS,
+    ):
+        if low_water > capacity:
+            raise ValueError("low_water cannot exceed capacity")
+        self._generate = generate
+        self.capacity = capacity
+        self.low_water = low_water
+        self.refill_batch = refill_batch
+        self.max_serves = max_serves
+        self._buckets: Dict[DifficultyLevel, "OrderedDict[str, _PoolEntry]"] = {
+            level: OrderedDict() for level in levels
+        }
+        self._refills: Dict[DifficultyLevel, asyncio.Task] = {}
+        self.served = 0
+        self.empty = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.evicted = 0
+
+    def add(self, difficulty: DifficultyLevel, text: str) -> bool:
+        """Add a generated question. Returns False for duplicates and unusable text."""
+        text = (text or "").strip()
+        bucket = self._buckets.get(difficulty)
+        if bucket is None or len(text) < 20:
+            return False
+        key = question_key(text)
+        if key in bucket:
+            self.duplicates += 1
+            return False
+        bucket[key] = _PoolEntry(text)
+        while len(bucket) > self.capacity:
+            bucket.popitem(last=False)
+            self.evicted += 1
+        return True
+
+    @staticmethod
+    def _candidates(bucket: "OrderedDict[str, _PoolEntry]", exclude: Set[str],
+                    accept: Optional[Callable[[str], bool]]):
+        for key, entry in bucket.items():
+            if key not in exclude and (accept is None or accept(entry.text)):
+                yield key
+
+    def has_candidate(self, difficulty: DifficultyLevel, exclude: Set[str] = frozenset(),
+                      accept: Optional[Callable[[str], bool]] = None) -> bool:
+        bucket = self._buckets.get(difficulty)
+        return bool(bucket) and next(self._candidates(bucket, exclude, accept), None) is not None
+
+    def take(self, difficulty: DifficultyLevel, exclude: Set[str] = frozenset(),
+             accept: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Serve the least recently used question whose key is not in `exclude` and that `accept` (if given) allows"""
+        bucket = self._buckets.get(difficulty)
+        if bucket is None:
+            return None
+        chosen = next(self._candidates(bucket, exclude, accept), None)
+        if chosen is None:
+            self.empty += 1
+            self.request_refill(difficulty)
+            return None
+
+        entry = bucket[chosen]
+        entry.serves += 1
+        if entry.serves >= self.max_serves:
+            del bucket[chosen]
+        else:
+            bucket.move_to_end(chosen)
+        self.served += 1
+        if len(bucket) < self.low_water:
+            self.request_refill(difficulty)
+        return entry.text
+
+    def request_refill(self, difficulty: DifficultyLevel):
+        """Start a background refill for `difficulty` unless one is already running"""
+        task = self._refills.get(difficulty)
+        if task is not None and not task.done():
+            return
+        try:
+            self._refills[difficulty] = asyncio.get_running_loop().create_task(self._refill(difficulty))
+        except RuntimeError:
+            pass  # No event loop (e.g. sync tests); `fill()` can be awaited explicitly
+
+    async def _refill(self, difficulty: DifficultyLevel):
+        bucket = self._buckets[difficulty]
+        while len(bucket) < self.low_water + self.refill_batch:
+            before = len(bucket)
+            results = await asyncio.gather(
+                *(self._generate(difficulty) for _ in range(self.refill_batch)),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    log.warning("Question pool refill failed: %s", result)
+                    continue
+                self.generated += 1
+                self.add(difficulty, result)
+            if len(bucket) <= before:
+                break  # Provider is failing or only returning duplicates; try again on the next take
+
+    async def fill(self):
+        """Fill every bucket up to its low-water mark plus one refill batch"""
+        await asyncio.gather(*(self._refill(level) for level in self._buckets))
+
+    def start(self):
+        """Kick off background fills for every bucket"""
+        for level in self._buckets:
+            self.request_refill(level)
+
+    async def stop(self):
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def stats(self) -> Dict[str, int]:
+        stats = {f"size_{level.value}": len(bucket) for level, bucket in self._buckets.items()}
+        stats.update(served=self.served, empty=self.empty, generated=self.generated,
+                     duplicates=self.duplicates, evicted=self.evicted)
+        return stats
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Re-score stored interviews with the current scoring rules.
+
+Usage: python regrade.py sessions.jsonl results.jsonl [--workers N] [--chunk-size N] [--restart]
+
+The input has one InterviewSession JSON object per line (see
+`python session_log.py export`). Every response is re-evaluated, the overall
+score recomputed and the summary report regenerated; one result per session
+is appended to the output. Progress is checkpointed after each chunk, so an
+interrupted run picks up where it stopped when started again.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+from interviewer import ExcelInterviewer
+from models import InterviewSession
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+_interviewer = None
+
+
+def _init_worker():
+    global _interviewer
+    _interviewer = ExcelInterviewer(api_key="")  # Scoring and reports never call an LLM
+
+
+def regrade_chunk(lines: List[bytes]) -> Tuple[bytes, int, int, int]:
+    """Regrade a chunk of session lines. Returns (output, sessions, responses, errors)."""
+    if _interviewer is None:
+        _init_worker()
+    sessions = []
+    errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            sessions.append(InterviewSession.model_validate_json(line))
+        except ValueError:
+            errors += 1
+
+    # Score every answer in the chunk in one batch
+    answers, question_ids = [], []
+    for session in sessions:
+        for response in session.responses:
+            answers.append(response.answer)
+            question_ids.append(response.question_id)
+    rescored = iter(_interviewer.evaluate_batch(answers, question_ids))
+
+    output = []
+    for session in sessions:
+        previous_score = session.calculate_overall_score()
+        session.responses = [next(rescored) for _ in session.responses]
+        overall_score = session.calculate_overall_score()
+        summary = _interviewer.generate_summary(session)
+        output.append(json.dumps({
+            "session_id": session.session_id,
+            "previous_score": round(previous_score, 3),
+            "overall_score": round(overall_score, 3),
+            "responses": [response.model_dump(exclude={"answer"}) for response in session.responses],
+            "summary": summary,
+        }))
+    data = ("\n".join(output) + "\n").encode() if output else b""
+    return data, len(sessions), len(answers), errors
+
+
+def read_chunks(f, chunk_size: int) -> Iterator[Tuple[int, List[bytes]]]:
+    """Yield (input offset after the chunk, lines) without reading the whole file"""
+    lines = []
+    for line in f:
+        lines.append(line)
+        if len(lines) >= chunk_size:
+            yield f.tell(), lines
+            lines = []
+    if lines:
+        yield f.tell(), lines
+
+
+def load_checkpoint(path: str, input_path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return {"input_offset": 0, "output_bytes": 0, "sessions": 0, "responses": 0, "errors": 0}
+    if checkpoint.get("input") != os.path.abspath(input_path):
+        sys.exit(f"{path} belongs to {checkpoint.get('input')}; pass --restart to start over")
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def regrade(input_path: str, output_path: str, workers: int, chunk_size: int, restart: bool = False) -> dict:
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    if not os.path.exists(output_path) and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # Output was deleted; its checkpoint is meaningless
+    checkpoint = load_checkpoint(checkpoint_path, input_path)
+    checkpoint["input"] = os.path.abspath(input_path)
+    done_at_start = checkpoint["sessions"]
+    if done_at_start:
+        print(f"Resuming after {done_at_start} sessions")
+
+    start = last_report = time.perf_counter()
+    mode = "r+b" if checkpoint["output_bytes"] else "wb"
+    with open(input_path, "rb") as source, open(output_path, mode) as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        # Drop anything written after the last checkpoint
+        out.truncate(checkpoint["output_bytes"])
+        out.seek(checkpoint["output_bytes"])
+        source.seek(checkpoint["input_offset"])
+
+        pending = deque()
+        chunks = read_chunks(source, chunk_size)
+        exhausted = False
+        while pending or not exhausted:
+            # Keep every worker busy with a bounded number of chunks in flight
+            while not exhausted and len(pending) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                offset, lines = chunk
+                pending.append((offset, pool.submit(regrade_chunk, lines)))
+            if not pending:
+                break
+
+            # Results are written in input order so the checkpoint is a plain offset
+            offset, future = pending.popleft()
+            data, sessions, responses, errors = future.result()
+            out.write(data)
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.update(
+                input_offset=offset,
+                output_bytes=out.tell(),
+                sessions=checkpoint["sessions"] + sessions,
+                responses=checkpoint["responses"] + responses,
+                errors=checkpoint["errors"] + errors,
+            )
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            now = time.perf_counter()
+            if now - last_report >= 2.0:
+                rate = (checkpoint["sessions"] - done_at_start) / (now - start)
+                print(f"{checkpoint['sessions']} sessions regraded ({rate:,.0f} sessions/s)")
+                last_report = now
+
+    elapsed = time.perf_counter() - start
+    regraded = checkpoint["sessions"] - done_at_start
+    checkpoint["complete"] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    report = {
+        "sessions": checkpoint["sessions"],
+        "responses": checkpoint["responses"],
+        "errors": checkpoint["errors"],
+        "seconds": round(elapsed, 2),
+        "sessions_per_second": round(regraded / elapsed, 1) if elapsed else 0.0,
+    }
+    print(f"Regraded {regraded} sessions in {elapsed:.1f}s "
+          f"({report['sessions_per_second']:,.0f} sessions/s, {checkpoint['errors']} unreadable lines)")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored interviews with the current scoring rules")
+    parser.add_argument("input", help="JSONL file with one InterviewSession per line")
+    parser.add_argument("output", help="JSONL file for the results; <output>.checkpoint tracks progress")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=500, help="sessions per worker task")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+    regrade(args.input, args.output, args.workers, args.chunk_size, args.restart)
+
+
+if __name__ == "__main__":
+    main()
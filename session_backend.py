@@ -0,0 +1,368 @@
+# Shared session state so several worker processes can serve the same interviews
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+from metrics import METRICS
+from models import InterviewSession
+from session_store import DEFAULT_MAX_SESSIONS, DEFAULT_TTL_SECONDS, SessionRegistry
+
+log = logging.getLogger(__name__)
+
+
+class SessionBackend(ABC):
+    """Versioned key-value storage for serialized sessions.
+
+    Every stored session carries a version that goes up by one on each
+    write; `update` only succeeds if the caller saw the latest version
+    (compare-and-set). That is all a shared store has to offer: a Redis
+    implementation maps it onto GET plus a WATCH/MULTI (or Lua) check of a
+    version field, and `touched` timestamps onto key expiry.
+    """
+
+    @abstractmethod
+    def version(self, session_id: str) -> Optional[int]:
+        """Current version, or None if the session does not exist or has expired"""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Tuple[int, str]]:
+        """(version, data), or None if the session does not exist or has expired"""
+
+    @abstractmethod
+    def insert(self, session_id: str, data: str) -> bool:
+        """Store a new session at version 1; False if the id is taken"""
+
+    @abstractmethod
+    def update(self, session_id: str, data: str, expected_version: int) -> Optional[int]:
+        """Replace the session if it is still at `expected_version`. Returns the new version, or None."""
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """Remove the session if it exists"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Drop expired sessions. Returns how many were removed."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of sessions that have not expired"""
+
+
+class MemoryBackend(SessionBackend):
+    """SessionBackend in a dict: shared between threads only, for tests and single-process use"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Tuple[int, str, float]] = {}  # session_id -> (version, data, touched)
+
+    def _row(self, session_id: str):
+        row = self._rows.get(session_id)
+        if row is not None and self._clock() - row[2] >= self.ttl_seconds:
+            return None
+        return row
+
+    def version(self, session_id: str) -> Optional[int]:
+        row = self._row(session_id)
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, str]]:
+        row = self._row(session_id)
+        return (row[0], row[1]) if row else None
+
+    def insert(self, session_id: str, data: str) -> bool:
+        with self._lock:
+            if self._row(session_id) is not None:
+                return False
+            self._rows[session_id] = (1, data, self._clock())
+            return True
+
+    def update(self, session_id: str, data: str, expected_version: int) -> Optional[int]:
+        with self._lock:
+            row = self._row(session_id)
+            if row is None or row[0] != expected_version:
+                return None
+            self._rows[session_id] = (expected_version + 1, data, self._clock())
+            return expected_version + 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._rows.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            expired = [session_id for session_id in self._rows if self._row(session_id) is None]
+            for session_id in expired:
+                del self._rows[session_id]
+        return len(expired)
+
+    def count(self) -> int:
+        return sum(1 for session_id in list(self._rows) if self._row(session_id) is not None)
+
+
+class SQLiteBackend(SessionBackend):
+    """SessionBackend in a SQLite database in WAL mode, shared by every process on the host.
+
+    Readers never block the writer in WAL mode, and with synchronous=NORMAL
+    a commit does not wait for fsync (a power cut can lose the last few
+    turns, never corrupt the file). Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TTL_SECONDS, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                       "id TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL, touched REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_touched ON sessions (touched)")
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _fresh_after(self) -> float:
+        return self._clock() - self.ttl_seconds
+
+    def version(self, session_id: str) -> Optional[int]:
+        row = self._connection().execute(
+            "SELECT version FROM sessions WHERE id = ? AND touched > ?", (session_id, self._fresh_after())).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, str]]:
+        row = self._connection().execute(
+            "SELECT version, data FROM sessions WHERE id = ? AND touched > ?",
+            (session_id, self._fresh_after())).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def insert(self, session_id: str, data: str) -> bool:
+        db = self._connection()
+        # An expired row with the same id may still be on disk; it does not count as taken
+        db.execute("DELETE FROM sessions WHERE id = ? AND touched <= ?", (session_id, self._fresh_after()))
+        try:
+            db.execute("INSERT INTO sessions (id, version, data, touched) VALUES (?, 1, ?, ?)",
+                       (session_id, data, self._clock()))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update(self, session_id: str, data: str, expected_version: int) -> Optional[int]:
+        cursor = self._connection().execute(
+            "UPDATE sessions SET data = ?, version = version + 1, touched = ? "
+            "WHERE id = ? AND version = ? AND touched > ?",
+            (data, self._clock(), session_id, expected_version, self._fresh_after()))
+        return expected_version + 1 if cursor.rowcount == 1 else None
+
+    def delete(self, session_id: str):
+        self._connection().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge_expired(self) -> int:
+        return self._connection().execute("DELETE FROM sessions WHERE touched <= ?", (self._fresh_after(),)).rowcount
+
+    def count(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE touched > ?", (self._fresh_after(),)).fetchone()[0]
+
+
+class SharedSessionStore:
+    """SessionRegistry-compatible store that keeps sessions in a SessionBackend.
+
+    Sessions stay cached in a local SessionRegistry. `get()` asks the
+    backend only for the version and reloads the session when another
+    worker has written a newer one since. `save()` writes a changed
+    session back with a compare-and-set on the version it was read at. If
+    another worker got there first, the write is dropped (first writer
+    wins, as for a double submit), the local copy is invalidated so the
+    next request sees the winner, and False is returned.
+    """
+
+    PURGE_EVERY = 256  # Inserts between sweeps of expired rows
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        compact_after_seconds: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.cache = SessionRegistry(max_sessions=max_sessions, ttl_seconds=ttl_seconds,
+                                     compact_after_seconds=compact_after_seconds)
+        # session_id -> (version, hash of the data at that version) as last seen by this worker.
+        # Kept when the cache evicts a session, since a request may still be saving it.
+        self._versions: Dict[str, Tuple[int, int]] = {}
+        self._inserts = 0
+        self.hits = 0
+        self.reloads = 0
+        self.writes = 0
+        self.conflicts = 0
+
+    def add_evict_listener(self, listener: Callable[[str, InterviewSession], None]):
+        """Fired when a session leaves this worker's cache (it may live on in the backend)"""
+        self.cache.add_evict_listener(listener)
+
+    def put(self, session: InterviewSession) -> InterviewSession:
+        """Store a new session"""
+        data = session.model_dump_json()
+        inserted = self.backend.insert(session.session_id, data)
+        if self._inserted(session, data, inserted):
+            self.purge_expired()
+        return self.cache.put(session)
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """The latest version of the session, from the cache when it is current"""
+        version = self.backend.version(session_id)
+        session = self._cached(session_id, version)
+        if session is not None or version is None:
+            return session
+        return self._loaded(session_id, self.backend.load(session_id))
+
+    def save(self, session: InterviewSession) -> bool:
+        """Write the session back if it changed. False if another worker wrote it first."""
+        write = self._pending_write(session)
+        if not isinstance(write, tuple):
+            return write
+        data, digest, expected_version = write
+        return self._written(session.session_id, digest, self.backend.update(session.session_id, data, expected_version))
+
+    # The backend may block (SQLite waits up to its busy timeout for another
+    # process's write lock), so request handlers use these instead: backend
+    # calls run on a worker thread, the cache stays on the event loop.
+
+    async def aput(self, session: InterviewSession) -> InterviewSession:
+        data = session.model_dump_json()
+        inserted = await asyncio.to_thread(self.backend.insert, session.session_id, data)
+        if self._inserted(session, data, inserted):
+            await self.apurge_expired()
+        return self.cache.put(session)
+
+    async def aget(self, session_id: str) -> Optional[InterviewSession]:
+        version = await asyncio.to_thread(self.backend.version, session_id)
+        session = self._cached(session_id, version)
+        if session is not None or version is None:
+            return session
+        return self._loaded(session_id, await asyncio.to_thread(self.backend.load, session_id))
+
+    async def asave(self, session: InterviewSession) -> bool:
+        write = self._pending_write(session)
+        if not isinstance(write, tuple):
+            return write
+        data, digest, expected_version = write
+        version = await asyncio.to_thread(self.backend.update, session.session_id, data, expected_version)
+        return self._written(session.session_id, digest, version)
+
+    async def apurge_expired(self) -> int:
+        self.cache.purge_expired()
+        self._forget_uncached()
+        return await asyncio.to_thread(self.backend.purge_expired)
+
+    def _inserted(self, session: InterviewSession, data: str, inserted: bool) -> bool:
+        """Bookkeeping after an insert; True when it is time to sweep expired rows"""
+        if not inserted:
+            raise ValueError(f"Session {session.session_id} already exists")
+        self._versions[session.session_id] = (1, hash(data))
+        self._inserts += 1
+        return self._inserts % self.PURGE_EVERY == 0
+
+    def _cached(self, session_id: str, version: Optional[int]) -> Optional[InterviewSession]:
+        """The cached session if it is at `version`"""
+        if version is None:
+            self._invalidate(session_id)
+            return None
+        cached = self._versions.get(session_id)
+        if cached is not None and cached[0] == version:
+            session = self.cache.get(session_id)
+            if session is not None:
+                self.hits += 1
+                return session
+        return None
+
+    def _loaded(self, session_id: str, loaded: Optional[Tuple[int, str]]) -> Optional[InterviewSession]:
+        if loaded is None:
+            self._invalidate(session_id)
+            return None
+        version, data = loaded
+        session = InterviewSession.model_validate_json(data)
+        self.reloads += 1
+        self._versions[session_id] = (version, hash(data))
+        return self.cache.put(session)
+
+    def _pending_write(self, session: InterviewSession):
+        """(data, digest, expected version) to write, or the result of save() if there is nothing to write"""
+        cached = self._versions.get(session.session_id)
+        if cached is None:
+            return False  # Invalidated after a conflict or removed
+        data = session.model_dump_json()
+        digest = hash(data)
+        if digest == cached[1]:
+            return True
+        return data, digest, cached[0]
+
+    def _written(self, session_id: str, digest: int, version: Optional[int]) -> bool:
+        if version is None:
+            self.conflicts += 1
+            METRICS.inc("session_write_conflicts_total")
+            log.warning("Session changed in another worker; this turn's write was dropped")
+            self._invalidate(session_id)
+            return False
+        self.writes += 1
+        self._versions[session_id] = (version, digest)
+        return True
+
+    def acquire(self, session_id: str):
+        self.cache.acquire(session_id)
+
+    def release(self, session_id: str):
+        self.cache.release(session_id)
+
+    def _invalidate(self, session_id: str):
+        self._versions.pop(session_id, None)
+        self.cache.remove(session_id)
+
+    def remove(self, session_id: str) -> Optional[InterviewSession]:
+        session = self.get(session_id)
+        self.backend.delete(session_id)
+        self._invalidate(session_id)
+        return session
+
+    def purge_expired(self) -> int:
+        self.cache.purge_expired()
+        self._forget_uncached()
+        return self.backend.purge_expired()
+
+    def _forget_uncached(self):
+        for session_id in [session_id for session_id in self._versions if session_id not in self.cache]:
+            del self._versions[session_id]
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.backend.version(session_id) is not None
+
+    def __len__(self) -> int:
+        return self.backend.count()
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = self.cache.stats()
+        stats.update(
+            backend=type(self.backend).__name__,
+            live_sessions=len(self),
+            cached_sessions=len(self.cache),
+            cache_hits=self.hits,
+            reloads=self.reloads,
+            writes=self.writes,
+            write_conflicts=self.conflicts,
+        )
+        return stats
@@ -0,0 +1,286 @@
+# Durable append-only log of interview sessions with crash recovery
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from models import InterviewSession, InterviewState, Question, Response
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PATTERN = "log-%06d.jsonl"
+
+
+def _segment_number(path: str) -> int:
+    return int(os.path.basename(path)[4:10])
+
+
+def apply_event(sessions: Dict[str, InterviewSession], event: dict):
+    """Apply one log event to a dict of sessions"""
+    kind, session_id = event["t"], event["sid"]
+    if kind == "created":
+        sessions[session_id] = InterviewSession(session_id=session_id, state=InterviewState(event["state"]))
+        return
+    if kind == "ended":
+        sessions.pop(session_id, None)
+        return
+    session = sessions.get(session_id)
+    if session is None:
+        return  # Created in a segment that was already compacted away as ended
+    if kind == "message":
+        session.add_message(event["role"], event["content"])
+    elif kind == "question":
+        session.current_question = Question(**event["question"])
+        session.question_deadline = event.get("deadline")
+    elif kind == "plan":
+        session.question_plan = [Question(**question) for question in event["questions"]]
+    elif kind == "response":
+        session.add_response(Response(**event["response"]))
+    elif kind == "state":
+        session.state = InterviewState(event["state"])
+
+
+class SessionLog:
+    """Append-only event log with group commit, snapshots and replay.
+
+    `record(session)` diffs a session against what has already been logged
+    and queues the new events (session created, question plan, question
+    served, responses and transcript messages, state changes such as the summary being
+    produced). It never touches the disk itself: a background writer drains
+    the queue, writes everything pending in one batch and fsyncs once per
+    batch, so concurrent turns share the cost of a single sync.
+
+    Once the active segment grows past `compact_bytes`, or every
+    `compact_interval` seconds, the writer rolls over to a new segment and
+    folds the closed ones into `snapshot.json`. `replay()` rebuilds live
+    sessions from the snapshot plus the remaining segments.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fsync: bool = True,
+        compact_bytes: int = 16 * 1024 * 1024,
+        compact_interval: float = 300.0,
+        linger: float = 0.002,
+    ):
+        self.directory = directory
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+        self.linger = linger
+        os.makedirs(directory, exist_ok=True)
+
+        # session_id -> [responses logged, messages logged, question id, state, plan length]
+        self._cursors: Dict[str, list] = {}
+        self._queue: deque = deque()
+        self._wakeup = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._segment = 0
+        self._last_compaction = time.monotonic()
+        self.batches = 0
+        self.events_written = 0
+
+    # ---- recovery -------------------------------------------------------
+
+    def _segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "log-*.jsonl")), key=_segment_number)
+
+    def _load(self, segments: List[str]):
+        """Snapshot plus segments -> (sessions, last segment number applied)"""
+        sessions: Dict[str, InterviewSession] = {}
+        through = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            through = snapshot["through_segment"]
+            for data in snapshot["sessions"]:
+                session = InterviewSession(**data)
+                sessions[session.session_id] = session
+        for path in segments:
+            number = _segment_number(path)
+            if number <= through:
+                continue  # Already folded into the snapshot; deletion was interrupted
+            through = number
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write at the tail of a crashed segment
+                    apply_event(sessions, event)
+        return sessions, through
+
+    def replay(self) -> Dict[str, InterviewSession]:
+        """Rebuild sessions from disk and start the writer. Call once at startup."""
+        sessions, through = self._load(self._segments())
+        for session in sessions.values():
+            self._cursors[session.session_id] = self._cursor_for(session)
+        self._segment = through + 1
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+        self._thread.start()
+        return sessions
+
+    # ---- recording ------------------------------------------------------
+
+    @staticmethod
+    def _cursor_for(session: InterviewSession) -> list:
+        question_id = session.current_question.id if session.current_question else None
+        return [len(session.responses), len(session.transcript), question_id, session.state, len(session.question_plan)]
+
+    def record(self, session: InterviewSession):
+        """Queue events for everything that changed in `session` since the last call"""
+        session_id = session.session_id
+        events = []
+        cursor = self._cursors.get(session_id)
+        if cursor is None:
+            cursor = self._cursors[session_id] = [0, 0, None, None, 0]
+            events.append({"t": "created", "sid": session_id, "state": session.state.value})
+            cursor[3] = session.state
+
+        if len(session.question_plan) != cursor[4]:
+            events.append({"t": "plan", "sid": session_id,
+                           "questions": [question.model_dump(mode="json") for question in session.question_plan]})
+            cursor[4] = len(session.question_plan)
+
+        for message in session.transcript[cursor[1]:]:
+            events.append({"t": "message", "sid": session_id, "role": message["role"], "content": message["content"]})
+        cursor[1] = len(session.transcript)
+
+        question = session.current_question
+        if question is not None and question.id != cursor[2]:
+            events.append({"t": "question", "sid": session_id, "question": question.model_dump(mode="json"),
+                           "deadline": session.question_deadline})
+            cursor[2] = question.id
+
+        for response in session.responses[cursor[0]:]:
+            events.append({"t": "response", "sid": session_id, "response": response.model_dump()})
+        cursor[0] = len(session.responses)
+
+        if session.state != cursor[3]:
+            events.append({"t": "state", "sid": session_id, "state": session.state.value})
+            cursor[3] = session.state
+
+        if events:
+            self._enqueue(events)
+
+    def forget(self, session_id: str):
+        """Mark a session as ended so it is not resurrected on replay"""
+        if self._cursors.pop(session_id, None) is not None:
+            self._enqueue([{"t": "ended", "sid": session_id}])
+
+    def _enqueue(self, events: List[dict]):
+        self._queue.extend(events)
+        with self._wakeup:
+            self._wakeup.notify()
+
+    # ---- writer ---------------------------------------------------------
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, SEGMENT_PATTERN % self._segment)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._queue and not self._closed:
+                    self._wakeup.wait(timeout=self.compact_interval)
+                    if not self._queue and self._due_for_compaction():
+                        break
+            if self.linger and self._queue:
+                time.sleep(self.linger)  # Let concurrent turns join this batch
+            self._write_batch()
+            if self._due_for_compaction():
+                self._compact()
+            if self._closed and not self._queue:
+                return
+
+    def _write_batch(self):
+        batch = []
+        while self._queue:
+            batch.append(self._queue.popleft())
+        if not batch:
+            return
+        self._file.write("".join(json.dumps(event) + "\n" for event in batch))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.batches += 1
+        self.events_written += len(batch)
+
+    def _due_for_compaction(self) -> bool:
+        size = self._file.tell()
+        if size >= self.compact_bytes:
+            return True
+        return size > 0 and time.monotonic() - self._last_compaction >= self.compact_interval
+
+    def _compact(self):
+        """Fold every closed segment into a new snapshot, then delete them"""
+        self._file.close()
+        closed = self._segments()
+        self._segment += 1
+        self._open_segment()
+        self._last_compaction = time.monotonic()
+        try:
+            sessions, through = self._load(closed)
+            snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+            tmp_path = snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "through_segment": through,
+                    "sessions": [s.model_dump(mode="json") for s in sessions.values()],
+                }, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, snapshot_path)
+            for path in closed:
+                os.remove(path)
+        except Exception as e:
+            log.exception("Session log compaction failed: %s", e)
+
+    def close(self):
+        """Flush everything queued and stop the writer"""
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+        if self._file is not None:
+            self._file.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked_sessions": len(self._cursors),
+            "queued_events": len(self._queue),
+            "batches": self.batches,
+            "events_written": self.events_written,
+            "segment": self._segment,
+        }
+
+
+def export_sessions(directory: str, path: str) -> int:
+    """Write the sessions recorded in a log directory as JSON lines, e.g. for regrade.py"""
+    log = SessionLog(directory)
+    sessions, _ = log._load(log._segments())
+    with open(path, "w", encoding="utf-8") as f:
+        for session in sessions.values():
+            f.write(session.model_dump_json() + "\n")
+    return len(sessions)
+
+
+if __name__ == "__main__":
+    # python session_log.py export LOG_DIR sessions.jsonl
+    import sys
+    command, directory, target = sys.argv[1], sys.argv[2], sys.argv[3]
+    if command != "export":
+        sys.exit(f"Unknown command: {command}")
+    print(f"export: {export_sessions(directory, target)} sessions -> {target}")
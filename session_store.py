@@ -0,0 +1,333 @@
+# Session registry for running many interviews in one process
+import logging
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from models import InterviewSession, Question, Response
+from question_bank import get_question_by_id
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SHARDS = 16
+DEFAULT_TTL_SECONDS = 60 * 60  # Idle interviews are dropped after an hour
+DEFAULT_MAX_SESSIONS = 10000
+
+
+def _bank_question(question: Question) -> Optional[Question]:
+    bank_question = get_question_by_id(question.id)
+    return bank_question if bank_question == question else None
+
+
+class CompactSession:
+    """An idle interview packed into tuples and a float array.
+
+    The pydantic models of a live session cost several times the text they
+    hold. Here scores are four doubles per response, response and transcript
+    text is stored once (a transcript entry that repeats an answer or the
+    current question refers to the same string), short repeated strings
+    (roles, question ids, feedback, the intro) are interned, and a question
+    from the bank (current or planned) is kept as a reference to the bank's
+    own Question.
+    `unpack()` rebuilds the InterviewSession when the candidate comes back.
+    """
+
+    __slots__ = ("session_id", "state", "overall_score", "question", "question_ids", "answers", "feedback",
+                 "scores", "roles", "contents", "summary", "plan", "deadline")
+
+    def __init__(self, session: InterviewSession):
+        self.session_id = session.session_id
+        self.state = session.state
+        self.overall_score = session.overall_score
+        self.question = self._pack_question(session.current_question)
+        self.plan = tuple(self._pack_question(question) for question in session.question_plan)
+        self.deadline = session.question_deadline
+
+        responses = session.responses
+        self.question_ids = tuple(sys.intern(r.question_id) for r in responses)
+        self.answers = tuple(r.answer for r in responses)
+        self.feedback = tuple(sys.intern(r.feedback) for r in responses)
+        self.scores = array("d")
+        for r in responses:
+            self.scores.extend((r.technical_score, r.efficiency_score, r.practices_score, r.communication_score))
+
+        self.summary = session.cached_summary()
+        known = {answer: answer for answer in self.answers}
+        for question in session.question_plan:
+            known[question.question] = question.question
+        if session.current_question is not None:
+            known[session.current_question.question] = session.current_question.question
+        if self.summary is not None:
+            known[self.summary] = self.summary
+        self.roles = tuple(sys.intern(message["role"]) for message in session.transcript)
+        self.contents = tuple(
+            known.get(message["content"]) or (
+                sys.intern(message["content"]) if message["role"] == "assistant" else message["content"])
+            for message in session.transcript
+        )
+
+    @staticmethod
+    def _pack_question(question: Optional[Question]):
+        if question is None:
+            return None
+        bank_question = _bank_question(question)
+        if bank_question is not None:
+            return bank_question
+        criteria = tuple((sys.intern(k), sys.intern(v)) for k, v in question.scoring_criteria.items())
+        return (sys.intern(question.id), question.type, question.difficulty, question.question,
+                sys.intern(question.expected_answer), criteria)
+
+    @staticmethod
+    def _unpack_question(question):
+        if isinstance(question, tuple):
+            question_id, qtype, difficulty, text, expected_answer, criteria = question
+            question = Question(id=question_id, type=qtype, difficulty=difficulty, question=text,
+                                expected_answer=expected_answer, scoring_criteria=dict(criteria))
+        return question
+
+    def unpack(self) -> InterviewSession:
+        scores = self.scores
+        session = InterviewSession(
+            session_id=self.session_id,
+            state=self.state,
+            current_question=self._unpack_question(self.question),
+            question_plan=[self._unpack_question(question) for question in self.plan],
+            question_deadline=self.deadline,
+            overall_score=self.overall_score,
+            responses=[
+                Response(question_id=question_id, answer=answer, technical_score=scores[4 * i],
+                         efficiency_score=scores[4 * i + 1], practices_score=scores[4 * i + 2],
+                         communication_score=scores[4 * i + 3], feedback=feedback)
+                for i, (question_id, answer, feedback) in enumerate(zip(self.question_ids, self.answers, self.feedback))
+            ],
+            transcript=[{"role": role, "content": content} for role, content in zip(self.roles, self.contents)],
+        )
+        if self.summary is not None:
+            session.cache_summary(self.summary)
+        return session
+
+
+class _Shard:
+    """One slice of the registry with its own lock.
+
+    Entries are kept in last-access order, so the least recently used
+    session is always at the front. That makes both TTL sweeps and
+    capacity eviction O(1) per removed session. `live` holds the ids of
+    unpacked sessions in the same order, so packing idle ones only looks at
+    the front as well. `in_use` counts the requests working on each session.
+    """
+
+    __slots__ = ("lock", "entries", "live", "in_use", "capacity")
+
+    def __init__(self, capacity: int):
+        self.lock = threading.Lock()
+        # session_id -> (InterviewSession or CompactSession, last_access)
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.live: "OrderedDict[str, None]" = OrderedDict()
+        self.in_use: Dict[str, int] = {}
+        self.capacity = capacity
+
+
+class SessionRegistry:
+    """Thread-safe map of session_id -> InterviewSession.
+
+    Sessions are spread across shards by a hash of their id so concurrent
+    requests for different candidates rarely contend on the same lock.
+    Idle sessions expire after `ttl_seconds` and each shard holds at most
+    `max_sessions / shards` sessions, evicting the least recently used one
+    when full.
+
+    With `compact_after_seconds` set, sessions idle for that long are packed
+    into a CompactSession and unpacked again by the next `get()`. A session
+    marked with `acquire()` (a request in progress, a streaming response)
+    is left alone until the matching `release()`, so no one can be holding
+    a copy that goes stale. Evict listeners may receive either form; both
+    have `session_id`.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        shards: int = DEFAULT_SHARDS,
+        clock: Callable[[], float] = time.monotonic,
+        compact_after_seconds: Optional[float] = None,
+    ):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if max_sessions < shards:
+            raise ValueError("max_sessions must be at least the number of shards")
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.compact_after_seconds = compact_after_seconds
+        self._clock = clock
+        per_shard = -(-max_sessions // shards)  # ceiling division
+        self._shards: List[_Shard] = [_Shard(per_shard) for _ in range(shards)]
+        self._evict_listeners: List[Callable[[str, InterviewSession], None]] = []
+
+    def _shard_for(self, session_id: str) -> _Shard:
+        return self._shards[zlib.crc32(session_id.encode()) % len(self._shards)]
+
+    def add_evict_listener(self, listener: Callable[[str, InterviewSession], None]):
+        """Register a callback fired (outside the shard lock) for every evicted session"""
+        self._evict_listeners.append(listener)
+
+    def _notify_evicted(self, evicted: List[tuple]):
+        for session_id, session in evicted:
+            for listener in self._evict_listeners:
+                try:
+                    listener(session_id, session)
+                except Exception as e:
+                    log.exception("Session evict listener failed: %s", e)
+
+    def _expire_front(self, shard: _Shard, now: float, evicted: List[tuple]):
+        # Caller holds shard.lock
+        entries = shard.entries
+        while entries:
+            session_id = next(iter(entries))
+            session, last_access = entries[session_id]
+            if now - last_access < self.ttl_seconds:
+                break
+            entries.popitem(last=False)
+            shard.live.pop(session_id, None)
+            shard.in_use.pop(session_id, None)
+            evicted.append((session_id, session))
+
+    def _compact_front(self, shard: _Shard, now: float):
+        # Caller holds shard.lock
+        if self.compact_after_seconds is None:
+            return
+        entries = shard.entries
+        packed = []
+        for session_id in shard.live:
+            session, last_access = entries[session_id]
+            if now - last_access < self.compact_after_seconds:
+                break
+            if session_id not in shard.in_use:
+                packed.append((session_id, CompactSession(session), last_access))
+        for session_id, compact, last_access in packed:
+            entries[session_id] = (compact, last_access)
+            del shard.live[session_id]
+
+    def put(self, session: InterviewSession) -> InterviewSession:
+        """Insert or replace a session"""
+        shard = self._shard_for(session.session_id)
+        now = self._clock()
+        evicted: List[tuple] = []
+        with shard.lock:
+            self._expire_front(shard, now, evicted)
+            self._compact_front(shard, now)
+            entries = shard.entries
+            if session.session_id in entries:
+                entries.move_to_end(session.session_id)
+            else:
+                while len(entries) >= shard.capacity:
+                    old_id, (old_session, _) = entries.popitem(last=False)
+                    shard.live.pop(old_id, None)
+                    shard.in_use.pop(old_id, None)
+                    evicted.append((old_id, old_session))
+            entries[session.session_id] = (session, now)
+            shard.live[session.session_id] = None
+            shard.live.move_to_end(session.session_id)
+        self._notify_evicted(evicted)
+        return session
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """Return the live session and refresh its idle timer, or None"""
+        shard = self._shard_for(session_id)
+        now = self._clock()
+        evicted: List[tuple] = []
+        with shard.lock:
+            entry = shard.entries.get(session_id)
+            if entry is None:
+                session = None
+            elif now - entry[1] >= self.ttl_seconds:
+                del shard.entries[session_id]
+                shard.live.pop(session_id, None)
+                shard.in_use.pop(session_id, None)
+                evicted.append((session_id, entry[0]))
+                session = None
+            else:
+                session = entry[0]
+                if isinstance(session, CompactSession):
+                    session = session.unpack()
+                shard.entries[session_id] = (session, now)
+                shard.entries.move_to_end(session_id)
+                shard.live[session_id] = None
+                shard.live.move_to_end(session_id)
+        self._notify_evicted(evicted)
+        return session
+
+    def save(self, session: InterviewSession) -> bool:
+        """Sessions are held by reference, so changes are already in place"""
+        return True
+
+    def acquire(self, session_id: str):
+        """Keep the session unpacked until the matching release(); call it before get()"""
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            shard.in_use[session_id] = shard.in_use.get(session_id, 0) + 1
+
+    def release(self, session_id: str):
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            count = shard.in_use.pop(session_id, 0) - 1
+            if count > 0:
+                shard.in_use[session_id] = count
+
+    # Same interface as SharedSessionStore's; nothing here blocks, so these just call through
+
+    async def aput(self, session: InterviewSession) -> InterviewSession:
+        return self.put(session)
+
+    async def aget(self, session_id: str) -> Optional[InterviewSession]:
+        return self.get(session_id)
+
+    async def asave(self, session: InterviewSession) -> bool:
+        return self.save(session)
+
+    async def apurge_expired(self) -> int:
+        return self.purge_expired()
+
+    def remove(self, session_id: str) -> Optional[InterviewSession]:
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            entry = shard.entries.pop(session_id, None)
+            shard.live.pop(session_id, None)
+            shard.in_use.pop(session_id, None)
+        if entry is None:
+            return None
+        return entry[0].unpack() if isinstance(entry[0], CompactSession) else entry[0]
+
+    def purge_expired(self) -> int:
+        """Drop every idle session past its TTL. Returns how many were removed."""
+        now = self._clock()
+        evicted: List[tuple] = []
+        for shard in self._shards:
+            with shard.lock:
+                self._expire_front(shard, now, evicted)
+                self._compact_front(shard, now)
+        self._notify_evicted(evicted)
+        return len(evicted)
+
+    def __contains__(self, session_id: str) -> bool:
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            return session_id in shard.entries
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "live_sessions": len(self),
+            "compact_sessions": len(self) - sum(len(shard.live) for shard in self._shards),
+            "sessions_in_use": sum(len(shard.in_use) for shard in self._shards),
+            "max_sessions": self.max_sessions,
+            "shards": len(self._shards),
+            "ttl_seconds": int(self.ttl_seconds),
+        }
@@ -0,0 +1,55 @@
+# Coalescing of identical concurrent calls into one upstream request
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key starts `fn()` as a task; callers that arrive
+    while it is in flight wait for the same task instead of starting their
+    own, and all of them get its result or exception. Nothing is cached: the
+    key is forgotten as soon as the call finishes. Each caller can give up
+    after its own `timeout` without affecting the others, and the upstream
+    call is cancelled only once every caller waiting on it has left.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable], timeout: Optional[float] = None):
+        """Result of `fn()`, shared with concurrent callers using the same key"""
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.task.done() and not call.task.cancelled():
+            call.task.exception()  # Retrieved, so asyncio does not warn when nobody was left waiting
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
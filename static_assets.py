@@ -0,0 +1,158 @@
+# Frontend assets held in memory, precompressed, with ETags and cache headers
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip variants are built
+    brotli = None
+
+# Bundler output such as main.3f2a9c1e.js or 787.a1b2c3d4.chunk.css never changes content
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MIN_COMPRESS_BYTES = 256
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/json", ".map")
+
+
+class StaticAsset:
+    """One file: its bytes per content-coding plus the response headers for each, built once"""
+
+    __slots__ = ("content_type", "cache_control", "bodies", "etags", "headers", "not_modified_headers")
+
+    def __init__(self, path: str, body: bytes):
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+        self.content_type = content_type
+        self.cache_control = IMMUTABLE if _HASHED_NAME.search(os.path.basename(path)) else REVALIDATE
+
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        self.bodies: Dict[str, bytes] = {"identity": body}
+        if content_type.startswith(_COMPRESSIBLE) and len(body) >= MIN_COMPRESS_BYTES:
+            candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates["br"] = brotli.compress(body, quality=11)
+            for coding, compressed in candidates.items():
+                if len(compressed) < len(body):
+                    self.bodies[coding] = compressed
+        # Each representation gets its own strong ETag
+        self.etags = {coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+                      for coding in self.bodies}
+
+        self.headers: Dict[str, list] = {}
+        self.not_modified_headers: Dict[str, list] = {}
+        for coding, encoded in self.bodies.items():
+            common = [(b"etag", self.etags[coding].encode()), (b"cache-control", self.cache_control.encode())]
+            if len(self.bodies) > 1:
+                common.append((b"vary", b"Accept-Encoding"))
+            self.not_modified_headers[coding] = common
+            self.headers[coding] = common + [(b"content-type", content_type.encode())] + (
+                [] if coding == "identity" else [(b"content-encoding", coding.encode())]
+            ) + [(b"content-length", str(len(encoded)).encode())]
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """Best content-coding the client accepts: br, then gzip, then identity"""
+        if len(self.bodies) == 1 or not accept_encoding:
+            return "identity"
+        accepted = {}
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip().lower()] = quality
+        for coding in ("br", "gzip"):
+            if coding in self.bodies and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+                return coding
+        return "identity"
+
+
+class StaticBundle:
+    """All files under `directory`, read and compressed once at startup.
+
+    Mounted as an ASGI app it answers GET and HEAD from memory: it picks
+    the best encoding from Accept-Encoding, answers If-None-Match with 304,
+    and marks content-hashed bundler output immutable for a year while
+    everything else (index.html) must be revalidated. Directory paths serve
+    their index.html. Unknown paths are 404, or the index page when
+    `spa_fallback` is set.
+    """
+
+    def __init__(self, directory: Optional[str], spa_fallback: bool = False):
+        self.directory = directory
+        self.spa_fallback = spa_fallback
+        self.assets: Dict[str, StaticAsset] = {}
+        for root, _, files in os.walk(directory) if directory else ():
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    body = f.read()
+                self.add(os.path.relpath(path, directory).replace(os.sep, "/"), body)
+
+    def add(self, path: str, body: bytes) -> StaticAsset:
+        asset = self.assets[path.lstrip("/")] = StaticAsset(path, body)
+        return asset
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        path = path.lstrip("/")
+        if path == "" or path.endswith("/"):
+            path += "index.html"
+        asset = self.assets.get(path)
+        if asset is None and self.spa_fallback and "." not in os.path.basename(path):
+            asset = self.assets.get("index.html")
+        return asset
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self.assets),
+            "bytes": sum(len(asset.bodies["identity"]) for asset in self.assets.values()),
+            "compressed_bytes": sum(len(body) for asset in self.assets.values()
+                                    for coding, body in asset.bodies.items() if coding != "identity"),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await _respond(send, 405, [(b"allow", b"GET, HEAD")], b"Method Not Allowed")
+            return
+        asset = self.lookup(scope["path"])  # Relative to the mount point
+        if asset is None:
+            await _respond(send, 404, [(b"content-type", b"text/plain; charset=utf-8")], b"Not Found")
+            return
+
+        request_headers = dict(scope["headers"])
+        coding = asset.negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match.decode("latin-1"), asset.etags[coding]):
+            await _respond(send, 304, asset.not_modified_headers[coding], b"")
+            return
+        await _respond(send, 200, asset.headers[coding], b"" if method == "HEAD" else asset.bodies[coding])
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _respond(send, status: int, headers: list, body: bytes):
+    if status not in (200, 304):
+        headers = headers + [(b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
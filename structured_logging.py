@@ -0,0 +1,132 @@
+# Non-blocking structured logging: records are queued and written by a background thread
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from typing import Optional
+
+# Correlation id attached to every record logged while handling a session
+session_id_var: contextvars.ContextVar = contextvars.ContextVar("session_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`. The
+# formatter leaves these out, so caller file/line, thread and process never reach the output
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "session_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def bind_session(session_id: Optional[str]):
+    """Tag subsequent log records in this request (and tasks it starts) with `session_id`"""
+    session_id_var.set(session_id)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the correlation id onto the record on the logging thread, before it is queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.session_id = session_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps only `rate` of DEBUG records so chatty debug logging stays affordable"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, session_id and any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "session_id", None):
+            entry["session_id"] = record.session_id
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks or formats on the caller's thread.
+
+    The stock handler formats every record before queueing it; here the
+    record is queued as is (the queue never leaves the process) and all
+    formatting and I/O happen on the listener thread. When the queue is full
+    records are dropped and counted rather than stalling a request.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                  debug_sample_rate: Optional[float] = None, queue_size: int = 10000):
+    """Route all logging through one background writer. Safe to call more than once.
+
+    Defaults come from LOG_LEVEL (INFO), LOG_FORMAT (json or text) and
+    LOG_DEBUG_SAMPLE_RATE (1.0, i.e. keep every debug record).
+    """
+    global _listener
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = fmt or os.getenv("LOG_FORMAT", "json")
+    if debug_sample_rate is None:
+        debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return _listener
+
+    writer = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        writer.setFormatter(JsonFormatter())
+    else:
+        writer.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(session_id)s] %(message)s"))
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.addFilter(DebugSampler(debug_sample_rate))
+    handler.addFilter(ContextFilter())
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+
+    _listener = logging.handlers.QueueListener(handler.queue, writer)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Offline checks for LLM admission control"""
+
+import asyncio
+
+import pytest
+
+from admission import BACKGROUND, IN_PROGRESS, NEW_INTERVIEW, AdmissionController, AdmissionRejected, TokenBucket
+from interviewer import AsyncExcelInterviewer
+from models import InterviewSession, InterviewState
+from provider_router import Provider, ProviderRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_per_minute():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now = 30.0
+    assert bucket.wait_time(30) == 0
+    clock.now = 1000.0
+    assert bucket.tokens <= 60 and bucket.wait_time(60) == 0
+
+
+def test_in_progress_interviews_are_admitted_before_new_starts():
+    async def scenario():
+        admission = AdmissionController(rpm=600)  # One request every 0.1s once the burst is spent
+        for _ in range(600):
+            await admission.admit(0)
+        order = []
+
+        async def call(name, priority):
+            await admission.admit(0, priority, budget=2.0)
+            order.append(name)
+
+        background = asyncio.ensure_future(call("pool", BACKGROUND))
+        new = asyncio.ensure_future(call("start", NEW_INTERVIEW))
+        await asyncio.sleep(0)
+        answer = asyncio.ensure_future(call("answer", IN_PROGRESS))
+        await asyncio.gather(background, new, answer)
+        assert order == ["answer", "start", "pool"]
+        assert admission.stats()["queued"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_rejects_fast_when_the_wait_exceeds_the_budget():
+    async def scenario():
+        admission = AdmissionController(rpm=60, tpm=6000, max_queue=1)
+        await admission.admit(6000)  # Spends the whole minute's tokens
+        with pytest.raises(AdmissionRejected):
+            await asyncio.wait_for(admission.admit(500, NEW_INTERVIEW, budget=3.0), 0.1)
+        assert admission.stats()["rejected_new_interview"] == 1
+
+        # A full queue is not a reason to turn away an interview already under way
+        queued = asyncio.ensure_future(admission.admit(100, BACKGROUND, budget=30.0))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(admission.admit(100, IN_PROGRESS, budget=30.0))
+        with pytest.raises(AdmissionRejected):
+            await queued
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert admission.stats()["queue_length"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_rejected_question_falls_back_to_the_bank():
+    async def scenario():
+        interviewer = AsyncExcelInterviewer(api_key="", deadline=1.0, rpm_limit=1)
+        calls = []
+
+        async def upstream(prompt, timeout):
+            calls.append(prompt)
+            return "How would you remove duplicates from a list?"
+
+        interviewer.router = ProviderRouter([Provider("fake", upstream)], deadline=1.0)
+        first = InterviewSession(session_id="a", state=InterviewState.INTRO)
+        second = InterviewSession(session_id="b", state=InterviewState.INTRO)
+        assert await interviewer.get_next_question(first) == "How would you remove duplicates from a list?"
+        assert await interviewer.get_next_question(second)  # Served from the question bank
+        assert len(calls) == 1
+        assert interviewer.admission.stats()["rejected_new_interview"] == 1
+        await interviewer.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_stream_fallback_is_charged_per_groq_request():
+    class BrokenStream:
+        class chat:
+            class completions:
+                @staticmethod
+                async def create(**kwargs):
+                    raise RuntimeError("stream refused")
+
+    async def fallback(providers):
+        interviewer = AsyncExcelInterviewer(api_key="", deadline=1.0, rpm_limit=60)
+        calls = []
+
+        def upstream(name):
+            async def call(prompt, timeout):
+                calls.append(name)
+                return f"How would you remove duplicates with {name}?"
+            return call
+
+        interviewer._groq_client = BrokenStream
+        interviewer.providers = {name: Provider(name, upstream(name)) for name in providers}
+        interviewer.router = ProviderRouter(list(interviewer.providers.values()), deadline=1.0)
+        chunks = [chunk async for chunk in interviewer.stream_question_text("Ask about lookups")]
+        requests = interviewer.admission.buckets["requests"]
+        charged = requests.capacity - requests.tokens
+        await interviewer.aclose()
+        return chunks, calls, round(charged)
+
+    # Groq is asked twice (the stream, then the routed fallback), so it is charged twice
+    chunks, calls, charged = asyncio.run(fallback(["groq"]))
+    assert chunks == [None, "How would you remove duplicates with groq?"]
+    assert calls == ["groq"] and charged == 2
+
+    # With another provider the fallback goes there; Groq saw one request and is charged once
+    chunks, calls, charged = asyncio.run(fallback(["groq", "huggingface"]))
+    assert chunks == [None, "How would you remove duplicates with huggingface?"]
+    assert calls == ["huggingface"] and charged == 1
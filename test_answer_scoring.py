@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Offline checks for the compiled answer matcher and batch scoring"""
+
+import random
+
+from answer_scoring import EXCEL_KNOWLEDGE, GENERAL, UNCERTAIN, KeywordMatcher, MATCHER
+from interviewer import ExcelInterviewer
+from models import InterviewSession, InterviewState, Question, QuestionType, DifficultyLevel
+
+ANSWERS = [
+    "I would use a VLOOKUP, or better XLOOKUP, to pull the prices.",
+    "Honestly I'm not sure how I would approach that one.",
+    "I would ask a colleague who knows the system better.",
+    "Build a Pivot\n  Table and group the dates by month.",
+    "no idea",
+    "=SUMIFS(C:C, A:A, \"East\") gives the regional total",
+    "İstanbul office would make a pivot for this report",
+]
+
+
+def test_classify_categories():
+    assert [MATCHER.classify(answer) for answer in ANSWERS] == [
+        GENERAL, UNCERTAIN, GENERAL, EXCEL_KNOWLEDGE, UNCERTAIN, GENERAL, EXCEL_KNOWLEDGE,
+    ]
+
+
+def test_terms_match_whole_words_only():
+    matcher = KeywordMatcher(terms=["sum"], phrases=["not sure"])
+    assert matcher.classify("The summary covers everything we discussed") == GENERAL
+    assert matcher.classify("Add them up with SUM then format it nicely") == EXCEL_KNOWLEDGE
+    assert matcher.classify("Add them up with SUM, then format it nicely") == GENERAL
+
+
+def baseline_category(answer: str) -> int:
+    """The scorer's rules before it was compiled, kept verbatim as the reference"""
+    answer_lower = answer.lower()
+    answer_words = answer_lower.split()
+    uncertainty_phrases = ["not sure", "don't know", "not certain", "unsure", "no idea", "can't remember"]
+    if any(phrase in answer_lower for phrase in uncertainty_phrases) or len(answer.strip()) < 20:
+        return UNCERTAIN
+    excel_terms = ["formula", "function", "vlookup", "pivot", "sum", "average", "count", "index", "match",
+                   "if", "sumif", "countif", "chart", "graph", "data", "cell", "range", "worksheet", "workbook"]
+    if any(term in answer_words for term in excel_terms):
+        return EXCEL_KNOWLEDGE
+    return GENERAL
+
+
+def test_classification_matches_the_baseline_scorer():
+    random.seed(8)
+    words = ["if", "If", "IF(A1>0,", "data", "data,", "table", "match", "MATCH(", "filter", "unique", "sum",
+             "=SUM(A1:A10)", "summary", "pivot", "Pivot\n", "vlookup", "xlookup", "index,", "workbook.",
+             "not", "sure", "don't", "know", "no", "idea", "I", "would", "use", "the", "a", "report", "\t",
+             "Range", "chart", "graphs", "İstanbul", "cell", "cells", "countif", "COUNTIFS", "unsure"]
+    answers = ANSWERS + ["", "data", "   if   ", "x" * 19 + " sum"]
+    answers += [" ".join(random.choice(words) for _ in range(random.randint(1, 15))) for _ in range(2000)]
+    expected = [baseline_category(answer) for answer in answers]
+    assert [MATCHER.classify(answer) for answer in answers] == expected
+    assert MATCHER.classify_batch(answers) == expected
+    assert {EXCEL_KNOWLEDGE, GENERAL, UNCERTAIN} <= set(expected)
+
+
+def test_batch_matches_single_answer_path():
+    answers = ANSWERS * 50 + ["", "data"]
+    assert MATCHER.classify_batch(answers) == [MATCHER.classify(answer) for answer in answers]
+    assert MATCHER.classify_batch([]) == []
+
+
+def test_evaluate_batch_and_evaluate_answer_agree():
+    interviewer = ExcelInterviewer(api_key="")
+    responses = interviewer.evaluate_batch(ANSWERS, [f"q{i}" for i in range(len(ANSWERS))])
+    assert [r.question_id for r in responses] == [f"q{i}" for i in range(len(ANSWERS))]
+
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    question = Question(id="q0", type=QuestionType.FORMULA, difficulty=DifficultyLevel.BEGINNER,
+                        question="?", expected_answer="", scoring_criteria={})
+    for answer, batched in zip(ANSWERS, responses):
+        single = interviewer.evaluate_answer(session, question, answer)
+        assert single.technical_score == batched.technical_score
+        assert single.communication_score == batched.communication_score
+    assert len(session.responses) == len(ANSWERS)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Offline checks for the question deadline scheduler"""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from deadlines import DeadlineScheduler, TimingWheel
+
+
+def test_wheel_fires_on_time_and_cancels():
+    wheel = TimingWheel(tick=1.0, slots=8, now=100.0)
+    wheel.schedule("a", 102.5)
+    wheel.schedule("b", 103.0)
+    wheel.schedule("late", 100.0 + 8 * 3 + 1)  # Three revolutions away, in the same bucket as "a"
+    wheel.schedule("gone", 101.0)
+    assert wheel.cancel("gone") and not wheel.cancel("gone")
+
+    assert wheel.advance(102.9) == []  # Never before the deadline
+    assert wheel.advance(103.0) == ["a", "b"]
+    wheel.schedule("b", 104.2)  # Rescheduling replaces the timer
+    wheel.schedule("b", 106.0)
+    assert wheel.advance(105.0) == [] and len(wheel) == 2
+    # Far behind: each bucket is visited once and everything due comes out
+    assert sorted(wheel.advance(200.0)) == ["b", "late"] and len(wheel) == 0
+
+
+def test_scheduler_runs_callbacks_for_due_keys():
+    now = [0.0]
+    fired = []
+    scheduler = DeadlineScheduler(fired.append, tick=0.5, clock=lambda: now[0])
+    for n in range(20_000):
+        scheduler.schedule(f"s{n}", 60.0 + n % 100)
+    for n in range(0, 20_000, 2):
+        scheduler.cancel(f"s{n}")
+    now[0] = 100.0
+    assert scheduler.expire_due() == len(fired) == 4_000
+    assert all(int(key[1:]) % 100 < 40 for key in fired)
+    assert scheduler.stats() == {"pending": 6_000, "scheduled": 20_000, "cancelled": 10_000, "expired": 4_000}
+
+
+def test_server_records_the_timeout_and_refuses_late_answers():
+    import app as server
+
+    with TestClient(server.app) as client:
+        started = client.post("/api/start").json()
+        session_id = started["session_id"]
+        session = server.sessions.get(session_id)
+        assert started["timer"] == 90 and session.question_deadline > time.time() + 80
+        assert session_id in server.deadlines.wheel
+
+        session.question_deadline = time.time() - server.QUESTION_TIMER_GRACE_SECONDS - 1
+        asyncio.run(server.expire_question(session_id))
+        assert session.responses[-1].answer == server.TIMEOUT_ANSWER
+        assert session.question_deadline is None and session_id not in server.deadlines.wheel
+
+        # The answer the client sends afterwards is not scored, and the interview moves on
+        late = client.post("/api/answer", json={"session_id": session_id, "answer": "=SUM(A1:A10)"}).json()
+        assert late["feedback"] == server.TIMEOUT_FEEDBACK and len(session.responses) == 1
+        assert session.question_deadline is not None
+
+        session.question_deadline = time.time() - server.QUESTION_TIMER_GRACE_SECONDS - 1
+        late = client.post("/api/answer", json={"session_id": session_id, "answer": "=SUM(A1:A10)"}).json()
+        assert late["feedback"] == server.TIMEOUT_FEEDBACK and len(session.responses) == 2
+
+        on_time = client.post("/api/answer", json={"session_id": session_id, "answer": "I would use SUMIFS."}).json()
+        assert on_time["feedback"] != server.TIMEOUT_FEEDBACK and len(session.responses) == 3
+        asyncio.run(server.expire_question(session_id))  # Not overdue: nothing happens
+        assert len(session.responses) == 3
+        assert server.sessions.stats()["sessions_in_use"] == 0  # Every request released it
+
+
+def test_bank_fallback_beyond_the_bank_sets_the_current_question():
+    import app as server
+    from models import InterviewSession, InterviewState, Response
+    from question_bank import QUESTION_BANK
+
+    session = InterviewSession(session_id="past-the-bank", state=InterviewState.CORE)
+    session.responses = [Response(question_id=f"q{n}", answer="a", technical_score=3, efficiency_score=3,
+                                  practices_score=3, communication_score=3, feedback="") for n in range(len(QUESTION_BANK))]
+    question = server.serve_bank_question(session)
+    assert session.current_question.question == question
+    assert session.current_question.id == f"fallback_{len(QUESTION_BANK) + 1}"
+
+
+def test_debug_endpoints_evict_on_the_event_loop():
+    import app as server
+
+    seen = []
+
+    def listener(session_id, _):
+        try:
+            asyncio.get_running_loop()
+            seen.append("loop")
+        except RuntimeError:
+            seen.append("worker thread")
+
+    server.sessions.add_evict_listener(listener)
+    with TestClient(server.app) as client:
+        first = client.post("/api/start").json()["session_id"]
+        second = client.post("/api/start").json()["session_id"]
+        ttl, server.sessions.ttl_seconds = server.sessions.ttl_seconds, 0
+        try:
+            assert client.get("/debug/session", params={"session_id": first}).status_code == 404
+            assert client.get("/debug/sessions").status_code == 200
+        finally:
+            server.sessions.ttl_seconds = ttl
+        assert second not in server.deadlines.wheel
+    assert len(seen) >= 2 and set(seen) == {"loop"}
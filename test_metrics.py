@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Offline checks for the metrics registry and /metrics output"""
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from metrics import Metrics, RequestMetricsMiddleware
+
+
+def test_thread_shards_are_merged():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.inc("events_total", (("kind", "a"),))
+            metrics.observe("latency_seconds", 0.02)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()[("events_total", (("kind", "a"),))] == 4000
+    assert "latency_seconds_count 4000" in metrics.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.describe("latency_seconds", "histogram", "Latency")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        metrics.observe("latency_seconds", value, (("route", "/x"),))
+    text = metrics.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{route="/x"} 3.65' in text
+
+
+def test_collectors_and_label_escaping():
+    metrics = Metrics()
+    metrics.add_collector(lambda: [("sessions_live", (("note", 'a "b"'),), 3)])
+    assert 'sessions_live{note="a \\"b\\""} 3' in metrics.render()
+
+
+def test_middleware_labels_by_route_template():
+    metrics = Metrics()
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+    counters = metrics.snapshot()
+    assert counters[("http_requests_total", (("method", "GET"), ("route", "/items/{item_id}"), ("status", "200")))] == 2
+    assert counters[("http_requests_total", (("method", "GET"), ("route", "other"), ("status", "404")))] == 1
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Offline checks for near-duplicate question detection"""
+
+import asyncio
+
+from interviewer import AsyncExcelInterviewer
+from models import DifficultyLevel, InterviewSession, InterviewState
+from near_duplicates import QuestionIndex, similarity
+from question_bank import get_questions_by_difficulty
+from question_pool import QuestionPool
+
+VLOOKUP = "How would you use VLOOKUP to find a product's price from another sheet?"
+VLOOKUP_AGAIN = "Imagine you need to pull the price of a product from a second sheet using VLOOKUP. How would you do it?"
+PIVOT = "How would you build a pivot table of revenue by region?"
+PIVOT_AGAIN = "Here's a common scenario... How would you summarize revenue by region with a pivot table?"
+MACRO = "Time for a challenge... How would you write a VBA macro to archive old rows?"
+
+
+class RepeatingInterviewer(AsyncExcelInterviewer):
+    def __init__(self, text: str):
+        super().__init__(api_key="test-key")
+        self.question_index = QuestionIndex()
+        self.text = text
+
+    async def generate_question_text(self, prompt, background=False, deadline=None, priority=0, charged=None):
+        return self.text
+
+    async def stream_question_text(self, prompt, deadline=None, priority=0):
+        for word in self.text.split(" "):
+            yield word + " "
+
+
+def session_that_asked(question: str) -> InterviewSession:
+    session = InterviewSession(session_id="s", state=InterviewState.INTRO)
+    session.add_message("assistant", question)
+    return session
+
+
+def test_similarity_ignores_wording_and_framing():
+    assert similarity(VLOOKUP, VLOOKUP_AGAIN) >= 0.4
+    assert similarity(PIVOT, PIVOT_AGAIN) >= 0.4
+    assert similarity(VLOOKUP, PIVOT) == 0.0
+    assert similarity("Imagine you're helping a colleague with a sales report. How would you total it?",
+                      "Imagine you're helping a colleague with a sales report. How would you flag late payments?") < 0.4
+
+
+def test_index_groups_topics_and_tracks_exposure():
+    index = QuestionIndex(capacity=2, max_exposure=2)
+    pivot = index.record(PIVOT)
+    assert index.record(PIVOT_AGAIN) == pivot and index.exposure(PIVOT) == 2
+    assert index.overexposed(PIVOT_AGAIN) and not index.overexposed(MACRO)
+
+    index.record(MACRO)
+    index.record(VLOOKUP)  # Over capacity: the oldest topic goes
+    assert index.exposure(PIVOT) == 0 and index.exposure(MACRO) == 1
+    assert index.stats()["evicted"] == 1 and len(index) == 2
+
+
+def test_rewording_of_an_asked_question_falls_back_to_the_bank():
+    async def scenario():
+        interviewer = RepeatingInterviewer(PIVOT_AGAIN)
+        session = session_that_asked(PIVOT)
+        served = await interviewer.get_next_question(session)
+        assert served in [q.question for q in get_questions_by_difficulty(DifficultyLevel.BEGINNER)]
+
+        streamed = session_that_asked(PIVOT)
+        events = [event async for event in interviewer.stream_next_question(streamed)]
+        assert ("reset", "") in events and events[-1] == ("token", streamed.current_question.question)
+        assert not streamed.current_question.id.startswith("gen_")
+
+        fresh = RepeatingInterviewer(MACRO)
+        assert await fresh.get_next_question(session_that_asked(PIVOT)) == MACRO
+        await interviewer.aclose()
+        await fresh.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_pool_skips_topics_the_session_has_seen():
+    interviewer = RepeatingInterviewer(MACRO)
+    interviewer.question_pool = pool = QuestionPool(interviewer.generate_pool_question, capacity=5, low_water=0)
+    assert pool.add(DifficultyLevel.BEGINNER, PIVOT_AGAIN) and pool.add(DifficultyLevel.BEGINNER, VLOOKUP)
+    session = session_that_asked(PIVOT)
+    assert interviewer.has_pooled_question(session, DifficultyLevel.BEGINNER)
+    assert interviewer.take_pooled_question(session, DifficultyLevel.BEGINNER).question == VLOOKUP
+    assert interviewer.take_pooled_question(session_that_asked(VLOOKUP), DifficultyLevel.BEGINNER).question == PIVOT_AGAIN
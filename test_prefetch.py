@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Offline checks for speculative question prefetch"""
+
+import asyncio
+import uuid
+
+from interviewer import AsyncExcelInterviewer
+from models import InterviewSession, InterviewState, Response
+from prefetch import QuestionPrefetcher
+
+
+class StubInterviewer(AsyncExcelInterviewer):
+    def __init__(self, delay: float = 0.0):
+        super().__init__(api_key="")
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_question_text(self, prompt: str, background: bool = False) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"Generated question {self.calls}?"
+
+
+def new_session():
+    return InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO)
+
+
+def answer(session):
+    session.responses.append(Response(question_id="q", answer="a", technical_score=5.0, efficiency_score=5.0,
+                                      practices_score=5.0, communication_score=5.0, feedback="ok"))
+
+
+def test_ready_prefetch_is_a_hit():
+    async def run():
+        interviewer = StubInterviewer()
+        prefetcher = QuestionPrefetcher(interviewer)
+        session = new_session()
+        prefetcher.schedule(session)
+        await asyncio.sleep(0.01)
+        answer(session)
+        question = await prefetcher.take(session)
+        assert question.question == "Generated question 1?"
+        assert question.difficulty == interviewer.question_difficulty(1)
+        assert prefetcher.stats()["hits"] == 1
+        await interviewer.aclose()
+    asyncio.run(run())
+
+
+def test_in_flight_prefetch_is_awaited():
+    async def run():
+        interviewer = StubInterviewer(delay=0.05)
+        prefetcher = QuestionPrefetcher(interviewer)
+        session = new_session()
+        prefetcher.schedule(session)
+        answer(session)
+        assert (await prefetcher.take(session)) is not None
+        assert prefetcher.stats()["late_hits"] == 1
+        await interviewer.aclose()
+    asyncio.run(run())
+
+
+def test_slow_prefetch_gives_up_after_timeout():
+    async def run():
+        interviewer = StubInterviewer(delay=5.0)
+        prefetcher = QuestionPrefetcher(interviewer)
+        session = new_session()
+        prefetcher.schedule(session)
+        answer(session)
+        assert (await prefetcher.take(session, timeout=0.05)) is None
+        assert prefetcher.stats()["misses"] == 1 and prefetcher.stats()["pending"] == 0
+        await interviewer.aclose()
+    asyncio.run(run())
+
+
+def test_stale_and_cancelled_prefetches_are_wasted():
+    async def run():
+        interviewer = StubInterviewer(delay=0.05)
+        prefetcher = QuestionPrefetcher(interviewer)
+        session = new_session()
+        prefetcher.schedule(session)
+        answer(session)
+        answer(session)  # A second response arrived before the prefetch was used
+        assert (await prefetcher.take(session)) is None
+
+        prefetcher.schedule(session)
+        prefetcher.cancel(session.session_id)
+        await asyncio.sleep(0)
+        stats = prefetcher.stats()
+        assert stats["wasted"] == 2 and stats["misses"] == 1 and stats["pending"] == 0
+        await interviewer.aclose()
+    asyncio.run(run())
+
+
+def test_no_prefetch_after_last_question():
+    async def run():
+        interviewer = StubInterviewer()
+        prefetcher = QuestionPrefetcher(interviewer)
+        session = new_session()
+        for _ in range(5):
+            answer(session)
+        prefetcher.schedule(session)
+        assert prefetcher.stats()["pending"] == 0
+        await interviewer.aclose()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for test in (test_ready_prefetch_is_a_hit, test_in_flight_prefetch_is_awaited,
+                 test_slow_prefetch_gives_up_after_timeout, test_stale_and_cancelled_prefetches_are_wasted, test_no_prefetch_after_last_question):
+        test()
+        print(f"[PASS] {test.__name__}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Offline checks for the latency-aware LLM provider router"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from interviewer import AsyncExcelInterviewer
+from metrics import METRICS
+from models import InterviewSession, InterviewState
+from provider_router import CLOSED, HALF_OPEN, OPEN, DeadlineExceeded, NoProviderAvailable, Provider, ProviderRouter
+
+
+def fake(delay=0.0, fail=False, text="How would you total column B?"):
+    calls = []
+
+    async def call(prompt, timeout):
+        calls.append(timeout)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("upstream error")
+        return text
+    return call, calls
+
+
+def test_hedges_to_second_provider_when_first_is_slow():
+    slow, _ = fake(delay=1.0, text="slow")
+    fast, _ = fake(delay=0.01, text="fast")
+    router = ProviderRouter([Provider("slow", slow), Provider("fast", fast)],
+                            deadline=0.5, default_hedge_delay=0.05)
+    started = time.perf_counter()
+    assert asyncio.run(router.generate("p")) == "fast"
+    assert time.perf_counter() - started < 0.3
+    assert router.hedged == 1
+
+
+def test_fails_over_immediately_on_error():
+    broken, _ = fake(fail=True)
+    backup, _ = fake(text="backup")
+    router = ProviderRouter([Provider("broken", broken), Provider("backup", backup)], deadline=1.0)
+    assert asyncio.run(router.generate("p", hedge=False)) == "backup"
+    assert router.failovers == 1 and router.hedged == 0
+
+
+def test_deadline_bounds_the_request():
+    slow, calls = fake(delay=5.0)
+    provider = Provider("slow-deadline", slow)
+    router = ProviderRouter([provider], deadline=0.1)
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(router.generate("p"))
+    assert time.perf_counter() - started < 0.5
+    assert calls[0] <= 0.1  # The provider is told how much budget is left
+    assert provider.timeouts == 1 and router.deadlines_exceeded == 1
+    outcomes = {dict(labels)["outcome"]: value for (name, labels), value in METRICS.snapshot().items()
+                if name == "llm_requests_total" and dict(labels)["provider"] == "slow-deadline"}
+    assert outcomes == {"timeout": 1}  # Not also counted as cancelled
+
+
+def test_circuit_opens_then_probes_after_cooldown():
+    now = [0.0]
+    broken, calls = fake(fail=True)
+    provider = Provider("broken", broken, failure_threshold=2, open_seconds=10, clock=lambda: now[0])
+    router = ProviderRouter([provider], deadline=1.0)
+
+    async def attempt():
+        try:
+            await router.generate("p")
+        except Exception as e:
+            return e
+
+    for _ in range(2):
+        asyncio.run(attempt())
+    assert provider.state == OPEN
+    assert isinstance(asyncio.run(attempt()), NoProviderAvailable)
+    assert len(calls) == 2
+
+    now[0] = 11.0
+    assert provider.available() and provider.state == HALF_OPEN
+    asyncio.run(attempt())  # Failed probe reopens for twice as long
+    assert provider.state == OPEN and len(calls) == 3
+    now[0] = 25.0
+    assert not provider.available()
+    now[0] = 32.0
+    provider.call, _ = fake()
+    assert asyncio.run(router.generate("p"))
+    assert provider.state == CLOSED
+
+
+def test_interviewer_falls_back_to_bank_within_deadline():
+    async def run():
+        interviewer = AsyncExcelInterviewer(api_key="", deadline=0.1)
+        slow, _ = fake(delay=5.0)
+        interviewer.router = ProviderRouter([Provider("slow", slow)], deadline=0.1)
+        session = InterviewSession(session_id="s", state=InterviewState.INTRO)
+        started = time.perf_counter()
+        first = await interviewer.get_next_question(session)
+        second = await interviewer.get_next_question(session)
+        elapsed = time.perf_counter() - started
+        await interviewer.aclose()
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(run())
+    assert first and second and first != second  # Bank fallback skips questions already asked
+    assert elapsed < 1.0
+
+
+def test_provider_sdks_load_on_first_use():
+    code = ("import sys, interviewer\n"
+            "iv = interviewer.AsyncExcelInterviewer(api_key='k', hf_token='t')\n"
+            "assert iv.providers and not {'groq', 'httpx', 'requests'} & set(sys.modules)\n"
+            "iv.warm_up()\n"
+            "assert iv.groq_client is not None and 'groq' in sys.modules\n")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Offline checks for the indexed question bank backends"""
+
+import os
+import tempfile
+
+from models import DifficultyLevel, QuestionType
+from question_bank import (QUESTION_BANK, JsonlQuestionBank, SqliteQuestionBank, export_jsonl,
+                           export_sqlite, get_question_by_id, get_questions_by_difficulty)
+
+
+def make_records(n):
+    levels = [DifficultyLevel.BEGINNER, DifficultyLevel.INTERMEDIATE, DifficultyLevel.ADVANCED]
+    return [{
+        "id": f"q{i}",
+        "type": QuestionType.FORMULA if i % 2 else QuestionType.PIVOT_TABLE,
+        "difficulty": levels[i % 3],
+        "question": f"Question {i}: how would you total column {i}?",
+        "expected_answer": "=SUM(...)",
+        "scoring_criteria": {"technical": "SUM usage"},
+    } for i in range(n)]
+
+
+def check_bank(bank, n):
+    assert len(bank) == n
+    assert bank.get("q7").question == "Question 7: how would you total column 7?"
+    assert bank.get("missing") is None
+    beginner = bank.by_difficulty(DifficultyLevel.BEGINNER)
+    assert len(beginner) == (n + 2) // 3
+    assert [q.id for q in beginner[:2]] == ["q0", "q3"]
+    assert len(bank.by_type(QuestionType.FORMULA)) == n // 2
+    assert bank[-1].id == f"q{n - 1}"
+    assert bank[5] is bank[5]  # materialized once
+
+
+def test_builtin_bank():
+    assert len(QUESTION_BANK) == 8
+    assert get_question_by_id("c3").type == QuestionType.FORMULA
+    assert [q.id for q in get_questions_by_difficulty(DifficultyLevel.ADVANCED)] == ["a1", "a2"]
+
+
+def test_jsonl_bank_with_and_without_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.jsonl")
+        export_jsonl(make_records(1000), path)
+        scanned = JsonlQuestionBank(path)
+        check_bank(scanned, 1000)
+        scanned.write_index()
+        assert os.path.exists(path + ".idx")
+        check_bank(JsonlQuestionBank(path), 1000)
+
+
+def test_sqlite_bank():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.db")
+        export_sqlite(make_records(1000), path)
+        check_bank(SqliteQuestionBank(path), 1000)
+
+
+if __name__ == "__main__":
+    for test in (test_builtin_bank, test_jsonl_bank_with_and_without_index, test_sqlite_bank):
+        test()
+        print(f"[PASS] {test.__name__}")
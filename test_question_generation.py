@@ -5,6 +5,7 @@ import os
 from dotenv import load_dotenv
 from interviewer import ExcelInterviewer
 from models import InterviewSession, InterviewState, DifficultyLevel
+from near_duplicates import DEFAULT_THRESHOLD, QuestionIndex, similarity
 import uuid
 
 load_dotenv()
@@ -20,6 +21,7 @@ def test_question_uniqueness():
     
     # Create interviewer and session
     interviewer = ExcelInterviewer(api_key=api_key)
+    interviewer.question_index = QuestionIndex()
     session = InterviewSession(
         session_id=str(uuid.uuid4()),
         state=InterviewState.INTRO
@@ -57,18 +59,19 @@ def test_question_uniqueness():
     print(f"\n=== UNIQUENESS CHECK ===")
     print(f"Total questions generated: {len(generated_questions)}")
     
-    unique_questions = set(generated_questions)
-    print(f"Unique questions: {len(unique_questions)}")
+    # Rewordings of the same scenario count as duplicates too
+    duplicates = [(i, j) for i, q1 in enumerate(generated_questions)
+                  for j, q2 in enumerate(generated_questions[i+1:], i+1)
+                  if similarity(q1, q2) >= DEFAULT_THRESHOLD]
+    print(f"Distinct questions: {len(generated_questions) - len({j for _, j in duplicates})}")
     
-    if len(generated_questions) == len(unique_questions):
+    if not duplicates:
         print("[PASS] All questions are unique!")
         return True
     else:
         print("[FAIL] Found duplicate questions:")
-        for i, q1 in enumerate(generated_questions):
-            for j, q2 in enumerate(generated_questions[i+1:], i+1):
-                if q1 == q2:
-                    print(f"  Duplicate: Q{i+1} == Q{j+1}")
+        for i, j in duplicates:
+            print(f"  Duplicate: Q{i+1} ~ Q{j+1} (similarity {similarity(generated_questions[i], generated_questions[j]):.2f})")
         return False
 
 if __name__ == "__main__":
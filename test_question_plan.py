@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Offline checks for interview-plan mode"""
+
+import asyncio
+import json
+
+from interviewer import AsyncExcelInterviewer, parse_question_plan
+from models import DifficultyLevel, InterviewSession, InterviewState, Response
+from session_log import SessionLog
+from session_store import CompactSession
+
+PLAN = {"questions": [
+    {"difficulty": "beginner", "question": "How would you add up a column of monthly sales figures?"},
+    {"difficulty": "Beginner", "question": "How would you add up a column of monthly sales figures??"},
+    {"difficulty": "beginner", "question": "What does an absolute reference like $A$1 do in a formula?"},
+    {"difficulty": "intermediate", "question": "How would you build a pivot table of revenue by region?"},
+    {"difficulty": "intermediate", "question": "Too short?"},
+    {"difficulty": "expert", "question": "How would you write a VBA macro to archive old rows?"},
+    {"question": "Which difficulty am I supposed to be at all?"},
+]}
+
+
+class PlanningInterviewer(AsyncExcelInterviewer):
+    def __init__(self, text: str):
+        super().__init__(api_key="test-key")
+        self.text = text
+        self.requests = []
+
+    async def _request_groq(self, prompt, timeout=30.0, max_tokens=400, json_mode=False):
+        self.requests.append((max_tokens, json_mode))
+        return self.text
+
+
+def answer(session):
+    session.add_response(Response(question_id="q", answer="a", technical_score=5.0, efficiency_score=5.0,
+                                  practices_score=5.0, communication_score=5.0, feedback="ok"))
+
+
+def test_parse_skips_malformed_entries():
+    planned = parse_question_plan("Here is your plan:\n" + json.dumps(PLAN) + "\nGood luck!")
+    assert planned[DifficultyLevel.BEGINNER] == [PLAN["questions"][0]["question"], PLAN["questions"][2]["question"]]
+    assert planned[DifficultyLevel.INTERMEDIATE] == [PLAN["questions"][3]["question"]]
+    assert planned[DifficultyLevel.ADVANCED] == []
+    assert parse_question_plan("not json at all") == {d: [] for d in planned}
+
+
+def test_plan_is_topped_up_from_the_bank_and_served_without_calls():
+    async def scenario():
+        interviewer = PlanningInterviewer(json.dumps(PLAN))
+        session = InterviewSession(session_id="s", state=InterviewState.INTRO)
+        plan = await interviewer.plan_interview(session)
+        assert interviewer.requests == [(1200, True)]
+        assert [q.difficulty for q in plan] == [DifficultyLevel.BEGINNER] * 2 + [DifficultyLevel.INTERMEDIATE] * 2 + \
+            [DifficultyLevel.ADVANCED] * 2
+        assert [q.id.startswith("gen_") for q in plan] == [True, True, True, False, False, False]
+        assert len({q.question for q in plan}) == 6
+
+        served = []
+        for _ in range(6):
+            served.append(await interviewer.get_next_question(session))
+            answer(session)
+        assert served == [q.question for q in plan]
+        assert len(interviewer.requests) == 1
+
+        broken = InterviewSession(session_id="b", state=InterviewState.INTRO)
+        assert all(not q.id.startswith("gen_") for q in await PlanningInterviewer("{").plan_interview(broken))
+        await interviewer.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_plan_survives_packing_and_replay(tmp_path):
+    async def scenario():
+        session = InterviewSession(session_id="s", state=InterviewState.INTRO)
+        await PlanningInterviewer(json.dumps(PLAN)).plan_interview(session)
+        return session
+
+    session = asyncio.run(scenario())
+    assert CompactSession(session).unpack().question_plan == session.question_plan
+
+    log = SessionLog(str(tmp_path), fsync=False)
+    log.replay()
+    log.record(session)
+    log.close()
+    replayed = SessionLog(str(tmp_path), fsync=False)
+    assert replayed.replay()["s"].question_plan == session.question_plan
+    replayed.close()
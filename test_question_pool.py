@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Offline checks for the warm question pool"""
+
+import asyncio
+
+from models import DifficultyLevel
+from question_pool import QuestionPool, question_key
+
+BEGINNER = DifficultyLevel.BEGINNER
+
+
+def make_generator():
+    counter = {"n": 0}
+
+    async def generate(difficulty):
+        counter["n"] += 1
+        return f"Generated {difficulty.value} question number {counter['n']}?"
+    return generate, counter
+
+
+def test_dedupes_by_normalized_content():
+    pool = QuestionPool(make_generator()[0], capacity=10, low_water=2)
+    assert pool.add(BEGINNER, "How would you SUM cells A1 to A10?")
+    assert not pool.add(BEGINNER, "how would you sum cells a1 to a10")
+    assert question_key("Use  VLOOKUP!") == question_key("use vlookup")
+    assert len(pool) == 1 and pool.stats()["duplicates"] == 1
+
+
+def test_take_skips_questions_the_session_has_seen():
+    pool = QuestionPool(make_generator()[0], capacity=10, low_water=0)
+    first, second = "What does COUNTA count in a range?", "When would you use absolute references?"
+    pool.add(BEGINNER, first)
+    pool.add(BEGINNER, second)
+    assert pool.take(BEGINNER, exclude={question_key(first)}) == second
+    assert pool.take(BEGINNER, exclude={question_key(first), question_key(second)}) is None
+
+
+def test_lru_eviction_and_serve_budget():
+    pool = QuestionPool(make_generator()[0], capacity=2, low_water=0, max_serves=2)
+    pool.add(BEGINNER, "Question one about SUM formulas?")
+    pool.add(BEGINNER, "Question two about COUNT formulas?")
+    assert pool.take(BEGINNER) == "Question one about SUM formulas?"  # now most recently used
+    pool.add(BEGINNER, "Question three about IF formulas?")
+    assert pool.stats()["evicted"] == 1
+    assert pool.take(BEGINNER) == "Question one about SUM formulas?"  # second serve retires it
+    assert len(pool) == 1
+
+
+def test_refill_below_low_water():
+    async def run():
+        generate, counter = make_generator()
+        pool = QuestionPool(generate, capacity=20, low_water=4, refill_batch=3, max_serves=1)
+        await pool.fill()
+        filled = pool.stats()["size_beginner"]
+        assert filled >= 4 + 3
+        for _ in range(filled - 3):
+            pool.take(BEGINNER)  # each serve retires the entry
+        assert pool.stats()["size_beginner"] == 3
+        generated = counter["n"]
+        await asyncio.sleep(0.01)  # let the background refill run
+        assert pool.stats()["size_beginner"] >= 4 + 3
+        assert counter["n"] > generated
+        await pool.stop()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for test in (test_dedupes_by_normalized_content, test_take_skips_questions_the_session_has_seen,
+                 test_lru_eviction_and_serve_budget, test_refill_below_low_water):
+        test()
+        print(f"[PASS] {test.__name__}")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Offline checks for the asked-question index and the compiled question prompts"""
+
+from interviewer import ExcelInterviewer
+from models import DifficultyLevel, InterviewSession, InterviewState
+from question_pool import question_key
+
+
+def test_index_follows_the_transcript():
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    session.add_message("assistant", "Welcome!")
+    session.add_message("assistant", "How would you use SUMIFS?")
+    session.add_message("user", "With criteria ranges?")
+    session.transcript.append({"role": "assistant", "content": "What about XLOOKUP?"})  # Folded in on read
+
+    asked = session.asked_questions()
+    assert asked.questions == ["How would you use SUMIFS?", "What about XLOOKUP?"]
+    assert asked.keys == {question_key("Welcome!"), question_key("how would you use sumifs"),
+                          question_key("What about XLOOKUP?")}
+
+    session.transcript = [{"role": "assistant", "content": "Fresh start?"}]
+    assert session.asked_questions().questions == ["Fresh start?"]
+
+
+def test_prompt_template_is_filled_per_turn():
+    interviewer = ExcelInterviewer(api_key="")
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    for n in range(50):
+        session.add_message("assistant", f"Question {n} about pivot tables?")
+        session.add_message("user", "An answer")
+
+    prompt, starter, asked_count = interviewer.build_question_prompt(session, DifficultyLevel.INTERMEDIATE, 3)
+    assert asked_count == 50
+    assert "Generate a intermediate level Excel question" in prompt
+    assert "Question #3 of 6." in prompt
+    assert f'Start with: "{starter}"' in prompt
+    assert "- Question 47 about pivot tables?..." in prompt and "Question 46 " not in prompt
+    assert "Focus on: data analysis and intermediate functions." in prompt
+    assert "{previous}" not in prompt and "{performance}" not in prompt
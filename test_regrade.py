@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Offline checks for the bulk regrading CLI"""
+
+import json
+import os
+
+from models import InterviewSession, InterviewState, Response
+from regrade import CHECKPOINT_SUFFIX, regrade, save_checkpoint
+
+ANSWERS = ["I'd use VLOOKUP to match the IDs", "Not sure about that one at all", "Ask my manager to decide"]
+
+
+def write_sessions(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            session = InterviewSession(session_id=f"s{i}", state=InterviewState.COMPLETED)
+            for n, answer in enumerate(ANSWERS[: 1 + i % 3]):
+                session.responses.append(Response(
+                    question_id=f"q{n}", answer=answer, technical_score=5.0, efficiency_score=5.0,
+                    practices_score=5.0, communication_score=5.0, feedback="old"))
+            f.write(session.model_dump_json() + "\n")
+        f.write("{not json\n")
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_regrades_every_session(tmp_path):
+    source, output = str(tmp_path / "sessions.jsonl"), str(tmp_path / "results.jsonl")
+    write_sessions(source, 30)
+    report = regrade(source, output, workers=2, chunk_size=4)
+    assert report["sessions"] == 30 and report["responses"] == 60 and report["errors"] == 1
+
+    results = read_results(output)
+    assert [r["session_id"] for r in results] == [f"s{i}" for i in range(30)]
+    assert results[0]["previous_score"] == 5.0
+    assert results[0]["overall_score"] == 7.65  # VLOOKUP answer: 7.5*.4 + 8*.3 + 7*.2 + 8.5*.1
+    assert results[0]["responses"][0]["feedback"] != "old"
+    assert results[0]["summary"].startswith("EXCEL SKILLS ASSESSMENT REPORT")
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    source, output = str(tmp_path / "sessions.jsonl"), str(tmp_path / "results.jsonl")
+    write_sessions(source, 10)
+    regrade(source, output, workers=1, chunk_size=10)
+
+    # Pretend the run stopped after the first 4 sessions, mid-way through writing the next chunk
+    with open(source, "rb") as f:
+        offset = sum(len(f.readline()) for _ in range(4))
+    with open(output, "rb") as f:
+        kept = b"".join(f.readline() for _ in range(4))
+    with open(output, "wb") as f:
+        f.write(kept + b'{"session_id": "torn')
+    save_checkpoint(output + CHECKPOINT_SUFFIX, {
+        "input": os.path.abspath(source), "input_offset": offset, "output_bytes": len(kept),
+        "sessions": 4, "responses": 8, "errors": 0,
+    })
+
+    report = regrade(source, output, workers=1, chunk_size=3)
+    assert report["sessions"] == 10 and report["errors"] == 1
+    assert [r["session_id"] for r in read_results(output)] == [f"s{i}" for i in range(10)]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Offline checks for the shared session backends"""
+
+import asyncio
+import sqlite3
+import uuid
+
+import pytest
+
+from models import InterviewSession, InterviewState
+from session_backend import MemoryBackend, SessionBackend, SharedSessionStore, SQLiteBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def new_session():
+    return InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, tmp_path):
+    def make(clock=None):
+        kwargs = {"ttl_seconds": 60, "clock": clock} if clock else {}
+        if request.param == "memory":
+            return MemoryBackend(**kwargs)
+        return SQLiteBackend(str(tmp_path / "sessions.db"), **kwargs)
+    return make
+
+
+def test_backend_compare_and_set_and_expiry(make_backend):
+    clock = FakeClock()
+    backend = make_backend(clock)
+    assert backend.insert("a", "v1") and not backend.insert("a", "again")
+    assert backend.load("a") == (1, "v1")
+    assert backend.update("a", "v2", expected_version=1) == 2
+    assert backend.update("a", "stale", expected_version=1) is None
+    assert backend.load("a") == (2, "v2") and backend.count() == 1
+
+    clock.now += 61
+    assert backend.version("a") is None and backend.count() == 0
+    assert backend.insert("a", "fresh")  # An expired id is free again
+    clock.now += 61
+    assert backend.purge_expired() == 1
+
+
+def test_workers_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first, second = SharedSessionStore(SQLiteBackend(path)), SharedSessionStore(SQLiteBackend(path))
+    session = first.put(new_session())
+
+    other = second.get(session.session_id)
+    assert other is not session and other.state == InterviewState.INTRO
+    other.add_message("assistant", "How would you use SUMIFS?")
+    assert second.save(other)
+    assert second.get(session.session_id) is other  # Current, so served from the cache
+
+    reloaded = first.get(session.session_id)
+    assert reloaded.transcript == [{"role": "assistant", "content": "How would you use SUMIFS?"}]
+    assert first.stats()["reloads"] == 1 and second.stats()["cache_hits"] == 1
+    assert len(first) == 1 and session.session_id in second
+
+
+def test_concurrent_turns_first_writer_wins():
+    backend = MemoryBackend()
+    first, second = SharedSessionStore(backend), SharedSessionStore(backend)
+    session_id = first.put(new_session()).session_id
+    a, b = first.get(session_id), second.get(session_id)
+
+    a.add_message("user", "Answer sent to worker one")
+    b.add_message("user", "Double submit sent to worker two")
+    assert first.save(a)
+    assert not second.save(b)
+    assert second.stats()["write_conflicts"] == 1
+    assert second.get(session_id).transcript[-1]["content"] == "Answer sent to worker one"
+    assert first.save(a) and first.stats()["writes"] == 1  # Unchanged, so nothing is written
+
+
+def test_async_calls_leave_the_event_loop_free(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first, second = SharedSessionStore(SQLiteBackend(path)), SharedSessionStore(SQLiteBackend(path))
+    locker = sqlite3.connect(path, isolation_level=None)
+
+    async def scenario():
+        session = await first.aput(new_session())
+        other = await second.aget(session.session_id)
+        other.add_message("assistant", "How would you use SUMIFS?")
+
+        locker.execute("BEGIN IMMEDIATE")  # Another process holds the write lock
+        save = asyncio.create_task(second.asave(other))
+        await asyncio.sleep(0.05)
+        assert not save.done()  # Waiting for the lock, but the loop kept running
+        locker.execute("COMMIT")
+        assert await save
+        assert (await first.aget(session.session_id)).transcript[-1]["content"] == "How would you use SUMIFS?"
+
+    asyncio.run(scenario())
+    locker.close()
+
+
+def test_backend_must_implement_every_operation():
+    class Partial(SessionBackend):
+        def version(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
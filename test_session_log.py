@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Offline checks for the durable session log"""
+
+import os
+import tempfile
+import uuid
+
+from models import InterviewSession, InterviewState, Question, QuestionType, DifficultyLevel, Response
+from session_log import SessionLog
+
+
+def play_turn(session, n):
+    session.current_question = Question(id=f"gen_{n}", type=QuestionType.FORMULA, difficulty=DifficultyLevel.BEGINNER,
+                                        question=f"Question {n}?", expected_answer="x", scoring_criteria={})
+    session.add_message("assistant", f"Question {n}?")
+    session.responses.append(Response(question_id=f"gen_{n}", answer=f"Answer {n}", technical_score=n,
+                                      efficiency_score=5.0, practices_score=5.0, communication_score=5.0,
+                                      feedback="ok"))
+    session.add_message("user", f"Answer {n}")
+
+
+def new_session():
+    return InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO)
+
+
+def test_replay_restores_sessions():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = SessionLog(tmp)
+        log.replay()
+        kept, ended = new_session(), new_session()
+        for n in range(1, 4):
+            play_turn(kept, n)
+            log.record(kept)
+        kept.state = InterviewState.COMPLETED
+        log.record(kept)
+        log.record(ended)
+        log.forget(ended.session_id)
+        log.close()
+
+        restored = SessionLog(tmp).replay()
+        assert list(restored) == [kept.session_id]
+        assert restored[kept.session_id].model_dump() == kept.model_dump()
+
+
+def test_compaction_and_torn_tail():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = SessionLog(tmp, compact_bytes=2000)
+        log.replay()
+        sessions = [new_session() for _ in range(20)]
+        for n in range(1, 4):
+            for session in sessions:
+                play_turn(session, n)
+                log.record(session)
+        log.close()
+        assert os.path.exists(os.path.join(tmp, "snapshot.json"))
+
+        # Simulate a crash in the middle of a write
+        segments = sorted(f for f in os.listdir(tmp) if f.startswith("log-"))
+        with open(os.path.join(tmp, segments[-1]), "a") as f:
+            f.write('{"t": "message", "sid": "')
+
+        restored = SessionLog(tmp).replay()
+        assert len(restored) == 20
+        for session in sessions:
+            assert restored[session.session_id].model_dump() == session.model_dump()
+
+
+if __name__ == "__main__":
+    for test in (test_replay_restores_sessions, test_compaction_and_torn_tail):
+        test()
+        print(f"[PASS] {test.__name__}")
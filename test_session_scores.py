@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Offline checks for running score totals and the cached summary report"""
+
+from interviewer import ExcelInterviewer
+from models import InterviewSession, InterviewState, Response
+
+
+def response(n: int, technical: float) -> Response:
+    return Response(question_id=f"q{n}", answer=f"I would use SUMIFS for case {n}", technical_score=technical,
+                    efficiency_score=6.0, practices_score=5.5, communication_score=9.0, feedback="Good")
+
+
+def naive_overall(session: InterviewSession) -> float:
+    weighted = [r.technical_score * 0.4 + r.efficiency_score * 0.3 + r.practices_score * 0.2 +
+                r.communication_score * 0.1 for r in session.responses]
+    return sum(weighted) / len(weighted)
+
+
+def test_totals_follow_appends_and_replacement():
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    assert session.calculate_overall_score() == 0.0
+    for n in range(4):
+        session.add_response(response(n, 4.0 + n))
+    session.responses.append(response(4, 9.5))  # Appended directly, folded in on the next read
+    assert session.calculate_overall_score() == naive_overall(session)
+    assert session.score_totals().averages()["technical"] == (4 + 5 + 6 + 7 + 9.5) / 5
+
+    session.responses = [response(n, 2.0) for n in range(3)]
+    assert session.calculate_overall_score() == naive_overall(session)
+    assert session.score_totals().count == 3
+
+
+def test_totals_follow_in_place_replacement_after_invalidation():
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    for n in range(3):
+        session.add_response(response(n, 8.0))
+    session.cache_summary("report")
+    assert session.calculate_overall_score() == naive_overall(session)
+
+    session.responses[1] = response(1, 1.0)
+    session.invalidate_scores()
+    assert session.calculate_overall_score() == naive_overall(session)
+    assert session.score_totals().averages()["technical"] == (8 + 1 + 8) / 3
+    assert session.cached_summary() is None
+
+
+def test_summary_is_cached_until_responses_change():
+    interviewer = ExcelInterviewer(api_key="")
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    for n in range(6):
+        session.add_response(response(n, 8.0))
+
+    summary = interviewer.generate_summary(session)
+    messages = len(session.transcript)
+    assert interviewer.generate_summary(session) is summary
+    assert len(session.transcript) == messages  # Polling does not grow the transcript
+
+    session.add_response(response(6, 1.0))
+    updated = interviewer.generate_summary(session)
+    assert updated != summary
+    assert "Questions Answered: 7" in updated
+
+
+def test_restored_summary_is_not_appended_twice():
+    interviewer = ExcelInterviewer(api_key="")
+    session = InterviewSession(session_id="s", state=InterviewState.CORE)
+    session.add_response(response(0, 8.0))
+    summary = interviewer.generate_summary(session)
+
+    restored = InterviewSession(**session.model_dump())
+    assert interviewer.generate_summary(restored) == summary
+    assert len(restored.transcript) == len(session.transcript)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Offline checks for the multi-session registry"""
+
+import threading
+import uuid
+
+from interviewer import ExcelInterviewer
+from models import DifficultyLevel, InterviewSession, InterviewState
+from question_bank import QUESTION_BANK
+from session_store import CompactSession, SessionRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def new_session():
+    return InterviewSession(session_id=str(uuid.uuid4()), state=InterviewState.INTRO)
+
+
+def test_sessions_are_isolated():
+    registry = SessionRegistry(max_sessions=100, shards=4)
+    a, b = registry.put(new_session()), registry.put(new_session())
+    a.add_message("assistant", "Question for A?")
+
+    assert registry.get(a.session_id) is a
+    assert registry.get(b.session_id) is b
+    assert b.transcript == []
+    assert registry.get("missing") is None
+    assert len(registry) == 2
+
+
+def test_idle_sessions_expire():
+    clock = FakeClock()
+    evicted = []
+    registry = SessionRegistry(max_sessions=100, ttl_seconds=10, shards=4, clock=clock)
+    registry.add_evict_listener(lambda sid, s: evicted.append(sid))
+    stale, active = registry.put(new_session()), registry.put(new_session())
+
+    clock.now = 8
+    assert registry.get(active.session_id) is active  # refreshes the idle timer
+    clock.now = 12
+    assert registry.purge_expired() == 1
+    assert registry.get(stale.session_id) is None
+    assert registry.get(active.session_id) is active
+    assert evicted == [stale.session_id]
+
+
+def test_capacity_evicts_least_recently_used():
+    clock = FakeClock()
+    registry = SessionRegistry(max_sessions=3, shards=1, clock=clock)
+    first, second, third = (registry.put(new_session()) for _ in range(3))
+    registry.get(first.session_id)
+    fourth = registry.put(new_session())
+
+    assert len(registry) == 3
+    assert second.session_id not in registry
+    assert first.session_id in registry and fourth.session_id in registry
+
+
+def test_concurrent_puts():
+    registry = SessionRegistry(max_sessions=10000, shards=16)
+
+    def worker():
+        for _ in range(500):
+            session = registry.put(new_session())
+            assert registry.get(session.session_id) is session
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(registry) == 4000
+
+
+def played_session():
+    interviewer = ExcelInterviewer(api_key="")
+    session = new_session()
+    interviewer.start_interview(session)
+    for n in range(6):
+        question = QUESTION_BANK[n] if n % 2 else interviewer.make_generated_question(
+            session, DifficultyLevel.BEGINNER, f"How would you total column {n} with SUMIFS?")
+        interviewer.serve_question(session, question)
+        interviewer.evaluate_answer(session, question, f"I would use SUMIFS over column {n}")
+    interviewer.generate_summary(session)
+    return session
+
+
+def test_compact_session_round_trip():
+    session = played_session()
+    packed = CompactSession(session)
+    assert packed.question is session.current_question  # Bank questions are shared, not copied
+    restored = packed.unpack()
+    assert restored.model_dump() == session.model_dump()
+    assert restored.cached_summary() == session.cached_summary()
+
+
+def test_idle_sessions_are_packed_unless_in_use():
+    clock = FakeClock()
+    registry = SessionRegistry(max_sessions=100, shards=1, clock=clock, compact_after_seconds=30)
+    held = registry.put(played_session())
+    registry.acquire(held.session_id)
+    registry.acquire(held.session_id)  # Two requests on the same session
+    idle_id = registry.put(played_session()).session_id
+    expected = registry.get(idle_id).model_dump()
+
+    clock.now = 31
+    registry.purge_expired()
+    assert registry.stats()["compact_sessions"] == 1 and registry.stats()["sessions_in_use"] == 1
+    restored = registry.get(idle_id)
+    assert isinstance(restored, InterviewSession) and restored.model_dump() == expected
+    assert registry.get(held.session_id) is held
+    assert registry.stats()["compact_sessions"] == 0
+
+    registry.release(held.session_id)
+    clock.now = 62
+    registry.purge_expired()
+    assert registry.stats()["compact_sessions"] == 1  # Still in use by the second request
+    registry.release(held.session_id)
+    clock.now = 93
+    registry.purge_expired()
+    assert registry.stats()["compact_sessions"] == 2 and registry.stats()["sessions_in_use"] == 0  # Though `held` still refers to it
+
+
+if __name__ == "__main__":
+    for test in (test_sessions_are_isolated, test_idle_sessions_expire,
+                 test_capacity_evicts_least_recently_used, test_concurrent_puts,
+                 test_compact_session_round_trip, test_idle_sessions_are_packed_unless_in_use):
+        test()
+        print(f"[PASS] {test.__name__}")
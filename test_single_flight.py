@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Offline checks for coalescing identical in-flight LLM requests"""
+
+import asyncio
+
+import pytest
+
+from interviewer import AsyncExcelInterviewer
+from provider_router import DeadlineExceeded, Provider, ProviderRouter
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "How would you total column B?"
+
+        results = await asyncio.gather(*(flight.do("p", upstream) for _ in range(20)))
+        assert results == ["How would you total column B?"] * 20
+        assert len(calls) == 1 and flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 19}
+
+        await flight.do("p", upstream)  # Nothing is cached once the call has finished
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_errors_fan_out_and_a_late_follower_times_out_alone():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def broken():
+            await asyncio.sleep(0.02)
+            raise RuntimeError("upstream error")
+
+        outcomes = await asyncio.gather(flight.do("p", broken), flight.do("p", broken), return_exceptions=True)
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("q", slow))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("q", slow, timeout=0.01)
+        assert await leader == "done"
+
+    asyncio.run(scenario())
+
+
+def test_upstream_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def hanging():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(flight.do("p", hanging)) for _ in range(3)]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()  # Others are still waiting
+        for caller in callers[1:]:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1.0)
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_interviewer_coalesces_whitespace_variants():
+    async def scenario():
+        interviewer = AsyncExcelInterviewer(api_key="", deadline=1.0)
+        calls = []
+
+        async def upstream(prompt, timeout):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return "What does INDEX/MATCH do?"
+
+        interviewer.router = ProviderRouter([Provider("fake", upstream)], deadline=1.0)
+        results = await asyncio.gather(
+            interviewer.generate_question_text("Ask about  lookups"),
+            interviewer.generate_question_text("Ask about lookups\n"),
+            interviewer.generate_question_text("Ask about lookups", background=True),
+        )
+        assert results == ["What does INDEX/MATCH do?"] * 3
+        assert len(calls) == 2  # Background requests run on their own budget
+
+        async def slow(prompt, timeout):
+            await asyncio.sleep(0.2)
+            return "late"
+
+        interviewer.router = ProviderRouter([Provider("slow", slow)], deadline=1.0)
+        leader = asyncio.ensure_future(interviewer.generate_question_text("p"))
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceeded):
+            await interviewer.generate_question_text("p", deadline=0.01)
+        assert await leader == "late"
+        await interviewer.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Offline checks for the in-memory static frontend"""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from static_assets import IMMUTABLE, REVALIDATE, StaticBundle, brotli
+
+PAGE = "<!DOCTYPE html><html><body>" + "<p>Excel interview</p>" * 50 + "</body></html>"
+
+
+def client_for(tmp_path, spa_fallback=False):
+    (tmp_path / "static" / "js").mkdir(parents=True)
+    (tmp_path / "index.html").write_text(PAGE)
+    (tmp_path / "static" / "js" / "main.3f2a9c1e.js").write_text("console.log('interview');" * 40)
+    (tmp_path / "favicon.ico").write_bytes(b"\x00\x01" * 100)
+    bundle = StaticBundle(str(tmp_path), spa_fallback=spa_fallback)
+    app = FastAPI()
+    app.mount("/", bundle)
+    return bundle, TestClient(app)
+
+
+def test_served_from_memory_with_negotiated_encoding(tmp_path):
+    bundle, client = client_for(tmp_path)
+    (tmp_path / "index.html").unlink()  # Never read again after startup
+
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200 and plain.text == PAGE
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"] == REVALIDATE
+
+    zipped = client.get("/", headers={"Accept-Encoding": "gzip;q=0.5, br;q=0"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.headers["etag"] != plain.headers["etag"]
+    assert gzip.decompress(bundle.assets["index.html"].bodies["gzip"]).decode() == PAGE
+
+    if brotli is not None:
+        assert client.get("/", headers={"Accept-Encoding": "gzip, br"}).headers["content-encoding"] == "br"
+
+    icon = client.get("/favicon.ico", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in icon.headers and "vary" not in icon.headers
+
+
+def test_etag_revalidation_and_hashed_assets(tmp_path):
+    _, client = client_for(tmp_path)
+    first = client.get("/static/js/main.3f2a9c1e.js", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["cache-control"] == IMMUTABLE
+    assert first.headers["content-type"].startswith("application/javascript")
+
+    again = client.get("/static/js/main.3f2a9c1e.js",
+                       headers={"Accept-Encoding": "gzip", "If-None-Match": f'W/{first.headers["etag"]}'})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+    head = client.head("/static/js/main.3f2a9c1e.js")
+    assert head.status_code == 200 and head.content == b""
+    assert client.post("/").status_code == 405
+
+
+def test_unknown_paths(tmp_path):
+    _, client = client_for(tmp_path)
+    assert client.get("/interview/123").status_code == 404
+    _, spa = client_for(tmp_path / "spa", spa_fallback=True)
+    assert spa.get("/interview/123").text == PAGE
+    assert spa.get("/missing.js").status_code == 404
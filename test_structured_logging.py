@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Offline checks for the queued JSON logging setup"""
+
+import asyncio
+import io
+import json
+import logging
+import queue
+
+from structured_logging import (ContextFilter, DebugSampler, JsonFormatter, NonBlockingQueueHandler,
+                                bind_session)
+
+
+def capture(*filters):
+    """Logger writing JSON lines to a buffer through the same filters setup_logging() uses"""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+    logger = logging.getLogger(f"test.structured.{id(stream)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger, stream
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_session_id_and_extras():
+    logger, stream = capture(ContextFilter())
+
+    async def request(session_id):
+        bind_session(session_id)
+        await asyncio.sleep(0)
+        logger.info("Question served from %s", "pool", extra={"messages": 3})
+
+    async def main():
+        await asyncio.gather(request("s1"), request("s2"))
+    asyncio.run(main())
+
+    entries = lines(stream)
+    assert sorted(entry["session_id"] for entry in entries) == ["s1", "s2"]
+    assert entries[0]["msg"] == "Question served from pool"
+    assert entries[0]["messages"] == 3
+    assert entries[0]["level"] == "INFO"
+    assert not {"pathname", "lineno", "thread", "process", "processName"} & set(entries[0])
+
+
+def test_debug_records_are_sampled():
+    logger, stream = capture(DebugSampler(0.0))
+    logger.debug("dropped")
+    logger.warning("kept")
+    assert [entry["msg"] for entry in lines(stream)] == ["kept"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("test.structured.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for n in range(5):
+        logger.warning("event %d", n)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Offline checks for the WebSocket interview channel"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from event_channel import EventChannel
+
+
+def test_tokens_merge_while_the_client_is_behind():
+    async def scenario():
+        sent = []
+        gate = asyncio.Event()
+
+        async def send(event):
+            await gate.wait()
+            sent.append(event)
+
+        channel = EventChannel(send, max_pending=3)
+        sender = asyncio.create_task(channel.run())
+        channel.push({"type": "feedback", "text": "Nice!"})
+        await asyncio.sleep(0)  # The sender is now blocked on the first send
+        for word in ("How ", "would ", "you"):
+            channel.push({"type": "token", "text": word})
+        channel.push({"type": "question", "question": "How would you", "timer": 90})
+        gate.set()
+        await channel.drain(timeout=1.0)
+        assert [event["type"] for event in sent] == ["feedback", "token", "question"]
+        assert sent[1]["text"] == "How would you" and channel.merged == 2
+
+        gate.clear()
+        for n in range(5):
+            channel.push({"type": "feedback", "text": str(n)})
+        assert channel.overflowed and channel.closed
+        sender.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_interview_over_one_connection():
+    from app import app
+
+    with TestClient(app) as client, client.websocket_connect("/ws/interview") as ws:
+        ws.send_json({"type": "answer", "text": "too early"})
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"type": "start"})
+        session_id = ws.receive_json()["session_id"]
+        events = [ws.receive_json()]
+        while events[-1]["type"] != "question":
+            events.append(ws.receive_json())
+        assert events[0]["type"] == "intro" and events[-1]["timer"] > 0
+
+        summary = None
+        for turn in range(6):
+            if turn == 2:
+                ws.send_json({"type": "partial", "text": "I would use SUMIFS"})
+                ws.send_json({"type": "timeout"})  # Scored as the partial answer
+            elif turn == 3:
+                ws.send_json({"type": "timeout"})
+            else:
+                ws.send_json({"type": "answer", "text": "I would use a pivot table with a slicer."})
+            event = ws.receive_json()
+            assert event["type"] == "feedback"
+            assert (event["text"] == "Time's up! Let's move on.") == (turn == 3)
+            while event["type"] not in ("question", "summary"):
+                event = ws.receive_json()
+            summary = event if event["type"] == "summary" else None
+        assert summary is not None and "summary" in summary
+
+        report = client.get("/debug/session", params={"session_id": session_id}).json()
+        assert report["responses_count"] == 6
+
+        ws.send_json({"type": "resume", "session_id": session_id})
+        assert ws.receive_json() == {"type": "session", "session_id": session_id}
+        assert ws.receive_json()["type"] == "summary"
+
+
+def test_stalled_client_is_dropped_without_sending_again(monkeypatch):
+    import app as server
+
+    class StalledChannel(EventChannel):
+        """The client reads the first event, then stops reading altogether"""
+
+        def __init__(self, send, max_pending):
+            stalled = asyncio.Event()
+            sent = []
+
+            async def send_until_stalled(event):
+                if sent:
+                    await stalled.wait()
+                sent.append(event)
+                await send(event)
+            super().__init__(send_until_stalled, max_pending=1)
+
+    class FailingChannel(EventChannel):
+        """Sending fails once the turn is queued, while the server waits for the next message"""
+
+        def __init__(self, send, max_pending):
+            async def send_then_fail(event):
+                if event["type"] == "question":
+                    raise ConnectionResetError("client went away")
+                await send(event)
+            super().__init__(send_then_fail, max_pending=max_pending)
+
+    with TestClient(server.app) as client:
+        for channel, close_code in ((StalledChannel, server.SLOW_CONSUMER), (FailingChannel, 1000)):
+            monkeypatch.setattr(server, "EventChannel", channel)
+            with client.websocket_connect("/ws/interview") as ws:
+                ws.send_json({"type": "start"})
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    while True:  # Whatever was sent before the client stalled or the send failed
+                        ws.receive_json()
+                assert closed.value.code == close_code
+            assert server.sessions.stats()["sessions_in_use"] == 0